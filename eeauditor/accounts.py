@@ -0,0 +1,89 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+import os
+
+import boto3
+import botocore.session
+from botocore.credentials import (
+    AssumeRoleCredentialFetcher,
+    CredentialProvider,
+    CredentialResolver,
+    DeferredRefreshableCredentials,
+    JSONFileCache,
+)
+
+from check_register import accumulate_paged_results
+
+# assumed role credentials are shared on disk between the worker processes of a run,
+# so every account is only assumed into once while its credentials are still valid
+CREDENTIAL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".electriceye", "credentials")
+
+
+def get_organization_accounts(session=None):
+    """Return the ids of every active account of the caller's AWS Organization"""
+    organizations = (session or boto3).client("organizations")
+    paginator = organizations.get_paginator("list_accounts")
+    results = accumulate_paged_results(page_iterator=paginator.paginate(), key="Accounts")
+    return [account["Id"] for account in results["Accounts"] if account["Status"] == "ACTIVE"]
+
+
+def get_role_arn(account_id, role_name, partition="aws"):
+    return f"arn:{partition}:iam::{account_id}:role/{role_name}"
+
+
+class AssumedRoleProvider(CredentialProvider):
+    """Credential provider handing out the refreshable credentials of an assumed role"""
+
+    METHOD = "assume-role"
+    CANONICAL_NAME = "ElectricEyeAssumeRole"
+
+    def __init__(self, fetcher):
+        self._fetcher = fetcher
+
+    def load(self):
+        return DeferredRefreshableCredentials(
+            method=self.METHOD, refresh_using=self._fetcher.fetch_credentials
+        )
+
+
+def assume_role_session(
+    role_arn, region_name=None, profile_name=None, external_id=None, session_name="ElectricEye"
+):
+    """Return a botocore session for role_arn
+
+    Credentials are only fetched on first use, are refreshed automatically before they
+    expire and are cached in CREDENTIAL_CACHE_DIR.
+    """
+    source_session = botocore.session.Session(profile=profile_name or None)
+    extra_args = {"RoleSessionName": session_name}
+    if external_id:
+        extra_args["ExternalId"] = external_id
+    fetcher = AssumeRoleCredentialFetcher(
+        client_creator=source_session.create_client,
+        source_credentials=source_session.get_credentials(),
+        role_arn=role_arn,
+        extra_args=extra_args,
+        cache=JSONFileCache(working_dir=CREDENTIAL_CACHE_DIR),
+    )
+    session = botocore.session.Session()
+    # the role is the only source of credentials of the session, none is read from the
+    # environment or the profile
+    session.register_component(
+        "credential_provider", CredentialResolver(providers=[AssumedRoleProvider(fetcher)])
+    )
+    if region_name:
+        session.set_config_variable("region", region_name)
+    return session
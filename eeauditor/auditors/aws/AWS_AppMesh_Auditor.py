@@ -13,13 +13,13 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
 
 registry = CheckRegister()
 # import boto3 clients
-appmesh = boto3.client("appmesh")
+appmesh = lazy_client("appmesh")
 # loop through AWS App Mesh meshes
 
 
@@ -153,7 +153,7 @@ def appmesh_mesh_egress_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("appmesh")
@@ -373,9 +373,9 @@ def appmesh_virt_node_backed_default_tls_policy_check(
                             }
                             yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("appmesh")
@@ -532,9 +532,9 @@ def appmesh_virt_node_listener_strict_tls_check(
                     if str(e) == "'tls'":
                         pass
                     else:
-                        print(e)
+                        report_error(e)
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("appmesh")
@@ -680,6 +680,6 @@ def appmesh_logging_check(
                         }
                         yield finding
                     else:
-                        print(e)
+                        report_error(e)
         except Exception as e:
-            print(e)
+            report_error(e)
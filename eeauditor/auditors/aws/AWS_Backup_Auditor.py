@@ -13,34 +13,43 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
+from inventory import Inventory
+from resources import RDS_ENGINES
 
 registry = CheckRegister()
+inventory = Inventory()
 # import boto3 clients
-sts = boto3.client("sts")
-ec2 = boto3.client("ec2")
-dynamodb = boto3.client("dynamodb")
-rds = boto3.client("rds")
-efs = boto3.client("efs")
-backup = boto3.client("backup")
+dynamodb = lazy_client("dynamodb")
+efs = lazy_client("efs")
+
+
+# every resource protected by AWS Backup, keyed by ARN, from one paginated listing
+def protected_resources(cache):
+    if "protected_resources" in cache:
+        return cache["protected_resources"]
+    response = inventory.get("backup", "list_protected_resources")
+    cache["protected_resources"] = {
+        resource["ResourceArn"]: resource for resource in response["Results"]
+    }
+    return cache["protected_resources"]
 
 
 @registry.register_check("backup")
 def volume_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     # loop through available or in-use ebs volumes
-    response = ec2.describe_volumes(
-        Filters=[{"Name": "status", "Values": ["available", "in-use"]}]
-    )
-    myEbsVolumes = response["Volumes"]
+    response = inventory.get("ec2", "describe_volumes")
+    myEbsVolumes = [
+        volume for volume in response["Volumes"] if volume["State"] in ["available", "in-use"]
+    ]
     for volumes in myEbsVolumes:
         volumeId = str(volumes["VolumeId"])
         volumeArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:volume/{volumeId}"
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-        try:
-            # check if ebs volumes are backed up
-            response = backup.describe_protected_resource(ResourceArn=volumeArn)
+        # check if ebs volumes are backed up
+        if volumeArn in protected_resources(cache):
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": volumeArn + "/ebs-backups",
@@ -92,7 +101,7 @@ def volume_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsParti
                 "RecordState": "ARCHIVED",
             }
             yield finding
-        except:
+        else:
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": volumeArn + "/ebs-backups",
@@ -151,7 +160,7 @@ def volume_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsParti
 @registry.register_check("ec2")
 def ec2_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     # loop through ec2 instances
-    response = ec2.describe_instances(DryRun=False)
+    response = inventory.get("ec2", "describe_instances")
     myReservations = response["Reservations"]
     for reservations in myReservations:
         myInstances = reservations["Instances"]
@@ -167,9 +176,8 @@ def ec2_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
             iso8601Time = (
                 datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
             )
-            try:
-                # check if ec2 instances are backed up
-                response = backup.describe_protected_resource(ResourceArn=instanceArn)
+            # check if ec2 instances are backed up
+            if instanceArn in protected_resources(cache):
                 finding = {
                     "SchemaVersion": "2018-10-08",
                     "Id": instanceArn + "/ec2-backups",
@@ -228,7 +236,7 @@ def ec2_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
                     "RecordState": "ARCHIVED",
                 }
                 yield finding
-            except:
+            else:
                 finding = {
                     "SchemaVersion": "2018-10-08",
                     "Id": instanceArn + "/ec2-backups",
@@ -301,9 +309,8 @@ def ddb_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
         tableArn = str(response["Table"]["TableArn"])
         tableName = str(response["Table"]["TableName"])
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-        try:
-            # check if ddb tables are backed up
-            response = backup.describe_protected_resource(ResourceArn=tableArn)
+        # check if ddb tables are backed up
+        if tableArn in protected_resources(cache):
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": tableArn + "/dynamodb-backups",
@@ -355,7 +362,7 @@ def ddb_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
                 "RecordState": "ARCHIVED",
             }
             yield finding
-        except:
+        else:
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": tableArn + "/dynamodb-backups",
@@ -414,37 +421,18 @@ def ddb_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
 @registry.register_check("backup")
 def reds_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     # loop through rds db instances
-    response = rds.describe_db_instances(
-        Filters=[
-            {
-                "Name": "engine",
-                "Values": [
-                    "aurora",
-                    "aurora-mysql",
-                    "aurora-postgresql",
-                    "mariadb",
-                    "mysql",
-                    "oracle-ee",
-                    "postgres",
-                    "sqlserver-ee",
-                    "sqlserver-se",
-                    "sqlserver-ex",
-                    "sqlserver-web",
-                ],
-            }
-        ],
-        MaxRecords=100,
-    )
-    myRdsInstances = response["DBInstances"]
+    response = inventory.get("rds", "describe_db_instances")
+    myRdsInstances = [
+        instance for instance in response["DBInstances"] if instance["Engine"] in RDS_ENGINES
+    ]
     for databases in myRdsInstances:
         dbArn = str(databases["DBInstanceArn"])
         dbId = str(databases["DBInstanceIdentifier"])
         dbEngine = str(databases["Engine"])
         dbEngineVersion = str(databases["EngineVersion"])
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-        try:
-            # check if db instances are backed up
-            response = backup.describe_protected_resource(ResourceArn=dbArn)
+        # check if db instances are backed up
+        if dbArn in protected_resources(cache):
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": dbArn + "/rds-backups",
@@ -502,7 +490,7 @@ def reds_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartiti
                 "RecordState": "ARCHIVED",
             }
             yield finding
-        except:
+        else:
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": dbArn + "/rds-backups",
@@ -573,9 +561,8 @@ def efs_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
         fileSysId = str(filesys["FileSystemId"])
         fileSysArn = f"arn:{awsPartition}:elasticfilesystem:{awsRegion}:{awsAccountId}:file-system/{fileSysId}"
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-        try:
-            # check if db instances are backed up
-            response = backup.describe_protected_resource(ResourceArn=fileSysArn)
+        # check if db instances are backed up
+        if fileSysArn in protected_resources(cache):
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": fileSysArn + "/efs-backups",
@@ -627,7 +614,7 @@ def efs_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
                 "RecordState": "ARCHIVED",
             }
             yield finding
-        except:
+        else:
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": fileSysArn + "/efs-backups",
@@ -681,4 +668,3 @@ def efs_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
                 "RecordState": "ACTIVE",
             }
             yield finding
-
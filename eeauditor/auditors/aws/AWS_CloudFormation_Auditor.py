@@ -13,13 +13,13 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
 
 registry = CheckRegister()
 # import boto3 clients
-cloudformation = boto3.client("cloudformation")
+cloudformation = lazy_client("cloudformation")
 # describe all cfn stacks
 def describe_stacks(cache):
     response = cache.get("describe_stacks")
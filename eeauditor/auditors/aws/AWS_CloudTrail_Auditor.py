@@ -13,13 +13,14 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
+from detail_loader import detail_loader
 
 registry = CheckRegister()
 # import boto3 clients
-cloudtrail = boto3.client("cloudtrail")
+cloudtrail = lazy_client("cloudtrail")
 # loop through trails
 def list_trails(cache):
     response = cache.get("list_trails")
@@ -29,6 +30,18 @@ def list_trails(cache):
     return cache["list_trails"]
 
 
+# details of every trail, fetched concurrently once for all checks
+def trail_details(cache):
+    return detail_loader(
+        cache,
+        "trail_details",
+        lambda trailArn: cloudtrail.describe_trails(
+            trailNameList=[trailArn], includeShadowTrails=False
+        ),
+        (trail["TrailARN"] for trail in list_trails(cache)["Trails"]),
+    )
+
+
 @registry.register_check("cloudtrail")
 def cloudtrail_multi_region_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
@@ -38,7 +51,7 @@ def cloudtrail_multi_region_check(
     for trails in myCloudTrails:
         trailArn = str(trails["TrailARN"])
         trailName = str(trails["Name"])
-        response = cloudtrail.describe_trails(trailNameList=[trailArn], includeShadowTrails=False)
+        response = trail_details(cache).get(trailArn)
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         for details in response["trailList"]:
             multiRegionCheck = str(details["IsMultiRegionTrail"])
@@ -153,7 +166,7 @@ def cloudtrail_cloudwatch_logging_check(
     for trails in myCloudTrails:
         trailArn = str(trails["TrailARN"])
         trailName = str(trails["Name"])
-        response = cloudtrail.describe_trails(trailNameList=[trailArn], includeShadowTrails=False)
+        response = trail_details(cache).get(trailArn)
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         for details in response["trailList"]:
             try:
@@ -262,7 +275,7 @@ def cloudtrail_cloudwatch_logging_check(
                     }
                     yield finding
                 else:
-                    print(e)
+                    report_error(e)
 
 
 @registry.register_check("cloudtrail")
@@ -274,7 +287,7 @@ def cloudtrail_encryption_check(
     for trails in myCloudTrails:
         trailArn = str(trails["TrailARN"])
         trailName = str(trails["Name"])
-        response = cloudtrail.describe_trails(trailNameList=[trailArn], includeShadowTrails=False)
+        response = trail_details(cache).get(trailArn)
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         for details in response["trailList"]:
             try:
@@ -379,7 +392,7 @@ def cloudtrail_encryption_check(
                     }
                     yield finding
                 else:
-                    print(e)
+                    report_error(e)
 
 
 @registry.register_check("cloudtrail")
@@ -391,7 +404,7 @@ def cloudtrail_global_services_check(
     for trails in myCloudTrails:
         trailArn = str(trails["TrailARN"])
         trailName = str(trails["Name"])
-        response = cloudtrail.describe_trails(trailNameList=[trailArn], includeShadowTrails=False)
+        response = trail_details(cache).get(trailArn)
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         for details in response["trailList"]:
             globalServiceEventCheck = str(details["IncludeGlobalServiceEvents"])
@@ -506,7 +519,7 @@ def cloudtrail_log_file_validation_check(
     for trails in myCloudTrails:
         trailArn = str(trails["TrailARN"])
         trailName = str(trails["Name"])
-        response = cloudtrail.describe_trails(trailNameList=[trailArn], includeShadowTrails=False)
+        response = trail_details(cache).get(trailArn)
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         for details in response["trailList"]:
             fileValidationCheck = str(details["LogFileValidationEnabled"])
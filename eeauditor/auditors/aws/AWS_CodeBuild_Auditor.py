@@ -13,13 +13,13 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
 
 registry = CheckRegister()
 # import boto3 clients
-codebuild = boto3.client("codebuild")
+codebuild = lazy_client("codebuild")
 # loop through all CodeBuild projects and list their attributes
 def get_code_build_projects(cache):
     response = cache.get("code_build_projects")
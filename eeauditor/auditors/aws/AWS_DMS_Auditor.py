@@ -13,13 +13,21 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from inventory import Inventory
 
 registry = CheckRegister()
-# create boto3 clients
-dms = boto3.client("dms")
+inventory = Inventory()
+
+
+# loop through dms replication instances
+def describe_replication_instances(cache):
+    response = cache.get("describe_replication_instances")
+    if response:
+        return response
+    cache["describe_replication_instances"] = inventory.get("dms", "describe_replication_instances")
+    return cache["describe_replication_instances"]
 
 
 @registry.register_check("dms")
@@ -27,7 +35,7 @@ def dms_replication_instance_public_access_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # loop through dms replication instances
-    response = dms.describe_replication_instances()
+    response = describe_replication_instances(cache)
     for repinstances in response["ReplicationInstances"]:
         dmsInstanceId = str(repinstances["ReplicationInstanceIdentifier"])
         dmsInstanceArn = str(repinstances["ReplicationInstanceArn"])
@@ -148,7 +156,7 @@ def dms_replication_instance_multi_az_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # loop through dms replication instances
-    response = dms.describe_replication_instances()
+    response = describe_replication_instances(cache)
     for repinstances in response["ReplicationInstances"]:
         dmsInstanceId = str(repinstances["ReplicationInstanceIdentifier"])
         dmsInstanceArn = str(repinstances["ReplicationInstanceArn"])
@@ -269,7 +277,7 @@ def dms_replication_instance_minor_version_update_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # loop through dms replication instances
-    response = dms.describe_replication_instances()
+    response = describe_replication_instances(cache)
     for repinstances in response["ReplicationInstances"]:
         dmsInstanceId = str(repinstances["ReplicationInstanceIdentifier"])
         dmsInstanceArn = str(repinstances["ReplicationInstanceArn"])
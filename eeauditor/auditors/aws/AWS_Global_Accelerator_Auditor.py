@@ -17,12 +17,11 @@ import datetime
 from dateutil import parser
 import uuid
 
-import boto3
-
 from check_register import CheckRegister, accumulate_paged_results
+from client_factory import lazy_client
 
 registry = CheckRegister()
-globalaccelerator = boto3.client("globalaccelerator")
+globalaccelerator = lazy_client("globalaccelerator")
 
 
 @registry.register_check("globalaccelerator")
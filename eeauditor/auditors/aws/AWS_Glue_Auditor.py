@@ -13,13 +13,13 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
 
 registry = CheckRegister()
 # import boto3 clients
-glue = boto3.client("glue")
+glue = lazy_client("glue")
 
 
 def list_crawlers(cache):
@@ -164,9 +164,9 @@ def crawler_s3_encryption_check(
                     }
                     yield finding
             except Exception as e:
-                print(e)
+                report_error(e)
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("glue")
@@ -303,9 +303,9 @@ def crawler_cloudwatch_encryption_check(
                     }
                     yield finding
             except Exception as e:
-                print(e)
+                report_error(e)
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("glue")
@@ -442,9 +442,9 @@ def crawler_job_bookmark_encryption_check(
                     }
                     yield finding
             except Exception as e:
-                print(e)
+                report_error(e)
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("glue")
@@ -560,7 +560,7 @@ def glue_data_catalog_encryption_check(
             }
             yield finding
     except Exception as e:
-        print(e)
+        report_error(e)
 
 
 @registry.register_check("glue")
@@ -678,7 +678,7 @@ def glue_data_catalog_password_encryption_check(
             }
             yield finding
     except Exception as e:
-        print(e)
+        report_error(e)
 
 
 @registry.register_check("glue")
@@ -827,4 +827,4 @@ def glue_data_catalog_resource_policy_check(
             }
             yield finding
         else:
-            print(e)
+            report_error(e)
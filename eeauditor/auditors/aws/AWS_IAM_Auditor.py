@@ -13,35 +13,35 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
+from iam_snapshot import build_iam_snapshot
 
 registry = CheckRegister()
 # import boto3 clients
-iam = boto3.client("iam")
-# loop through IAM users
-def list_users(cache):
-    response = cache.get("list_users")
+iam = lazy_client("iam")
+# loop through IAM users, read in bulk with their policies and credentials
+def iam_snapshot(cache):
+    response = cache.get("iam_snapshot")
     if response:
         return response
-    cache["list_users"] = iam.list_users(MaxItems=1000)
-    return cache["list_users"]
+    cache["iam_snapshot"] = build_iam_snapshot()
+    return cache["iam_snapshot"]
 
 
 @registry.register_check("iam")
 def iam_access_key_age_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
-    user = list_users(cache=cache)
-    allUsers = user["Users"]
+    snapshot = iam_snapshot(cache=cache)
+    allUsers = snapshot.users
     for users in allUsers:
         userName = str(users["UserName"])
         userArn = str(users["Arn"])
         try:
-            response = iam.list_access_keys(UserName=userName)
-            for keys in response["AccessKeyMetadata"]:
-                keyUserName = str(keys["UserName"])
+            for keys in snapshot.access_keys(userName):
+                keyUserName = userName
                 keyId = str(keys["AccessKeyId"])
                 keyStatus = str(keys["Status"])
                 # ISO Time
@@ -49,7 +49,7 @@ def iam_access_key_age_check(
                     datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
                 )
                 if keyStatus == "Active":
-                    keyCreateDate = keys["CreateDate"]
+                    keyCreateDate = keys["LastRotated"]
                     todaysDatetime = datetime.datetime.now(datetime.timezone.utc)
                     keyAgeFinder = todaysDatetime - keyCreateDate
                     if keyAgeFinder <= datetime.timedelta(days=90):
@@ -208,15 +208,15 @@ def iam_access_key_age_check(
                 else:
                     pass
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("iam")
 def user_permission_boundary_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
-    user = list_users(cache=cache)
-    allUsers = user["Users"]
+    snapshot = iam_snapshot(cache=cache)
+    allUsers = snapshot.users
     for users in allUsers:
         userName = str(users["UserName"])
         userArn = str(users["Arn"])
@@ -345,21 +345,20 @@ def user_permission_boundary_check(
                 }
                 yield finding
             else:
-                print(e)
+                report_error(e)
 
 
 @registry.register_check("iam")
 def user_mfa_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
-    user = list_users(cache=cache)
-    allUsers = user["Users"]
+    snapshot = iam_snapshot(cache=cache)
+    allUsers = snapshot.users
     for users in allUsers:
         userName = str(users["UserName"])
         userArn = str(users["Arn"])
         # ISO Time
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         try:
-            response = iam.list_mfa_devices(UserName=userName)
-            if str(response["MFADevices"]) == "[]":
+            if not snapshot.mfa_active(userName):
                 finding = {
                     "SchemaVersion": "2018-10-08",
                     "Id": userArn + "/iam-user-mfa-check",
@@ -490,23 +489,22 @@ def user_mfa_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition:
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("iam")
 def user_inline_policy_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
-    user = list_users(cache=cache)
-    allUsers = user["Users"]
+    snapshot = iam_snapshot(cache=cache)
+    allUsers = snapshot.users
     for users in allUsers:
         userName = str(users["UserName"])
         userArn = str(users["Arn"])
         # ISO Time
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         try:
-            response = iam.list_user_policies(UserName=userName)
-            if str(response["PolicyNames"]) != "[]":
+            if users.get("UserPolicyList"):
                 finding = {
                     "SchemaVersion": "2018-10-08",
                     "Id": userArn + "/iam-user-attach-inline-check",
@@ -639,23 +637,22 @@ def user_inline_policy_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("iam")
 def user_direct_attached_policy_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
-    user = list_users(cache=cache)
-    allUsers = user["Users"]
+    snapshot = iam_snapshot(cache=cache)
+    allUsers = snapshot.users
     for users in allUsers:
         userName = str(users["UserName"])
         userArn = str(users["Arn"])
         # ISO Time
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         try:
-            response = iam.list_attached_user_policies(UserName=userName)
-            if str(response["AttachedPolicies"]) != "[]":
+            if users.get("AttachedManagedPolicies"):
                 finding = {
                     "SchemaVersion": "2018-10-08",
                     "Id": userArn + "/iam-user-attach-managed-policy-check",
@@ -788,7 +785,7 @@ def user_direct_attached_policy_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("iam")
@@ -948,7 +945,7 @@ def cis_aws_foundation_benchmark_pw_policy_check(
             }
             yield finding
     except Exception as e:
-        print(e)
+        report_error(e)
 
 
 @registry.register_check("iam")
@@ -1088,4 +1085,4 @@ def server_certs_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartit
             }
             yield finding
     except Exception as e:
-        print(e)
+        report_error(e)
@@ -13,14 +13,14 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 import json
 import os
 from check_register import CheckRegister
+from client_factory import lazy_client
 
 registry = CheckRegister()
-kms = boto3.client("kms")
+kms = lazy_client("kms")
 
 
 def list_keys(cache):
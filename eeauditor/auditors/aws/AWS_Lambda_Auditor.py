@@ -16,45 +16,42 @@
 import datetime
 from dateutil import parser
 
-import boto3
-
 from check_register import CheckRegister
+from client_factory import lazy_client
+from metric_data import MetricData
 
 registry = CheckRegister()
-lambda_client = boto3.client("lambda")
-cloudwatch = boto3.client("cloudwatch")
+lambda_client = lazy_client("lambda")
 
 
 @registry.register_check("lambda")
 def unused_function_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
-    response = lambda_client.list_functions()
-    functions = response["Functions"]
+    paginator = lambda_client.get_paginator("list_functions")
+    functions = paginator.paginate().build_full_result()["Functions"]
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    # daily sums are enough to tell whether a function was invoked at all, and keep the
+    # datapoints of a full batch of functions within a few pages
+    metricData = MetricData(
+        start_time=datetime.datetime.now() - datetime.timedelta(days=30),
+        end_time=datetime.datetime.now(),
+    )
+    queryIds = {}
+    for function in functions:
+        queryIds[function["FunctionName"]] = metricData.add(
+            namespace="AWS/Lambda",
+            metric_name="Invocations",
+            dimensions=[{"Name": "FunctionName", "Value": function["FunctionName"]}],
+            period=86400,
+            stat="Sum",
+        )
+    metricResults = metricData.fetch()
     # create env vars
     for function in functions:
         functionName = str(function["FunctionName"])
         lambdaArn = str(function["FunctionArn"])
-        metricResponse = cloudwatch.get_metric_data(
-            MetricDataQueries=[
-                {
-                    "Id": "m1",
-                    "MetricStat": {
-                        "Metric": {
-                            "Namespace": "AWS/Lambda",
-                            "MetricName": "Invocations",
-                            "Dimensions": [{"Name": "FunctionName", "Value": functionName},],
-                        },
-                        "Period": 300,
-                        "Stat": "Sum",
-                    },
-                }
-            ],
-            StartTime=datetime.datetime.now() - datetime.timedelta(days=30),
-            EndTime=datetime.datetime.now(),
-        )
-        metrics = metricResponse["MetricDataResults"]
+        metrics = [metricResults[queryIds[functionName]]]
         for metric in metrics:
             modify_date = parser.parse(function["LastModified"])
             date_delta = datetime.datetime.now(datetime.timezone.utc) - modify_date
@@ -13,14 +13,14 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 import os
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
 
 registry = CheckRegister()
 # import boto3 clients
-licensemanager = boto3.client("license-manager")
+licensemanager = lazy_client("license-manager")
 
 
 @registry.register_check("license-manager")
@@ -163,6 +163,6 @@ def license_manager_hard_count_check(
                         }
                         yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
     except Exception as e:
-        print(e)
+        report_error(e)
@@ -17,12 +17,11 @@ import datetime
 from dateutil import parser
 import uuid
 
-import boto3
-
 from check_register import CheckRegister, accumulate_paged_results
+from client_factory import lazy_client
 
 registry = CheckRegister()
-ram = boto3.client("ram")
+ram = lazy_client("ram")
 
 
 def get_resource_shares(cache):
@@ -13,20 +13,19 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from inventory import Inventory
 
 registry = CheckRegister()
-# import boto3 clients
-secretsmanager = boto3.client("secretsmanager")
+inventory = Inventory()
 
 
 def list_secrets(cache):
     response = cache.get("list_secrets")
     if response:
         return response
-    cache["list_secrets"] = secretsmanager.list_secrets(MaxResults=100)
+    cache["list_secrets"] = inventory.get("secretsmanager", "list_secrets")
     return cache["list_secrets"]
 
 
@@ -13,17 +13,17 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import uuid
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
 
 registry = CheckRegister()
 # import boto3 clients
-accessanalyzer = boto3.client("accessanalyzer")
-guardduty = boto3.client("guardduty")
-detective = boto3.client("detective")
-macie2 = boto3.client("macie2")
+accessanalyzer = lazy_client("accessanalyzer")
+guardduty = lazy_client("guardduty")
+detective = lazy_client("detective")
+macie2 = lazy_client("macie2")
 
 
 @registry.register_check("accessanalyzer")
@@ -359,7 +359,7 @@ def detective_graph_check(
             }
             yield finding
     except Exception as e:
-        print(e)
+        report_error(e)
 
 
 @registry.register_check("macie2")
@@ -452,4 +452,4 @@ def macie_in_use_check(
             }
             yield finding
     except Exception as e:
-        print(e)
+        report_error(e)
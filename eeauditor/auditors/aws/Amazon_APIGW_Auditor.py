@@ -13,14 +13,14 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
 
 registry = CheckRegister()
 
 # import boto3 clients
-apigateway = boto3.client("apigateway")
+apigateway = lazy_client("apigateway")
 
 
 def get_rest_apis(cache):
@@ -110,7 +110,7 @@ def api_gateway_stage_metrics_enabled_check(
                     }
                     yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
             else:
                 try:
                     finding = {
@@ -172,7 +172,7 @@ def api_gateway_stage_metrics_enabled_check(
                     }
                     yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
 
 
 @registry.register_check("apigateway")
@@ -254,7 +254,7 @@ def api_gateway_stage_logging_check(
                     }
                     yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
             else:
                 try:
                     finding = {
@@ -316,7 +316,7 @@ def api_gateway_stage_logging_check(
                     }
                     yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
 
 
 @registry.register_check("apigateway")
@@ -400,7 +400,7 @@ def api_gateway_stage_cacheing_enabled_check(
                     }
                     yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
             else:
                 try:
                     finding = {
@@ -464,7 +464,7 @@ def api_gateway_stage_cacheing_enabled_check(
                     }
                     yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
 
 
 @registry.register_check("apigateway")
@@ -546,7 +546,7 @@ def api_gateway_stage_cache_encryption_check(
                     }
                     yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
             else:
                 try:
                     finding = {
@@ -607,7 +607,7 @@ def api_gateway_stage_cache_encryption_check(
                     }
                     yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
 
 
 @registry.register_check("apigateway")
@@ -685,7 +685,7 @@ def api_gateway_stage_xray_tracking_check(
                     }
                     yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
             else:
                 try:
                     finding = {
@@ -747,7 +747,7 @@ def api_gateway_stage_xray_tracking_check(
                     }
                     yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
 
 
 @registry.register_check("apigateway")
@@ -828,7 +828,7 @@ def api_gateway_stage_waf_check_check(
                     }
                     yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
             except Exception as e:
                 if str(e) == "'webAclArn'":
                     try:
@@ -893,6 +893,6 @@ def api_gateway_stage_waf_check_check(
                         }
                         yield finding
                     except Exception as e:
-                        print(e)
+                        report_error(e)
                 else:
-                    print(e)
+                    report_error(e)
@@ -13,12 +13,12 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
 
 registry = CheckRegister()
-appstream = boto3.client("appstream")
+appstream = lazy_client("appstream")
 
 
 def describe_users(cache):
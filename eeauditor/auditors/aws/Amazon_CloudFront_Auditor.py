@@ -17,12 +17,11 @@ import datetime
 from dateutil import parser
 import uuid
 
-import boto3
-
-from check_register import CheckRegister, accumulate_paged_results
+from check_register import CheckRegister, accumulate_paged_results, report_error
+from client_factory import lazy_client
 
 registry = CheckRegister()
-cloudfront = boto3.client("cloudfront")
+cloudfront = lazy_client("cloudfront")
 
 
 @registry.register_check("cloudfront")
@@ -150,4 +149,4 @@ def cloudfront_active_trusted_signers_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
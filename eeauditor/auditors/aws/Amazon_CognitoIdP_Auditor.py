@@ -13,13 +13,13 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister, accumulate_paged_results
+from client_factory import lazy_client
 
 registry = CheckRegister()
 
-cognitoidp = boto3.client("cognito-idp")
+cognitoidp = lazy_client("cognito-idp")
 
 
 def list_user_pools(cache):
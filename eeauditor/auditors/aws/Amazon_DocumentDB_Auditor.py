@@ -13,13 +13,16 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
+from inventory import Inventory
+from snapshot_audit import stream_snapshot_attributes
 
 registry = CheckRegister()
+inventory = Inventory()
 
-documentdb = boto3.client("docdb")
+documentdb = lazy_client("docdb")
 
 
 def describe_db_instances(cache):
@@ -30,6 +33,29 @@ def describe_db_instances(cache):
     return cache["describe_db_instances"]
 
 
+# loop through the snapshots of a cluster, streamed a page at a time as there can be very many
+def describe_db_cluster_snapshots(clusterId):
+    return inventory.paginate(
+        "docdb",
+        "describe_db_cluster_snapshots",
+        "DBClusterSnapshots",
+        DBClusterIdentifier=clusterId,
+    )
+
+
+def db_cluster_snapshot_attributes(clusterSnapshotId):
+    response = documentdb.describe_db_cluster_snapshot_attributes(
+        DBClusterSnapshotIdentifier=clusterSnapshotId
+    )
+    return {
+        "DBClusterSnapshotAttributesResult": {
+            "DBClusterSnapshotAttributes": response["DBClusterSnapshotAttributesResult"][
+                "DBClusterSnapshotAttributes"
+            ]
+        }
+    }
+
+
 @registry.register_check("docdb")
 def docdb_public_instance_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
@@ -392,7 +418,7 @@ def docdb_cluster_multiaz_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # find document db clusters
-    response = documentdb.describe_db_clusters(MaxRecords=100)
+    response = inventory.get("docdb", "describe_db_clusters")
     myDocDbClusters = response["DBClusters"]
     for docdbcluster in myDocDbClusters:
         docdbclusterId = str(docdbcluster["DBClusterIdentifier"])
@@ -515,7 +541,7 @@ def docdb_cluster_deletion_protection_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # find document db instances
-    response = documentdb.describe_db_clusters(MaxRecords=100)
+    response = inventory.get("docdb", "describe_db_clusters")
     myDocDbClusters = response["DBClusters"]
     for docdbcluster in myDocDbClusters:
         docdbclusterId = str(docdbcluster["DBClusterIdentifier"])
@@ -926,8 +952,7 @@ def documentdb_cluster_snapshot_encryption_check(
     response = documentdb.describe_db_clusters(Filters=[{"Name": "engine", "Values": ["docdb"]}])
     for clusters in response["DBClusters"]:
         clusterId = str(clusters["DBClusterIdentifier"])
-        response = documentdb.describe_db_cluster_snapshots(DBClusterIdentifier=clusterId)
-        for snapshots in response["DBClusterSnapshots"]:
+        for snapshots in describe_db_cluster_snapshots(clusterId):
             clusterSnapshotId = str(snapshots["DBClusterSnapshotIdentifier"])
             clusterSnapshotArn = str(snapshots["DBClusterSnapshotArn"])
             encryptionCheck = str(snapshots["StorageEncrypted"])
@@ -1046,13 +1071,15 @@ def documentdb_cluster_snapshot_public_share_check(
     response = documentdb.describe_db_clusters(Filters=[{"Name": "engine", "Values": ["docdb"]}])
     for clusters in response["DBClusters"]:
         clusterId = str(clusters["DBClusterIdentifier"])
-        response = documentdb.describe_db_cluster_snapshots(DBClusterIdentifier=clusterId)
-        for snapshots in response["DBClusterSnapshots"]:
+        snapshotAttributes = stream_snapshot_attributes(
+            snapshots=describe_db_cluster_snapshots(clusterId),
+            snapshot_id=lambda snapshot: snapshot["DBClusterSnapshotIdentifier"],
+            fetch=db_cluster_snapshot_attributes,
+            scope=f"docdb/{awsAccountId}/{awsRegion}",
+        )
+        for snapshots, response in snapshotAttributes:
             clusterSnapshotId = str(snapshots["DBClusterSnapshotIdentifier"])
             clusterSnapshotArn = str(snapshots["DBClusterSnapshotArn"])
-            response = documentdb.describe_db_cluster_snapshot_attributes(
-                DBClusterSnapshotIdentifier=clusterSnapshotId
-            )
             for snapshotattributes in response["DBClusterSnapshotAttributesResult"][
                 "DBClusterSnapshotAttributes"
             ]:
@@ -13,14 +13,14 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.  
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
 
 registry = CheckRegister()
 
 # import boto3 clients
-dynamodb = boto3.client('dynamodb')
+dynamodb = lazy_client("dynamodb")
 # loop through DynamoDB tables
 def paginate(cache):
     response = cache.get("paginate")
@@ -208,7 +208,7 @@ def ddb_kms_cmk_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartiti
                     }
                     yield finding
                 else:
-                    print(e)
+                    report_error(e)
 
 @registry.register_check("dynamodb")
 def ddb_pitr_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -343,7 +343,7 @@ def ddb_pitr_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition:
                     }
                     yield finding
             except Exception as e:
-                print(e)
+                report_error(e)
 
 @registry.register_check("dynamodb")
 def ddb_ttl_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -478,4 +478,4 @@ def ddb_ttl_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition:
                     }
                     yield finding
             except Exception as e:
-                print(e)
+                report_error(e)
@@ -13,31 +13,47 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
+from inventory import Inventory
+from snapshot_audit import stream_snapshot_attributes
 
 registry = CheckRegister()
+inventory = Inventory()
 
 # import boto3 clients
-ec2 = boto3.client("ec2")
+ec2 = lazy_client("ec2")
+
+# the most snapshots DescribeSnapshots returns per page
+SNAPSHOT_PAGE_SIZE = 1000
 
 # loop through EBS volumes
 def describe_volumes(cache):
     response = cache.get("describe_volumes")
     if response:
         return response
-    cache["describe_volumes"] = ec2.describe_volumes(DryRun=False, MaxResults=500)
+    cache["describe_volumes"] = inventory.get("ec2", "describe_volumes")
     return cache["describe_volumes"]
 
 
-# loop through EBS snapshots
-def describe_snapshots(cache, awsAccountId):
-    response = cache.get("describe_snapshots")
-    if response:
-        return response
-    cache["describe_snapshots"] = ec2.describe_snapshots(OwnerIds=[awsAccountId], DryRun=False)
-    return cache["describe_snapshots"]
+# loop through EBS snapshots, streamed a page at a time as there can be very many
+def describe_snapshots(awsAccountId):
+    return inventory.paginate(
+        "ec2",
+        "describe_snapshots",
+        "Snapshots",
+        OwnerIds=[awsAccountId],
+        # without a page size every snapshot comes back in a single response
+        PaginationConfig={"PageSize": SNAPSHOT_PAGE_SIZE},
+    )
+
+
+def create_volume_permissions(snapshotId):
+    response = ec2.describe_snapshot_attribute(
+        Attribute="createVolumePermission", SnapshotId=snapshotId, DryRun=False
+    )
+    return {"CreateVolumePermissions": response["CreateVolumePermissions"]}
 
 
 @registry.register_check("ec2")
@@ -392,9 +408,7 @@ def EbsVolumeEncryptionCheck(
 def EbsSnapshotEncryptionCheck(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
-    response = describe_snapshots(cache, awsAccountId)
-    myEbsSnapshots = response["Snapshots"]
-    for snapshots in myEbsSnapshots:
+    for snapshots in describe_snapshots(awsAccountId):
         snapshotId = str(snapshots["SnapshotId"])
         snapshotArn = f"arn:{awsPartition}:ec2:{awsRegion}::snapshot/{snapshotId}"
         snapshotEncryptionCheck = str(snapshots["Encrypted"])
@@ -506,14 +520,15 @@ def EbsSnapshotEncryptionCheck(
 def EbsSnapshotPublicCheck(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
-    response = describe_snapshots(cache, awsAccountId)
-    myEbsSnapshots = response["Snapshots"]
-    for snapshots in myEbsSnapshots:
+    snapshotPermissions = stream_snapshot_attributes(
+        snapshots=describe_snapshots(awsAccountId),
+        snapshot_id=lambda snapshot: snapshot["SnapshotId"],
+        fetch=create_volume_permissions,
+        scope=f"ec2/{awsAccountId}/{awsRegion}",
+    )
+    for snapshots, response in snapshotPermissions:
         snapshotId = str(snapshots["SnapshotId"])
         snapshotArn = f"arn:{awsPartition}:ec2:{awsRegion}::snapshot/{snapshotId}"
-        response = ec2.describe_snapshot_attribute(
-            Attribute="createVolumePermission", SnapshotId=snapshotId, DryRun=False
-        )
         # ISO Time
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         if str(response["CreateVolumePermissions"]) == "[]":
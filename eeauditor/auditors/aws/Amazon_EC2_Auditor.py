@@ -13,19 +13,18 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from inventory import Inventory
 
 registry = CheckRegister()
-
-ec2 = boto3.client("ec2")
+inventory = Inventory()
 
 
 @registry.register_check("ec2")
 def ec2_imdsv2_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     try:
-        response = ec2.describe_instances(MaxResults=1000)
+        response = inventory.get("ec2", "describe_instances")
         for r in response["Reservations"]:
             for i in r["Instances"]:
                 instanceId = str(i["InstanceId"])
@@ -117,7 +116,7 @@ def ec2_imdsv2_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
                             }
                             yield finding
                         except Exception as e:
-                            print(e)
+                            report_error(e)
                     else:
                         try:
                             # ISO Time
@@ -178,8 +177,8 @@ def ec2_imdsv2_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
                             }
                             yield finding
                         except Exception as e:
-                            print(e)
+                            report_error(e)
                 else:
                     pass
     except Exception as e:
-        print(e)
+        report_error(e)
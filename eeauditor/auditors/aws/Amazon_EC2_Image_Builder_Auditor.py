@@ -13,14 +13,14 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 import json
 from check_register import CheckRegister
+from client_factory import lazy_client
 
 registry = CheckRegister()
 
-imagebuilder = boto3.client("imagebuilder")
+imagebuilder = lazy_client("imagebuilder")
 
 
 @registry.register_check("imagebuilder")
@@ -13,25 +13,68 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from inventory import Inventory
 from dateutil.parser import parse
 
 registry = CheckRegister()
-# create boto3 clients
-ec2 = boto3.client("ec2")
-ssm = boto3.client("ssm")
+inventory = Inventory()
+# DescribeInstancePatchStates accepts at most 50 instance ids per call
+PATCH_STATES_BATCH_SIZE = 50
 
 # loop through ec2 instances
 def describe_instances(cache):
     response = cache.get("describe_instances")
     if response:
         return response
-    cache["describe_instances"] = ec2.describe_instances(DryRun=False, MaxResults=1000)
+    cache["describe_instances"] = inventory.get("ec2", "describe_instances")
     return cache["describe_instances"]
 
 
+# every managed instance, keyed by instance id, from one paginated listing
+def managed_instances(cache):
+    if "managed_instances" in cache:
+        return cache["managed_instances"]
+    response = inventory.get("ssm", "describe_instance_information")
+    cache["managed_instances"] = {
+        instance["InstanceId"]: instance for instance in response["InstanceInformationList"]
+    }
+    return cache["managed_instances"]
+
+
+# patch states of the described instances, keyed by instance id, fetched in batches. A
+# failed lookup is kept and raised again, rather than retried for every instance
+def instance_patch_states(cache):
+    if "instance_patch_states" not in cache:
+        try:
+            cache["instance_patch_states"] = describe_instance_patch_states(cache)
+        except Exception as e:
+            cache["instance_patch_states"] = e
+    patchStates = cache["instance_patch_states"]
+    if isinstance(patchStates, Exception):
+        raise patchStates
+    return patchStates
+
+
+def describe_instance_patch_states(cache):
+    instanceIds = [
+        instance["InstanceId"]
+        for reservation in describe_instances(cache)["Reservations"]
+        for instance in reservation["Instances"]
+    ]
+    patchStates = {}
+    for index in range(0, len(instanceIds), PATCH_STATES_BATCH_SIZE):
+        response = inventory.get(
+            "ssm",
+            "describe_instance_patch_states",
+            InstanceIds=instanceIds[index : index + PATCH_STATES_BATCH_SIZE],
+        )
+        for patchState in response["InstancePatchStates"]:
+            patchStates.setdefault(patchState["InstanceId"], []).append(patchState)
+    return patchStates
+
+
 @registry.register_check("ec2")
 def ec2_instance_ssm_managed_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
@@ -50,16 +93,12 @@ def ec2_instance_ssm_managed_check(
             instanceSubnet = str(instances["SubnetId"])
             instanceLaunchedAt = str(instances["LaunchTime"])
             try:
-                response = ssm.describe_instance_information(
-                    InstanceInformationFilterList=[
-                        {"key": "InstanceIds", "valueSet": [instanceId]},
-                    ]
-                )
+                managedInstances = managed_instances(cache)
                 # ISO Time
                 iso8601Time = (
                     datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
                 )
-                if str(response["InstanceInformationList"]) == "[]":
+                if instanceId not in managedInstances:
                     finding = {
                         "SchemaVersion": "2018-10-08",
                         "Id": instanceArn + "/ec2-managed-by-ssm-check",
@@ -176,7 +215,7 @@ def ec2_instance_ssm_managed_check(
                     }
                     yield finding
             except Exception as e:
-                print(e)
+                report_error(e)
 
 
 @registry.register_check("ec2")
@@ -196,10 +235,9 @@ def ssm_instace_agent_update_check(
             instanceVpc = str(instances["VpcId"])
             instanceSubnet = str(instances["SubnetId"])
             instanceLaunchedAt = str(instances["LaunchTime"])
-            response = ssm.describe_instance_information()
-            myManagedInstances = response["InstanceInformationList"]
-            for instances in myManagedInstances:
-                latestVersionCheck = str(instances["IsLatestVersion"])
+            managedInstance = managed_instances(cache).get(instanceId)
+            if managedInstance:
+                latestVersionCheck = str(managedInstance["IsLatestVersion"])
                 # ISO Time
                 iso8601Time = (
                     datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -339,10 +377,9 @@ def ssm_instance_association_check(
             instanceVpc = str(instances["VpcId"])
             instanceSubnet = str(instances["SubnetId"])
             instanceLaunchedAt = str(instances["LaunchTime"])
-            response = ssm.describe_instance_information()
-            myManagedInstances = response["InstanceInformationList"]
-            for instances in myManagedInstances:
-                associationStatusCheck = str(instances["AssociationStatus"])
+            managedInstance = managed_instances(cache).get(instanceId)
+            if managedInstance:
+                associationStatusCheck = str(managedInstance["AssociationStatus"])
                 # ISO Time
                 iso8601Time = (
                     datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -471,6 +508,12 @@ def ssm_instance_patch_state_state(
 ) -> dict:
     response = describe_instances(cache)
     myEc2InstanceReservations = response["Reservations"]
+    try:
+        patchStateIndex = instance_patch_states(cache)
+    except Exception as e:
+        # the batched lookup failed, report it once rather than for every instance
+        report_error(e)
+        return
     for reservations in myEc2InstanceReservations:
         for instances in reservations["Instances"]:
             instanceId = str(instances["InstanceId"])
@@ -482,10 +525,9 @@ def ssm_instance_patch_state_state(
             instanceVpc = str(instances["VpcId"])
             instanceSubnet = str(instances["SubnetId"])
             instanceLaunchedAt = str(instances["LaunchTime"])
-            response = ssm.describe_instance_information()
             try:
-                response = ssm.describe_instance_patch_states(InstanceIds=[instanceId])
-                patchStatesCheck = str(response["InstancePatchStates"])
+                patchStates = patchStateIndex.get(instanceId, [])
+                patchStatesCheck = str(patchStates)
                 # ISO Time
                 iso8601Time = (
                     datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -550,7 +592,6 @@ def ssm_instance_patch_state_state(
                     }
                     yield finding
                 else:
-                    patchStates = response["InstancePatchStates"]
                     for patches in patchStates:
                         failedPatchCheck = str(patches["FailedCount"])
                         missingPatchCheck = str(patches["MissingCount"])
@@ -675,4 +716,4 @@ def ssm_instance_patch_state_state(
                             }
                             yield finding
             except Exception as e:
-                print(e)
+                report_error(e)
@@ -13,20 +13,22 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
+from inventory import Inventory
 
 registry = CheckRegister()
+inventory = Inventory()
 
 # import boto3 clients
-ecr = boto3.client("ecr")
+ecr = lazy_client("ecr")
 # loop through ECR repos
 def describe_repositories(cache):
     response = cache.get("describe_repositories")
     if response:
         return response
-    cache["describe_repositories"] = ecr.describe_repositories(maxResults=1000)
+    cache["describe_repositories"] = inventory.get("ecr", "describe_repositories")
     return cache["describe_repositories"]
 
 
@@ -541,6 +543,6 @@ def ecr_latest_image_vuln_check(
                         }
                         yield finding
             except Exception as e:
-                print(e)
+                report_error(e)
         else:
             pass
@@ -13,14 +13,14 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
 
 registry = CheckRegister()
 
 # import boto3 clients
-ecs = boto3.client("ecs")
+ecs = lazy_client("ecs")
 # loop through ECS Clusters
 def list_clusters(cache):
     response = cache.get("list_clusters")
@@ -160,7 +160,7 @@ def ecs_cluster_container_insights_check(
                         }
                         yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("ecs")
@@ -282,4 +282,4 @@ def ecs_cluster_default_provider_strategy_check(
                     }
                     yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
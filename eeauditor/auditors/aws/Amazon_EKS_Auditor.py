@@ -13,14 +13,16 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
+from inventory import Inventory
 
 registry = CheckRegister()
+inventory = Inventory()
 
 # import boto3 clients
-eks = boto3.client("eks")
+eks = lazy_client("eks")
 
 
 @registry.register_check("eks")
@@ -28,7 +30,7 @@ def eks_public_endpoint_access_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # loop through EKS clusters
-    response = eks.list_clusters(maxResults=100)
+    response = inventory.get("eks", "list_clusters")
     myEksClusters = response["clusters"]
     for clusters in myEksClusters:
         cluster = str(clusters)
@@ -158,7 +160,7 @@ def eks_public_endpoint_access_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("eks")
@@ -166,7 +168,7 @@ def eks_latest_k8s_version_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # loop through EKS clusters
-    response = eks.list_clusters(maxResults=100)
+    response = inventory.get("eks", "list_clusters")
     myEksClusters = response["clusters"]
     for clusters in myEksClusters:
         cluster = str(clusters)
@@ -283,7 +285,7 @@ def eks_latest_k8s_version_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("eks")
@@ -291,7 +293,7 @@ def eks_logging_audit_auth_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # loop through EKS clusters
-    response = eks.list_clusters(maxResults=100)
+    response = inventory.get("eks", "list_clusters")
     myEksClusters = response["clusters"]
     for clusters in myEksClusters:
         cluster = str(clusters)
@@ -420,4 +422,4 @@ def eks_logging_audit_auth_check(
                             }
                             yield finding
         except Exception as e:
-            print(e)
\ No newline at end of file
+            report_error(e)
\ No newline at end of file
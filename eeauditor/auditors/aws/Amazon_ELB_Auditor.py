@@ -13,14 +13,16 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
+from inventory import Inventory
 
 registry = CheckRegister()
+inventory = Inventory()
 
 # create boto3 clients
-elb = boto3.client("elb")
+elb = lazy_client("elb")
 
 
 @registry.register_check("elb")
@@ -28,7 +30,7 @@ def internet_facing_clb_https_listener_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # loop through classic load balancers
-    response = elb.describe_load_balancers()
+    response = inventory.get("elb", "describe_load_balancers")
     for classicbalancer in response["LoadBalancerDescriptions"]:
         clbName = str(classicbalancer["LoadBalancerName"])
         clbArn = f"arn:{awsPartition}:elasticloadbalancing:{awsRegion}:{awsAccountId}:loadbalancer/{clbName}"
@@ -155,7 +157,7 @@ def clb_https_listener_tls12_policy_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # loop through classic load balancers
-    response = elb.describe_load_balancers()
+    response = inventory.get("elb", "describe_load_balancers")
     for classicbalancer in response["LoadBalancerDescriptions"]:
         clbName = str(classicbalancer["LoadBalancerName"])
         clbArn = f"arn:{awsPartition}:elasticloadbalancing:{awsRegion}:{awsAccountId}:loadbalancer/{clbName}"
@@ -279,7 +281,7 @@ def clb_cross_zone_balancing_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # loop through classic load balancers
-    response = elb.describe_load_balancers()
+    response = inventory.get("elb", "describe_load_balancers")
     for classicbalancer in response["LoadBalancerDescriptions"]:
         clbName = str(classicbalancer["LoadBalancerName"])
         clbArn = f"arn:{awsPartition}:elasticloadbalancing:{awsRegion}:{awsAccountId}:loadbalancer/{clbName}"
@@ -403,7 +405,7 @@ def clb_connection_draining_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # loop through classic load balancers
-    response = elb.describe_load_balancers()
+    response = inventory.get("elb", "describe_load_balancers")
     for classicbalancer in response["LoadBalancerDescriptions"]:
         clbName = str(classicbalancer["LoadBalancerName"])
         clbArn = f"arn:{awsPartition}:elasticloadbalancing:{awsRegion}:{awsAccountId}:loadbalancer/{clbName}"
@@ -527,7 +529,7 @@ def clb_access_logging_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # loop through classic load balancers
-    response = elb.describe_load_balancers()
+    response = inventory.get("elb", "describe_load_balancers")
     for classicbalancer in response["LoadBalancerDescriptions"]:
         clbName = str(classicbalancer["LoadBalancerName"])
         clbArn = f"arn:{awsPartition}:elasticloadbalancing:{awsRegion}:{awsAccountId}:loadbalancer/{clbName}"
@@ -13,14 +13,17 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
+from detail_loader import detail_loader
+from inventory import Inventory
 
 registry = CheckRegister()
+inventory = Inventory()
 
 # import boto3 clients
-elbv2 = boto3.client("elbv2")
+elbv2 = lazy_client("elbv2")
 # loop through ELBv2 load balancers
 
 
@@ -28,10 +31,30 @@ def describe_load_balancers(cache):
     response = cache.get("describe_load_balancers")
     if response:
         return response
-    cache["describe_load_balancers"] = elbv2.describe_load_balancers()
+    cache["describe_load_balancers"] = inventory.get("elbv2", "describe_load_balancers")
     return cache["describe_load_balancers"]
 
 
+# attributes of every load balancer, fetched concurrently once for all checks
+def load_balancer_attributes(cache):
+    return detail_loader(
+        cache,
+        "load_balancer_attributes",
+        lambda elbv2Arn: elbv2.describe_load_balancer_attributes(LoadBalancerArn=elbv2Arn),
+        (lb["LoadBalancerArn"] for lb in describe_load_balancers(cache)["LoadBalancers"]),
+    )
+
+
+# listeners of every load balancer, fetched concurrently once for all checks
+def load_balancer_listeners(cache):
+    return detail_loader(
+        cache,
+        "load_balancer_listeners",
+        lambda elbv2Arn: elbv2.describe_listeners(LoadBalancerArn=elbv2Arn),
+        (lb["LoadBalancerArn"] for lb in describe_load_balancers(cache)["LoadBalancers"]),
+    )
+
+
 @registry.register_check("elb")
 def elbv2_alb_logging_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
@@ -48,7 +71,7 @@ def elbv2_alb_logging_check(
         elbv2IpAddressType = str(loadbalancers["IpAddressType"])
         if elbv2LbType == "application":
             try:
-                response = elbv2.describe_load_balancer_attributes(LoadBalancerArn=elbv2Arn)
+                response = load_balancer_attributes(cache).get(elbv2Arn)
                 elbv2Attributes = response["Attributes"]
                 for attributes in elbv2Attributes:
                     if str(attributes["Key"]) == "access_logs.s3.enabled":
@@ -187,7 +210,7 @@ def elbv2_alb_logging_check(
                     else:
                         pass
             except Exception as e:
-                print(e)
+                report_error(e)
         else:
             pass
 
@@ -207,7 +230,7 @@ def elbv2_deletion_protection_check(
         elbv2VpcId = str(loadbalancers["VpcId"])
         elbv2IpAddressType = str(loadbalancers["IpAddressType"])
         try:
-            response = elbv2.describe_load_balancer_attributes(LoadBalancerArn=elbv2Arn)
+            response = load_balancer_attributes(cache).get(elbv2Arn)
             elbv2Attributes = response["Attributes"]
             for attributes in elbv2Attributes:
                 if str(attributes["Key"]) == "deletion_protection.enabled":
@@ -352,7 +375,7 @@ def elbv2_deletion_protection_check(
                 else:
                     pass
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("elb")
@@ -370,7 +393,7 @@ def elbv2_internet_facing_secure_listeners_check(
         elbv2VpcId = str(loadbalancers["VpcId"])
         elbv2IpAddressType = str(loadbalancers["IpAddressType"])
         try:
-            response = elbv2.describe_listeners(LoadBalancerArn=elbv2Arn)
+            response = load_balancer_listeners(cache).get(elbv2Arn)
             myElbv2Listeners = response["Listeners"]
             for listeners in myElbv2Listeners:
                 listenerProtocol = str(listeners["Protocol"])
@@ -504,7 +527,7 @@ def elbv2_internet_facing_secure_listeners_check(
                     }
                     yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("elb")
@@ -522,7 +545,7 @@ def elbv2_tls12_listener_policy_check(
         elbv2VpcId = str(loadbalancers["VpcId"])
         elbv2IpAddressType = str(loadbalancers["IpAddressType"])
         try:
-            response = elbv2.describe_listeners(LoadBalancerArn=elbv2Arn)
+            response = load_balancer_listeners(cache).get(elbv2Arn)
             myElbv2Listeners = response["Listeners"]
             for listeners in myElbv2Listeners:
                 listenerProtocol = str(listeners["Protocol"])
@@ -671,7 +694,7 @@ def elbv2_tls12_listener_policy_check(
                 else:
                     pass
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("elb")
@@ -688,7 +711,7 @@ def elbv2_drop_invalid_header_check(
         elbv2Scheme = str(loadbalancers["Scheme"])
         elbv2VpcId = str(loadbalancers["VpcId"])
         elbv2IpAddressType = str(loadbalancers["IpAddressType"])
-        response = elbv2.describe_load_balancer_attributes(LoadBalancerArn=elbv2Arn)
+        response = load_balancer_attributes(cache).get(elbv2Arn)
         elbv2Attributes = response["Attributes"]
         for attributes in elbv2Attributes:
             if str(attributes["Key"]) == "routing.http.drop_invalid_header_fields.enabled":
@@ -840,14 +863,12 @@ def elbv2_nlb_tls_logging_check(
         elbv2IpAddressType = str(loadbalancers["IpAddressType"])
         if elbv2LbType == "network":
             try:
-                response = elbv2.describe_listeners(LoadBalancerArn=elbv2Arn)
+                response = load_balancer_listeners(cache).get(elbv2Arn)
                 for listeners in response["Listeners"]:
                     protocolCheck = str(listeners["Protocol"])
                     if protocolCheck == "TLS":
                         try:
-                            response = elbv2.describe_load_balancer_attributes(
-                                LoadBalancerArn=elbv2Arn
-                            )
+                            response = load_balancer_attributes(cache).get(elbv2Arn)
                             elbv2Attributes = response["Attributes"]
                             for attributes in elbv2Attributes:
                                 if str(attributes["Key"]) == "access_logs.s3.enabled":
@@ -984,10 +1005,10 @@ def elbv2_nlb_tls_logging_check(
                                 else:
                                     pass
                         except Exception as e:
-                            print(e)
+                            report_error(e)
                     else:
                         pass
             except Exception as e:
-                print(e)
+                report_error(e)
         else:
             pass
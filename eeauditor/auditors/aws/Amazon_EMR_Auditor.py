@@ -13,15 +13,16 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import json
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
+from detail_loader import detail_loader
 
 registry = CheckRegister()
 
 # import boto3 clients
-emr = boto3.client("emr")
+emr = lazy_client("emr")
 # loop through non-terminated EMR clusters
 
 
@@ -33,6 +34,26 @@ def list_clusters(cache):
     return cache["list_clusters"]
 
 
+# details of every cluster, fetched concurrently once for all checks
+def clusters(cache):
+    return detail_loader(
+        cache,
+        "clusters",
+        lambda clusterId: emr.describe_cluster(ClusterId=clusterId),
+        (cluster["Id"] for cluster in list_clusters(cache)["Clusters"]),
+    )
+
+
+# security configurations are shared by clusters, each one is only described once
+def security_configurations(cache):
+    return detail_loader(
+        cache,
+        "security_configurations",
+        lambda secConfigName: emr.describe_security_configuration(Name=secConfigName),
+        (),
+    )
+
+
 @registry.register_check("emr")
 def emr_cluster_security_configuration_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
@@ -43,7 +64,7 @@ def emr_cluster_security_configuration_check(
         clusterId = str(cluster["Id"])
         iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         try:
-            response = emr.describe_cluster(ClusterId=clusterId)
+            response = clusters(cache).get(clusterId)
             clusterId = str(response["Cluster"]["Id"])
             clusterName = str(response["Cluster"]["Name"])
             clusterArn = str(response["Cluster"]["ClusterArn"])
@@ -186,7 +207,7 @@ def emr_cluster_security_configuration_check(
                 }
                 yield finding
             else:
-                print(e)
+                report_error(e)
 
 
 @registry.register_check("emr")
@@ -198,13 +219,13 @@ def emr_security_config_encryption_in_transit_check(
     for cluster in myEmrClusters:
         clusterId = str(cluster["Id"])
         try:
-            response = emr.describe_cluster(ClusterId=clusterId)
+            response = clusters(cache).get(clusterId)
             clusterId = str(response["Cluster"]["Id"])
             clusterName = str(response["Cluster"]["Name"])
             clusterArn = str(response["Cluster"]["ClusterArn"])
             secConfigName = str(response["Cluster"]["SecurityConfiguration"])
             try:
-                response = emr.describe_security_configuration(Name=secConfigName)
+                response = security_configurations(cache).get(secConfigName)
                 configData = str(response["SecurityConfiguration"])
                 jsonConfig = json.loads(configData)
                 try:
@@ -339,14 +360,14 @@ def emr_security_config_encryption_in_transit_check(
                         }
                         yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
             except Exception as e:
-                print(e)
+                report_error(e)
         except Exception as e:
             if str(e) == "'SecurityConfiguration'":
                 pass
             else:
-                print(e)
+                report_error(e)
 
 
 @registry.register_check("emr")
@@ -358,13 +379,13 @@ def emr_security_config_encryption_at_rest_check(
     for cluster in myEmrClusters:
         clusterId = str(cluster["Id"])
         try:
-            response = emr.describe_cluster(ClusterId=clusterId)
+            response = clusters(cache).get(clusterId)
             clusterId = str(response["Cluster"]["Id"])
             clusterName = str(response["Cluster"]["Name"])
             clusterArn = str(response["Cluster"]["ClusterArn"])
             secConfigName = str(response["Cluster"]["SecurityConfiguration"])
             try:
-                response = emr.describe_security_configuration(Name=secConfigName)
+                response = security_configurations(cache).get(secConfigName)
                 configData = str(response["SecurityConfiguration"])
                 jsonConfig = json.loads(configData)
                 try:
@@ -487,14 +508,14 @@ def emr_security_config_encryption_at_rest_check(
                         }
                         yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
             except Exception as e:
-                print(e)
+                report_error(e)
         except Exception as e:
             if str(e) == "'SecurityConfiguration'":
                 pass
             else:
-                print(e)
+                report_error(e)
 
 
 @registry.register_check("emr")
@@ -506,13 +527,13 @@ def emr_security_config_config_ebs_encryption_check(
     for cluster in myEmrClusters:
         clusterId = str(cluster["Id"])
         try:
-            response = emr.describe_cluster(ClusterId=clusterId)
+            response = clusters(cache).get(clusterId)
             clusterId = str(response["Cluster"]["Id"])
             clusterName = str(response["Cluster"]["Name"])
             clusterArn = str(response["Cluster"]["ClusterArn"])
             secConfigName = str(response["Cluster"]["SecurityConfiguration"])
             try:
-                response = emr.describe_security_configuration(Name=secConfigName)
+                response = security_configurations(cache).get(secConfigName)
                 configData = str(response["SecurityConfiguration"])
                 jsonConfig = json.loads(configData)
                 iso8601Time = (
@@ -695,14 +716,14 @@ def emr_security_config_config_ebs_encryption_check(
                         }
                         yield finding
                     else:
-                        print(e)
+                        report_error(e)
             except Exception as e:
-                print(e)
+                report_error(e)
         except Exception as e:
             if str(e) == "'SecurityConfiguration'":
                 pass
             else:
-                print(e)
+                report_error(e)
 
 
 @registry.register_check("emr")
@@ -714,13 +735,13 @@ def emr_security_config_kerberos_check(
     for cluster in myEmrClusters:
         clusterId = str(cluster["Id"])
         try:
-            response = emr.describe_cluster(ClusterId=clusterId)
+            response = clusters(cache).get(clusterId)
             clusterId = str(response["Cluster"]["Id"])
             clusterName = str(response["Cluster"]["Name"])
             clusterArn = str(response["Cluster"]["ClusterArn"])
             secConfigName = str(response["Cluster"]["SecurityConfiguration"])
             try:
-                response = emr.describe_security_configuration(Name=secConfigName)
+                response = security_configurations(cache).get(secConfigName)
                 configData = str(response["SecurityConfiguration"])
                 jsonConfig = json.loads(configData)
                 iso8601Time = (
@@ -862,14 +883,14 @@ def emr_security_config_kerberos_check(
                         }
                         yield finding
                     else:
-                        print(e)
+                        report_error(e)
             except Exception as e:
-                print(e)
+                report_error(e)
         except Exception as e:
             if str(e) == "'SecurityConfiguration'":
                 pass
             else:
-                print(e)
+                report_error(e)
 
 
 @registry.register_check("emr")
@@ -881,7 +902,7 @@ def emr_cluster_termination_protection_check(
     for cluster in myEmrClusters:
         clusterId = str(cluster["Id"])
         try:
-            response = emr.describe_cluster(ClusterId=clusterId)
+            response = clusters(cache).get(clusterId)
             clusterId = str(response["Cluster"]["Id"])
             clusterName = str(response["Cluster"]["Name"])
             clusterArn = str(response["Cluster"]["ClusterArn"])
@@ -1002,7 +1023,7 @@ def emr_cluster_termination_protection_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("emr")
@@ -1014,7 +1035,7 @@ def emr_cluster_logging_check(
     for cluster in myEmrClusters:
         clusterId = str(cluster["Id"])
         try:
-            response = emr.describe_cluster(ClusterId=clusterId)
+            response = clusters(cache).get(clusterId)
             clusterId = str(response["Cluster"]["Id"])
             clusterName = str(response["Cluster"]["Name"])
             clusterArn = str(response["Cluster"]["ClusterArn"])
@@ -1134,7 +1155,7 @@ def emr_cluster_logging_check(
                 }
                 yield finding
             else:
-                print(e)
+                report_error(e)
 
 
 @registry.register_check("emr")
@@ -1260,4 +1281,4 @@ def emr_cluster_block_secgroup_check(
             }
             yield finding
     except Exception as e:
-        print(e)
+        report_error(e)
@@ -13,20 +13,18 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from inventory import Inventory
 
 registry = CheckRegister()
-
-# import boto3 clients
-elasticache = boto3.client("elasticache")
+inventory = Inventory()
 
 
 @registry.register_check("elasticache")
 def redis_auth_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     # loop through EC clusters
-    response = elasticache.describe_cache_clusters(MaxRecords=100)
+    response = inventory.get("elasticache", "describe_cache_clusters")
     myElasticacheClusters = response["CacheClusters"]
     for clusters in myElasticacheClusters:
         clusterId = str(clusters["CacheClusterId"])
@@ -177,7 +175,7 @@ def encryption_at_rest_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # loop through EC clusters
-    response = elasticache.describe_cache_clusters(MaxRecords=100)
+    response = inventory.get("elasticache", "describe_cache_clusters")
     myElasticacheClusters = response["CacheClusters"]
     for clusters in myElasticacheClusters:
         clusterId = str(clusters["CacheClusterId"])
@@ -307,7 +305,7 @@ def encryption_in_transit_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     # loop through EC clusters
-    response = elasticache.describe_cache_clusters(MaxRecords=100)
+    response = inventory.get("elasticache", "describe_cache_clusters")
     myElasticacheClusters = response["CacheClusters"]
     for clusters in myElasticacheClusters:
         clusterId = str(clusters["CacheClusterId"])
@@ -13,14 +13,14 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
 
 registry = CheckRegister()
 
 # import boto3 clients
-elasticsearch = boto3.client("es")
+elasticsearch = lazy_client("es")
 # loop through elasticsearch domains
 def list_domain_names(cache):
     response = cache.get("list_domain_names")
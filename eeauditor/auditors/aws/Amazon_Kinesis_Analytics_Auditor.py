@@ -17,12 +17,11 @@ import datetime
 from dateutil import parser
 import uuid
 
-import boto3
-
 from check_register import CheckRegister, accumulate_paged_results
+from client_factory import lazy_client
 
 registry = CheckRegister()
-kinesisanalyticsv2 = boto3.client("kinesisanalyticsv2")
+kinesisanalyticsv2 = lazy_client("kinesisanalyticsv2")
 
 
 @registry.register_check("kinesisanalyticsv2")
@@ -13,14 +13,14 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
 
 registry = CheckRegister()
 
 # import boto3 clients
-kinesis = boto3.client("kinesis")
+kinesis = lazy_client("kinesis")
 
 
 # loop through kinesis streams
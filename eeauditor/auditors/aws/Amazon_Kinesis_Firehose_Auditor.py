@@ -13,14 +13,14 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
 
 registry = CheckRegister()
 
 # import boto3 clients
-firehose = boto3.client("firehose")
+firehose = lazy_client("firehose")
 
 
 # loop through Firehose delivery streams
@@ -156,4 +156,4 @@ def firehose_delivery_stream_encryption_check(
             else:
                 pass
         except Exception as e:
-            print(e)
+            report_error(e)
@@ -13,14 +13,17 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
+from detail_loader import detail_loader
+from inventory import Inventory
 
 registry = CheckRegister()
+inventory = Inventory()
 
 # import boto3 clients
-amzmq = boto3.client("mq")
+amzmq = lazy_client("mq")
 
 
 # loop through Amazon MQ Brokers
@@ -28,10 +31,20 @@ def list_brokers(cache):
     response = cache.get("list_brokers")
     if response:
         return response
-    cache["list_brokers"] = amzmq.list_brokers(MaxResults=100)
+    cache["list_brokers"] = inventory.get("mq", "list_brokers")
     return cache["list_brokers"]
 
 
+# details of every broker, fetched concurrently once for all checks
+def brokers(cache):
+    return detail_loader(
+        cache,
+        "brokers",
+        lambda brokerName: amzmq.describe_broker(BrokerId=brokerName),
+        (broker["BrokerName"] for broker in list_brokers(cache)["BrokerSummaries"]),
+    )
+
+
 @registry.register_check("mq")
 def broker_kms_cmk_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
@@ -41,7 +54,7 @@ def broker_kms_cmk_check(
     for broker in myBrokers:
         brokerName = str(broker["BrokerName"])
         try:
-            response = amzmq.describe_broker(BrokerId=brokerName)
+            response = brokers(cache).get(brokerName)
             brokerArn = str(response["BrokerArn"])
             brokerId = str(response["BrokerId"])
             kmsCmkCheck = str(response["EncryptionOptions"]["UseAwsOwnedKey"])
@@ -154,7 +167,7 @@ def broker_kms_cmk_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("mq")
@@ -166,7 +179,7 @@ def broker_audit_logging_check(
     for broker in myBrokers:
         brokerName = str(broker["BrokerName"])
         try:
-            response = amzmq.describe_broker(BrokerId=brokerName)
+            response = brokers(cache).get(brokerName)
             brokerArn = str(response["BrokerArn"])
             brokerId = str(response["BrokerId"])
             auditLogCheck = str(response["Logs"]["Audit"])
@@ -280,7 +293,7 @@ def broker_audit_logging_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("mq")
@@ -292,7 +305,7 @@ def broker_general_logging_check(
     for broker in myBrokers:
         brokerName = str(broker["BrokerName"])
         try:
-            response = amzmq.describe_broker(BrokerId=brokerName)
+            response = brokers(cache).get(brokerName)
             brokerArn = str(response["BrokerArn"])
             brokerId = str(response["BrokerId"])
             genLogCheck = str(response["Logs"]["General"])
@@ -408,7 +421,7 @@ def broker_general_logging_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("mq")
@@ -420,7 +433,7 @@ def broker_public_access_check(
     for broker in myBrokers:
         brokerName = str(broker["BrokerName"])
         try:
-            response = amzmq.describe_broker(BrokerId=brokerName)
+            response = brokers(cache).get(brokerName)
             brokerArn = str(response["BrokerArn"])
             brokerId = str(response["BrokerId"])
             publicAccessCheck = str(response["PubliclyAccessible"])
@@ -546,7 +559,7 @@ def broker_public_access_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("mq")
@@ -558,7 +571,7 @@ def broker_minor_version_auto_upgrade_check(
     for broker in myBrokers:
         brokerName = str(broker["BrokerName"])
         try:
-            response = amzmq.describe_broker(BrokerId=brokerName)
+            response = brokers(cache).get(brokerName)
             brokerArn = str(response["BrokerArn"])
             brokerId = str(response["BrokerId"])
             autoUpgrMinorVersionCheck = str(response["AutoMinorVersionUpgrade"])
@@ -674,4 +687,4 @@ def broker_minor_version_auto_upgrade_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
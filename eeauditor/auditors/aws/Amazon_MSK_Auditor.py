@@ -13,14 +13,14 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
 
 registry = CheckRegister()
 
 # import boto3 clients
-kafka = boto3.client("kafka")
+kafka = lazy_client("kafka")
 
 
 # loop through managed kafka clusters
@@ -1,11 +1,11 @@
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
 
 registry = CheckRegister()
 
 # import boto3 clients
-amb = boto3.client("managedblockchain")
+amb = lazy_client("managedblockchain")
 
 
 # loop through AMB Fabric networks
@@ -175,11 +175,11 @@ def amb_fabric_node_chaincode_logging_check(
                                 }
                                 yield finding
                         except Exception as e:
-                            print(e)
+                            report_error(e)
                 except Exception as e:
-                    print(e)
+                    report_error(e)
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("managedblockchain")
@@ -340,11 +340,11 @@ def amb_fabric_node_peernode_logging_check(
                                 }
                                 yield finding
                         except Exception as e:
-                            print(e)
+                            report_error(e)
                 except Exception as e:
-                    print(e)
+                    report_error(e)
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("managedblockchain")
@@ -493,6 +493,6 @@ def amb_fabric_member_ca_logging_check(
                         }
                         yield finding
                 except Exception as e:
-                    print(e)
+                    report_error(e)
         except Exception as e:
-            print(e)
+            report_error(e)
@@ -17,12 +17,11 @@ import datetime
 from dateutil import parser
 import uuid
 
-import boto3
-
 from check_register import CheckRegister, accumulate_paged_results
+from client_factory import lazy_client
 
 registry = CheckRegister()
-qldb = boto3.client("qldb")
+qldb = lazy_client("qldb")
 
 
 @registry.register_check("qldb")
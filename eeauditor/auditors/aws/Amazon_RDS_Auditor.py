@@ -13,14 +13,18 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
+from inventory import Inventory
+from resources import RDS_ENGINES
+from snapshot_audit import stream_snapshot_attributes
 
 registry = CheckRegister()
+inventory = Inventory()
 
 # import boto3 clients
-rds = boto3.client("rds")
+rds = lazy_client("rds")
 
 
 # loop through all RDS DB instances
@@ -28,37 +32,28 @@ def describe_db_instances(cache):
     response = cache.get("describe_db_instances")
     if response:
         return response
-    cache["describe_db_instances"] = rds.describe_db_instances(
-        Filters=[
-            {
-                "Name": "engine",
-                "Values": [
-                    "aurora",
-                    "aurora-mysql",
-                    "aurora-postgresql",
-                    "mariadb",
-                    "mysql",
-                    "oracle-ee",
-                    "postgres",
-                    "sqlserver-ee",
-                    "sqlserver-se",
-                    "sqlserver-ex",
-                    "sqlserver-web",
-                ],
-            }
-        ],
-        MaxRecords=100,
-    )
+    # the inventory is shared with other auditors unfiltered, so filter engines here
+    response = inventory.get("rds", "describe_db_instances")
+    cache["describe_db_instances"] = {
+        "DBInstances": [
+            instance for instance in response["DBInstances"] if instance["Engine"] in RDS_ENGINES
+        ]
+    }
     return cache["describe_db_instances"]
 
 
-# loop through all RDS DB snapshots
-def describe_db_snapshots(cache):
-    response = cache.get("describe_db_snapshots")
-    if response:
-        return response
-    cache["describe_db_snapshots"] = rds.describe_db_snapshots()
-    return cache["describe_db_snapshots"]
+# loop through all RDS DB snapshots, streamed a page at a time as there can be very many
+def describe_db_snapshots():
+    return inventory.paginate("rds", "describe_db_snapshots", "DBSnapshots")
+
+
+def db_snapshot_attributes(snapshotId):
+    response = rds.describe_db_snapshot_attributes(DBSnapshotIdentifier=snapshotId)
+    return {
+        "DBSnapshotAttributesResult": {
+            "DBSnapshotAttributes": response["DBSnapshotAttributesResult"]["DBSnapshotAttributes"]
+        }
+    }
 
 
 @registry.register_check("rds")
@@ -67,8 +62,6 @@ def rds_instance_ha_check(
 ) -> dict:
     response = describe_db_instances(cache)
     myRdsInstances = response["DBInstances"]
-    response = describe_db_snapshots(cache)
-    myRdsSnapshots = response["DBSnapshots"]
     for dbinstances in myRdsInstances:
         instanceArn = str(dbinstances["DBInstanceArn"])
         instanceId = str(dbinstances["DBInstanceIdentifier"])
@@ -210,8 +203,6 @@ def rds_instance_public_access_check(
 ) -> dict:
     response = describe_db_instances(cache)
     myRdsInstances = response["DBInstances"]
-    response = describe_db_snapshots(cache)
-    myRdsSnapshots = response["DBSnapshots"]
     for dbinstances in myRdsInstances:
         instanceArn = str(dbinstances["DBInstanceArn"])
         instanceId = str(dbinstances["DBInstanceIdentifier"])
@@ -361,8 +352,6 @@ def rds_instance_storage_encryption_check(
 ) -> dict:
     response = describe_db_instances(cache)
     myRdsInstances = response["DBInstances"]
-    response = describe_db_snapshots(cache)
-    myRdsSnapshots = response["DBSnapshots"]
     for dbinstances in myRdsInstances:
         instanceArn = str(dbinstances["DBInstanceArn"])
         instanceId = str(dbinstances["DBInstanceIdentifier"])
@@ -498,8 +487,6 @@ def rds_instance_iam_auth_check(
 ) -> dict:
     response = describe_db_instances(cache)
     myRdsInstances = response["DBInstances"]
-    response = describe_db_snapshots(cache)
-    myRdsSnapshots = response["DBSnapshots"]
     for dbinstances in myRdsInstances:
         instanceArn = str(dbinstances["DBInstanceArn"])
         instanceId = str(dbinstances["DBInstanceIdentifier"])
@@ -656,8 +643,6 @@ def rds_instance_domain_join_check(
 ) -> dict:
     response = describe_db_instances(cache)
     myRdsInstances = response["DBInstances"]
-    response = describe_db_snapshots(cache)
-    myRdsSnapshots = response["DBSnapshots"]
     for dbinstances in myRdsInstances:
         instanceArn = str(dbinstances["DBInstanceArn"])
         instanceId = str(dbinstances["DBInstanceIdentifier"])
@@ -825,8 +810,6 @@ def rds_instance_performance_insights_check(
 ) -> dict:
     response = describe_db_instances(cache)
     myRdsInstances = response["DBInstances"]
-    response = describe_db_snapshots(cache)
-    myRdsSnapshots = response["DBSnapshots"]
     for dbinstances in myRdsInstances:
         instanceArn = str(dbinstances["DBInstanceArn"])
         instanceId = str(dbinstances["DBInstanceIdentifier"])
@@ -964,8 +947,6 @@ def rds_instance_deletion_protection_check(
 ) -> dict:
     response = describe_db_instances(cache)
     myRdsInstances = response["DBInstances"]
-    response = describe_db_snapshots(cache)
-    myRdsSnapshots = response["DBSnapshots"]
     for dbinstances in myRdsInstances:
         instanceArn = str(dbinstances["DBInstanceArn"])
         instanceId = str(dbinstances["DBInstanceIdentifier"])
@@ -1109,8 +1090,6 @@ def rds_instance_cloudwatch_logging_check(
 ) -> dict:
     response = describe_db_instances(cache)
     myRdsInstances = response["DBInstances"]
-    response = describe_db_snapshots(cache)
-    myRdsSnapshots = response["DBSnapshots"]
     for dbinstances in myRdsInstances:
         instanceArn = str(dbinstances["DBInstanceArn"])
         instanceId = str(dbinstances["DBInstanceIdentifier"])
@@ -1249,11 +1228,7 @@ def rds_instance_cloudwatch_logging_check(
 def rds_snapshot_encryption_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
-    response = describe_db_instances(cache)
-    myRdsInstances = response["DBInstances"]
-    response = describe_db_snapshots(cache)
-    myRdsSnapshots = response["DBSnapshots"]
-    for snapshot in myRdsSnapshots:
+    for snapshot in describe_db_snapshots():
         snapshotId = str(snapshot["DBSnapshotIdentifier"])
         snapshotArn = str(snapshot["DBSnapshotArn"])
         snapshotEncryptionCheck = str(snapshot["Encrypted"])
@@ -1364,14 +1339,15 @@ def rds_snapshot_encryption_check(
 def rds_snapshot_public_share_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
-    response = describe_db_instances(cache)
-    myRdsInstances = response["DBInstances"]
-    response = describe_db_snapshots(cache)
-    myRdsSnapshots = response["DBSnapshots"]
-    for snapshot in myRdsSnapshots:
+    snapshotAttributes = stream_snapshot_attributes(
+        snapshots=describe_db_snapshots(),
+        snapshot_id=lambda snapshot: snapshot["DBSnapshotIdentifier"],
+        fetch=db_snapshot_attributes,
+        scope=f"rds/{awsAccountId}/{awsRegion}",
+    )
+    for snapshot, response in snapshotAttributes:
         snapshotId = str(snapshot["DBSnapshotIdentifier"])
         snapshotArn = str(snapshot["DBSnapshotArn"])
-        response = rds.describe_db_snapshot_attributes(DBSnapshotIdentifier=snapshotId)
         rdsSnapshotAttrs = response["DBSnapshotAttributesResult"]["DBSnapshotAttributes"]
         for attribute in rdsSnapshotAttrs:
             attrName = str(attribute["AttributeName"])
@@ -13,13 +13,13 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
 
 registry = CheckRegister()
 # import boto3 clients
-redshift = boto3.client("redshift")
+redshift = lazy_client("redshift")
 # loop through redshift clusters
 def describe_clusters(cache):
     response = cache.get("describe_clusters")
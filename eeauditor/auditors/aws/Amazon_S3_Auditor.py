@@ -13,29 +13,41 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
+from inventory import Inventory
+from s3_snapshot import BucketSnapshot
 
 registry = CheckRegister()
+inventory = Inventory()
 # import boto3 clients
-s3 = boto3.client("s3")
-s3control = boto3.client("s3control")
+s3control = lazy_client("s3control")
 # loop through s3 buckets
 def list_buckets(cache):
     response = cache.get("list_buckets")
     if response:
         return response
-    cache["list_buckets"] = s3.list_buckets()
+    cache["list_buckets"] = inventory.get("s3", "list_buckets")
     return cache["list_buckets"]
 
 
+# configuration of every bucket, read once and concurrently for all checks
+def bucket_snapshot(cache):
+    response = cache.get("bucket_snapshot")
+    if response:
+        return response
+    cache["bucket_snapshot"] = BucketSnapshot(list_buckets(cache=cache)["Buckets"])
+    return cache["bucket_snapshot"]
+
+
 @registry.register_check("s3")
 def bucket_encryption_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     bucket = list_buckets(cache=cache)
     myS3Buckets = bucket["Buckets"]
+    snapshot = bucket_snapshot(cache=cache)
     iso8601Time = (
         datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     )
@@ -43,7 +55,7 @@ def bucket_encryption_check(
         bucketName = str(buckets["Name"])
         s3Arn = f"arn:{awsPartition}:s3:::{bucketName}"
         try:
-            response = s3.get_bucket_encryption(Bucket=bucketName)
+            response = snapshot.get(bucketName, "get_bucket_encryption")
             for rules in response["ServerSideEncryptionConfiguration"]["Rules"]:
                 sseType = str(
                     rules["ApplyServerSideEncryptionByDefault"]["SSEAlgorithm"]
@@ -155,7 +167,7 @@ def bucket_encryption_check(
                 }
                 yield finding
             else:
-                print(e)
+                report_error(e)
 
 
 @registry.register_check("s3")
@@ -164,6 +176,7 @@ def bucket_lifecycle_check(
 ) -> dict:
     bucket = list_buckets(cache=cache)
     myS3Buckets = bucket["Buckets"]
+    snapshot = bucket_snapshot(cache=cache)
     for buckets in myS3Buckets:
         bucketName = str(buckets["Name"])
         s3Arn = f"arn:{awsPartition}:s3:::{bucketName}"
@@ -171,7 +184,7 @@ def bucket_lifecycle_check(
             datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         )
         try:
-            response = s3.get_bucket_lifecycle_configuration(Bucket=bucketName)
+            response = snapshot.get(bucketName, "get_bucket_lifecycle_configuration")
             # this is a passing check
             finding = {
                 "SchemaVersion": "2018-10-08",
@@ -287,7 +300,7 @@ def bucket_lifecycle_check(
                 }
                 yield finding
             else:
-                print(e)
+                report_error(e)
 
 
 @registry.register_check("s3")
@@ -296,6 +309,7 @@ def bucket_versioning_check(
 ) -> dict:
     bucket = list_buckets(cache=cache)
     myS3Buckets = bucket["Buckets"]
+    snapshot = bucket_snapshot(cache=cache)
     for buckets in myS3Buckets:
         bucketName = str(buckets["Name"])
         s3Arn = f"arn:{awsPartition}:s3:::{bucketName}"
@@ -303,7 +317,7 @@ def bucket_versioning_check(
             datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         )
         try:
-            response = s3.get_bucket_versioning(Bucket=bucketName)
+            response = snapshot.get(bucketName, "get_bucket_versioning")
             versioningCheck = str(response["Status"])
             print(versioningCheck)
             finding = {
@@ -417,7 +431,7 @@ def bucket_versioning_check(
                 }
                 yield finding
             else:
-                print(e)
+                report_error(e)
 
 
 @registry.register_check("s3")
@@ -426,6 +440,7 @@ def bucket_policy_allows_public_access_check(
 ) -> dict:
     bucket = list_buckets(cache=cache)
     myS3Buckets = bucket["Buckets"]
+    snapshot = bucket_snapshot(cache=cache)
     for buckets in myS3Buckets:
         bucketName = str(buckets["Name"])
         s3Arn = f"arn:{awsPartition}:s3:::{bucketName}"
@@ -433,9 +448,9 @@ def bucket_policy_allows_public_access_check(
             datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         )
         try:
-            response = s3.get_bucket_policy(Bucket=bucketName)
+            response = snapshot.get(bucketName, "get_bucket_policy")
             try:
-                response = s3.get_bucket_policy_status(Bucket=bucketName)
+                response = snapshot.get(bucketName, "get_bucket_policy_status")
                 publicBucketPolicyCheck = str(response["PolicyStatus"]["IsPublic"])
                 if publicBucketPolicyCheck != "False":
                     finding = {
@@ -550,10 +565,14 @@ def bucket_policy_allows_public_access_check(
                     }
                     yield finding
             except Exception as e:
-                print(e)
+                report_error(e)
         except Exception as e:
             # This bucket does not have a bucket policy and the status cannot be checked
-            pass
+            if (
+                str(e)
+                != "An error occurred (NoSuchBucketPolicy) when calling the GetBucketPolicy operation: The bucket policy does not exist"
+            ):
+                report_error(e)
 
 
 @registry.register_check("s3")
@@ -562,6 +581,7 @@ def bucket_policy_check(
 ) -> dict:
     bucket = list_buckets(cache=cache)
     myS3Buckets = bucket["Buckets"]
+    snapshot = bucket_snapshot(cache=cache)
     for buckets in myS3Buckets:
         bucketName = str(buckets["Name"])
         s3Arn = f"arn:{awsPartition}:s3:::{bucketName}"
@@ -569,7 +589,7 @@ def bucket_policy_check(
             datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         )
         try:
-            response = s3.get_bucket_policy(Bucket=bucketName)
+            response = snapshot.get(bucketName, "get_bucket_policy")
             # print("This bucket has a policy but we wont be printing that in the logs lol")
             # this is a passing check
             finding = {
@@ -686,7 +706,7 @@ def bucket_policy_check(
                 }
                 yield finding
             else:
-                print(e)
+                report_error(e)
 
 
 @registry.register_check("s3")
@@ -695,6 +715,7 @@ def bucket_access_logging_check(
 ) -> dict:
     bucket = list_buckets(cache=cache)
     myS3Buckets = bucket["Buckets"]
+    snapshot = bucket_snapshot(cache=cache)
     for buckets in myS3Buckets:
         bucketName = str(buckets["Name"])
         s3Arn = f"arn:{awsPartition}:s3:::{bucketName}"
@@ -702,7 +723,7 @@ def bucket_access_logging_check(
             datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
         )
         try:
-            response = s3.get_bucket_logging(Bucket=bucketName)
+            response = snapshot.get(bucketName, "get_bucket_logging")
             accessLoggingCheck = str(response["LoggingEnabled"])
             # this is a passing check
             finding = {
@@ -812,7 +833,7 @@ def bucket_access_logging_check(
                 }
                 yield finding
             else:
-                print(e)
+                report_error(e)
 
 
 @registry.register_check("s3")
@@ -15,13 +15,13 @@
 
 import datetime
 import json
-import boto3
 from check_register import CheckRegister
+from client_factory import lazy_client
 
 registry = CheckRegister()
 
 # import boto3 clients
-sns = boto3.client("sns")
+sns = lazy_client("sns")
 
 
 def list_topics(cache):
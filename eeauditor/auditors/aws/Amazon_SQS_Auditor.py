@@ -16,48 +16,46 @@
 import datetime
 from dateutil import parser
 
-import boto3
-
 from check_register import CheckRegister
+from client_factory import lazy_client
+from metric_data import MetricData
 
 registry = CheckRegister()
-sqs = boto3.client("sqs")
-cloudwatch = boto3.client("cloudwatch")
+sqs = lazy_client("sqs")
 
 
 @registry.register_check("sqs")
 def sqs_old_message_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
-    response = sqs.list_queues()
+    paginator = sqs.get_paginator("list_queues")
+    queueUrls = paginator.paginate().build_full_result().get("QueueUrls", [])
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    for queueUrl in response["QueueUrls"]:
+    metricData = MetricData(
+        start_time=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=1),
+        end_time=datetime.datetime.now(datetime.timezone.utc),
+    )
+    queues = []
+    for queueUrl in queueUrls:
         queueName = queueUrl.rsplit("/", 1)[-1]
         attributes = sqs.get_queue_attributes(
             QueueUrl=queueUrl, AttributeNames=["MessageRetentionPeriod", "QueueArn"]
         )
-        messageRetention = attributes["Attributes"]["MessageRetentionPeriod"]
-        queueArn = attributes["Attributes"]["QueueArn"]
-        metricResponse = cloudwatch.get_metric_data(
-            MetricDataQueries=[
-                {
-                    "Id": "m1",
-                    "MetricStat": {
-                        "Metric": {
-                            "Namespace": "AWS/SQS",
-                            "MetricName": "ApproximateAgeOfOldestMessage",
-                            "Dimensions": [{"Name": "QueueName", "Value": queueName}],
-                        },
-                        "Period": 3600,
-                        "Stat": "Maximum",
-                        "Unit": "Seconds",
-                    },
-                },
-            ],
-            StartTime=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=1),
-            EndTime=datetime.datetime.now(datetime.timezone.utc),
+        queryId = metricData.add(
+            namespace="AWS/SQS",
+            metric_name="ApproximateAgeOfOldestMessage",
+            dimensions=[{"Name": "QueueName", "Value": queueName}],
+            period=3600,
+            stat="Maximum",
+            unit="Seconds",
         )
-        metrics = metricResponse["MetricDataResults"]
+        queues.append((attributes["Attributes"], queryId))
+    # the metrics of every queue are fetched together
+    metricResults = metricData.fetch()
+    for queueAttributes, queryId in queues:
+        messageRetention = queueAttributes["MessageRetentionPeriod"]
+        queueArn = queueAttributes["QueueArn"]
+        metrics = [metricResults[queryId]]
         counter = 0
         fail = False
         for metric in metrics:
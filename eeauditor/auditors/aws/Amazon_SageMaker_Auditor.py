@@ -15,13 +15,12 @@
 
 import datetime
 
-import boto3
-
 from check_register import CheckRegister
+from client_factory import lazy_client
 
 registry = CheckRegister()
 # import boto3 clients
-sagemaker = boto3.client("sagemaker")
+sagemaker = lazy_client("sagemaker")
 
 
 @registry.register_check("sagemaker")
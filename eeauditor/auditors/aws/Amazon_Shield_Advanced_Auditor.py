@@ -13,22 +13,33 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
+from inventory import Inventory
 
 registry = CheckRegister()
+inventory = Inventory()
 # import boto3 clients
-shield = boto3.client("shield")
-route53 = boto3.client("route53")
-elbclassic = boto3.client("elb")
-elbv2 = boto3.client("elbv2")
-ec2 = boto3.client("ec2")
-cloudfront = boto3.client("cloudfront")
+shield = lazy_client("shield")
+route53 = lazy_client("route53")
+ec2 = lazy_client("ec2")
+cloudfront = lazy_client("cloudfront")
 
 # put conditional in each individual function
 
 
+# every resource protected by Shield Advanced, keyed by ARN, from one paginated listing
+def protections(cache):
+    if "protections" in cache:
+        return cache["protections"]
+    response = inventory.get("shield", "list_protections")
+    cache["protections"] = {
+        protection["ResourceArn"]: protection for protection in response["Protections"]
+    }
+    return cache["protections"]
+
+
 @registry.register_check("shield")
 def shield_advanced_route_53_protection_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
@@ -44,9 +55,8 @@ def shield_advanced_route_53_protection_check(
             iso8601Time = (
                 datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
             )
-            try:
-                # this is a passing check
-                response = shield.describe_protection(ResourceArn=hostedZoneArn)
+            # this is a passing check
+            if hostedZoneArn in protections(cache):
                 finding = {
                     "SchemaVersion": "2018-10-08",
                     "Id": hostedZoneArn + "/route53-shield-adv-protection-check",
@@ -100,66 +110,60 @@ def shield_advanced_route_53_protection_check(
                     "RecordState": "ARCHIVED",
                 }
                 yield finding
-            except Exception as e:
-                if (
-                    str(e)
-                    == "An error occurred (ResourceNotFoundException) when calling the DescribeProtection operation: The referenced protection does not exist."
-                ):
-                    finding = {
-                        "SchemaVersion": "2018-10-08",
-                        "Id": hostedZoneArn + "/route53-shield-adv-protection-check",
-                        "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                        "GeneratorId": hostedZoneArn,
-                        "AwsAccountId": awsAccountId,
-                        "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                        "FirstObservedAt": iso8601Time,
-                        "CreatedAt": iso8601Time,
-                        "UpdatedAt": iso8601Time,
-                        "Severity": {"Label": "MEDIUM"},
-                        "Confidence": 99,
-                        "Title": "[ShieldAdvanced.1] Route 53 Hosted Zones should be protected by Shield Advanced",
-                        "Description": "Route53 Hosted Zone "
-                        + hostedZoneId
-                        + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
-                        "Remediation": {
-                            "Recommendation": {
-                                "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
-                                "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
-                            }
-                        },
-                        "ProductFields": {"Product Name": "ElectricEye"},
-                        "Resources": [
-                            {
-                                "Type": "AwsRoute53HostedZone",
-                                "Id": hostedZoneArn,
-                                "Partition": awsPartition,
-                                "Region": awsRegion,
-                                "Details": {"Other": {"hostedZoneId": hostedZoneId}},
-                            }
+            else:
+                finding = {
+                    "SchemaVersion": "2018-10-08",
+                    "Id": hostedZoneArn + "/route53-shield-adv-protection-check",
+                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                    "GeneratorId": hostedZoneArn,
+                    "AwsAccountId": awsAccountId,
+                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                    "FirstObservedAt": iso8601Time,
+                    "CreatedAt": iso8601Time,
+                    "UpdatedAt": iso8601Time,
+                    "Severity": {"Label": "MEDIUM"},
+                    "Confidence": 99,
+                    "Title": "[ShieldAdvanced.1] Route 53 Hosted Zones should be protected by Shield Advanced",
+                    "Description": "Route53 Hosted Zone "
+                    + hostedZoneId
+                    + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
+                    "Remediation": {
+                        "Recommendation": {
+                            "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
+                            "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
+                        }
+                    },
+                    "ProductFields": {"Product Name": "ElectricEye"},
+                    "Resources": [
+                        {
+                            "Type": "AwsRoute53HostedZone",
+                            "Id": hostedZoneArn,
+                            "Partition": awsPartition,
+                            "Region": awsRegion,
+                            "Details": {"Other": {"hostedZoneId": hostedZoneId}},
+                        }
+                    ],
+                    "Compliance": {
+                        "Status": "FAILED",
+                        "RelatedRequirements": [
+                            "NIST CSF ID.BE-5",
+                            "NIST CSF PR.PT-5",
+                            "NIST SP 800-53 CP-2",
+                            "NIST SP 800-53 CP-11",
+                            "NIST SP 800-53 SA-13",
+                            "NIST SP 800-53 SA14",
+                            "AICPA TSC CC3.1",
+                            "AICPA TSC A1.2",
+                            "ISO 27001:2013 A.11.1.4",
+                            "ISO 27001:2013 A.17.1.1",
+                            "ISO 27001:2013 A.17.1.2",
+                            "ISO 27001:2013 A.17.2.1",
                         ],
-                        "Compliance": {
-                            "Status": "FAILED",
-                            "RelatedRequirements": [
-                                "NIST CSF ID.BE-5",
-                                "NIST CSF PR.PT-5",
-                                "NIST SP 800-53 CP-2",
-                                "NIST SP 800-53 CP-11",
-                                "NIST SP 800-53 SA-13",
-                                "NIST SP 800-53 SA14",
-                                "AICPA TSC CC3.1",
-                                "AICPA TSC A1.2",
-                                "ISO 27001:2013 A.11.1.4",
-                                "ISO 27001:2013 A.17.1.1",
-                                "ISO 27001:2013 A.17.1.2",
-                                "ISO 27001:2013 A.17.2.1",
-                            ],
-                        },
-                        "Workflow": {"Status": "NEW"},
-                        "RecordState": "ACTIVE",
-                    }
-                    yield finding
-                else:
-                    print(e)
+                    },
+                    "Workflow": {"Status": "NEW"},
+                    "RecordState": "ACTIVE",
+                }
+                yield finding
 
 
 @registry.register_check("shield")
@@ -169,16 +173,15 @@ def shield_advanced_elb_protection_check(
     if awsRegion != "us-east-1":
         print("Shield Advanced APIs are only available in North Virginia")
     else:
-        response = elbclassic.describe_load_balancers()
+        response = inventory.get("elb", "describe_load_balancers")
         for classicbalancer in response["LoadBalancerDescriptions"]:
             clbName = str(classicbalancer["LoadBalancerName"])
             clbArn = f"arn:{awsPartition}:elasticloadbalancing:{awsRegion}:{awsAccountId}:loadbalancer/{clbName}"
             iso8601Time = (
                 datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
             )
-            try:
-                # this is a passing check
-                response = shield.describe_protection(ResourceArn=clbArn)
+            # this is a passing check
+            if clbArn in protections(cache):
                 finding = {
                     "SchemaVersion": "2018-10-08",
                     "Id": clbArn + "/classiclb-shield-adv-protection-check",
@@ -232,66 +235,60 @@ def shield_advanced_elb_protection_check(
                     "RecordState": "ARCHIVED",
                 }
                 yield finding
-            except Exception as e:
-                if (
-                    str(e)
-                    == "An error occurred (ResourceNotFoundException) when calling the DescribeProtection operation: The referenced protection does not exist."
-                ):
-                    finding = {
-                        "SchemaVersion": "2018-10-08",
-                        "Id": clbArn + "/classiclb-shield-adv-protection-check",
-                        "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                        "GeneratorId": clbArn,
-                        "AwsAccountId": awsAccountId,
-                        "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                        "FirstObservedAt": iso8601Time,
-                        "CreatedAt": iso8601Time,
-                        "UpdatedAt": iso8601Time,
-                        "Severity": {"Label": "MEDIUM"},
-                        "Confidence": 99,
-                        "Title": "[ShieldAdvanced.2] Classic Load Balancers should be protected by Shield Advanced",
-                        "Description": "Classic Load Balancer "
-                        + clbName
-                        + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
-                        "Remediation": {
-                            "Recommendation": {
-                                "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
-                                "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
-                            }
-                        },
-                        "ProductFields": {"Product Name": "ElectricEye"},
-                        "Resources": [
-                            {
-                                "Type": "AwsElbLoadBalancer",
-                                "Id": clbArn,
-                                "Partition": awsPartition,
-                                "Region": awsRegion,
-                                "Details": {"Other": {"LoadBalancerName": clbName}},
-                            }
+            else:
+                finding = {
+                    "SchemaVersion": "2018-10-08",
+                    "Id": clbArn + "/classiclb-shield-adv-protection-check",
+                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                    "GeneratorId": clbArn,
+                    "AwsAccountId": awsAccountId,
+                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                    "FirstObservedAt": iso8601Time,
+                    "CreatedAt": iso8601Time,
+                    "UpdatedAt": iso8601Time,
+                    "Severity": {"Label": "MEDIUM"},
+                    "Confidence": 99,
+                    "Title": "[ShieldAdvanced.2] Classic Load Balancers should be protected by Shield Advanced",
+                    "Description": "Classic Load Balancer "
+                    + clbName
+                    + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
+                    "Remediation": {
+                        "Recommendation": {
+                            "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
+                            "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
+                        }
+                    },
+                    "ProductFields": {"Product Name": "ElectricEye"},
+                    "Resources": [
+                        {
+                            "Type": "AwsElbLoadBalancer",
+                            "Id": clbArn,
+                            "Partition": awsPartition,
+                            "Region": awsRegion,
+                            "Details": {"Other": {"LoadBalancerName": clbName}},
+                        }
+                    ],
+                    "Compliance": {
+                        "Status": "FAILED",
+                        "RelatedRequirements": [
+                            "NIST CSF ID.BE-5",
+                            "NIST CSF PR.PT-5",
+                            "NIST SP 800-53 CP-2",
+                            "NIST SP 800-53 CP-11",
+                            "NIST SP 800-53 SA-13",
+                            "NIST SP 800-53 SA14",
+                            "AICPA TSC CC3.1",
+                            "AICPA TSC A1.2",
+                            "ISO 27001:2013 A.11.1.4",
+                            "ISO 27001:2013 A.17.1.1",
+                            "ISO 27001:2013 A.17.1.2",
+                            "ISO 27001:2013 A.17.2.1",
                         ],
-                        "Compliance": {
-                            "Status": "FAILED",
-                            "RelatedRequirements": [
-                                "NIST CSF ID.BE-5",
-                                "NIST CSF PR.PT-5",
-                                "NIST SP 800-53 CP-2",
-                                "NIST SP 800-53 CP-11",
-                                "NIST SP 800-53 SA-13",
-                                "NIST SP 800-53 SA14",
-                                "AICPA TSC CC3.1",
-                                "AICPA TSC A1.2",
-                                "ISO 27001:2013 A.11.1.4",
-                                "ISO 27001:2013 A.17.1.1",
-                                "ISO 27001:2013 A.17.1.2",
-                                "ISO 27001:2013 A.17.2.1",
-                            ],
-                        },
-                        "Workflow": {"Status": "NEW"},
-                        "RecordState": "ACTIVE",
-                    }
-                    yield finding
-                else:
-                    print(e)
+                    },
+                    "Workflow": {"Status": "NEW"},
+                    "RecordState": "ACTIVE",
+                }
+                yield finding
 
 
 @registry.register_check("shield")
@@ -301,7 +298,7 @@ def shield_advanced_elb_v2_protection_check(
     if awsRegion != "us-east-1":
         print("Shield Advanced APIs are only available in North Virginia")
     else:
-        response = elbv2.describe_load_balancers()
+        response = inventory.get("elbv2", "describe_load_balancers")
         for loadbalancer in response["LoadBalancers"]:
             elbv2Name = str(loadbalancer["LoadBalancerName"])
             elbv2Arn = str(loadbalancer["LoadBalancerArn"])
@@ -313,9 +310,8 @@ def shield_advanced_elb_v2_protection_check(
             iso8601Time = (
                 datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
             )
-            try:
-                # this is a passing check
-                response = shield.describe_protection(ResourceArn=elbv2Arn)
+            # this is a passing check
+            if elbv2Arn in protections(cache):
                 finding = {
                     "SchemaVersion": "2018-10-08",
                     "Id": elbv2Arn + "/elbv2-shield-adv-protection-check",
@@ -379,76 +375,70 @@ def shield_advanced_elb_v2_protection_check(
                     "RecordState": "ARCHIVED",
                 }
                 yield finding
-            except Exception as e:
-                if (
-                    str(e)
-                    == "An error occurred (ResourceNotFoundException) when calling the DescribeProtection operation: The referenced protection does not exist."
-                ):
-                    finding = {
-                        "SchemaVersion": "2018-10-08",
-                        "Id": elbv2Arn + "/elbv2-shield-adv-protection-check",
-                        "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                        "GeneratorId": elbv2Arn,
-                        "AwsAccountId": awsAccountId,
-                        "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                        "FirstObservedAt": iso8601Time,
-                        "CreatedAt": iso8601Time,
-                        "UpdatedAt": iso8601Time,
-                        "Severity": {"Label": "MEDIUM"},
-                        "Confidence": 99,
-                        "Title": "[ShieldAdvanced.3] ELBv2 Load Balancers should be protected by Shield Advanced",
-                        "Description": "ELBv2 "
-                        + elbv2LbType
-                        + " load balancer "
-                        + elbv2Name
-                        + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
-                        "Remediation": {
-                            "Recommendation": {
-                                "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
-                                "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
-                            }
-                        },
-                        "ProductFields": {"Product Name": "ElectricEye"},
-                        "Resources": [
-                            {
-                                "Type": "AwsElbv2LoadBalancer",
-                                "Id": elbv2Arn,
-                                "Partition": awsPartition,
-                                "Region": awsRegion,
-                                "Details": {
-                                    "AwsElbv2LoadBalancer": {
-                                        "DNSName": elbv2DnsName,
-                                        "IpAddressType": elbv2IpAddressType,
-                                        "Scheme": elbv2Scheme,
-                                        "Type": elbv2LbType,
-                                        "VpcId": elbv2VpcId,
-                                    }
-                                },
-                            }
+            else:
+                finding = {
+                    "SchemaVersion": "2018-10-08",
+                    "Id": elbv2Arn + "/elbv2-shield-adv-protection-check",
+                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                    "GeneratorId": elbv2Arn,
+                    "AwsAccountId": awsAccountId,
+                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                    "FirstObservedAt": iso8601Time,
+                    "CreatedAt": iso8601Time,
+                    "UpdatedAt": iso8601Time,
+                    "Severity": {"Label": "MEDIUM"},
+                    "Confidence": 99,
+                    "Title": "[ShieldAdvanced.3] ELBv2 Load Balancers should be protected by Shield Advanced",
+                    "Description": "ELBv2 "
+                    + elbv2LbType
+                    + " load balancer "
+                    + elbv2Name
+                    + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
+                    "Remediation": {
+                        "Recommendation": {
+                            "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
+                            "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
+                        }
+                    },
+                    "ProductFields": {"Product Name": "ElectricEye"},
+                    "Resources": [
+                        {
+                            "Type": "AwsElbv2LoadBalancer",
+                            "Id": elbv2Arn,
+                            "Partition": awsPartition,
+                            "Region": awsRegion,
+                            "Details": {
+                                "AwsElbv2LoadBalancer": {
+                                    "DNSName": elbv2DnsName,
+                                    "IpAddressType": elbv2IpAddressType,
+                                    "Scheme": elbv2Scheme,
+                                    "Type": elbv2LbType,
+                                    "VpcId": elbv2VpcId,
+                                }
+                            },
+                        }
+                    ],
+                    "Compliance": {
+                        "Status": "FAILED",
+                        "RelatedRequirements": [
+                            "NIST CSF ID.BE-5",
+                            "NIST CSF PR.PT-5",
+                            "NIST SP 800-53 CP-2",
+                            "NIST SP 800-53 CP-11",
+                            "NIST SP 800-53 SA-13",
+                            "NIST SP 800-53 SA14",
+                            "AICPA TSC CC3.1",
+                            "AICPA TSC A1.2",
+                            "ISO 27001:2013 A.11.1.4",
+                            "ISO 27001:2013 A.17.1.1",
+                            "ISO 27001:2013 A.17.1.2",
+                            "ISO 27001:2013 A.17.2.1",
                         ],
-                        "Compliance": {
-                            "Status": "FAILED",
-                            "RelatedRequirements": [
-                                "NIST CSF ID.BE-5",
-                                "NIST CSF PR.PT-5",
-                                "NIST SP 800-53 CP-2",
-                                "NIST SP 800-53 CP-11",
-                                "NIST SP 800-53 SA-13",
-                                "NIST SP 800-53 SA14",
-                                "AICPA TSC CC3.1",
-                                "AICPA TSC A1.2",
-                                "ISO 27001:2013 A.11.1.4",
-                                "ISO 27001:2013 A.17.1.1",
-                                "ISO 27001:2013 A.17.1.2",
-                                "ISO 27001:2013 A.17.2.1",
-                            ],
-                        },
-                        "Workflow": {"Status": "NEW"},
-                        "RecordState": "ACTIVE",
-                    }
-                    yield finding
-                else:
-                    print(e)
+                    },
+                    "Workflow": {"Status": "NEW"},
+                    "RecordState": "ACTIVE",
+                }
+                yield finding
 
 
 @registry.register_check("shield")
@@ -467,9 +457,8 @@ def shield_advanced_eip_protection_check(
             iso8601Time = (
                 datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
             )
-            try:
-                # this is a passing check
-                response = shield.describe_protection(ResourceArn=eipAllocationArn)
+            # this is a passing check
+            if eipAllocationArn in protections(cache):
                 finding = {
                     "SchemaVersion": "2018-10-08",
                     "Id": eipAllocationArn + "/elasticip-shield-adv-protection-check",
@@ -523,66 +512,60 @@ def shield_advanced_eip_protection_check(
                     "RecordState": "ARCHIVED",
                 }
                 yield finding
-            except Exception as e:
-                if (
-                    str(e)
-                    == "An error occurred (ResourceNotFoundException) when calling the DescribeProtection operation: The referenced protection does not exist."
-                ):
-                    finding = {
-                        "SchemaVersion": "2018-10-08",
-                        "Id": eipAllocationArn + "/elasticip-shield-adv-protection-check",
-                        "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                        "GeneratorId": eipAllocationArn,
-                        "AwsAccountId": awsAccountId,
-                        "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                        "FirstObservedAt": iso8601Time,
-                        "CreatedAt": iso8601Time,
-                        "UpdatedAt": iso8601Time,
-                        "Severity": {"Label": "MEDIUM"},
-                        "Confidence": 99,
-                        "Title": "[ShieldAdvanced.4] Elastic IPs should be protected by Shield Advanced",
-                        "Description": "Elastic IP allocation "
-                        + allocationId
-                        + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
-                        "Remediation": {
-                            "Recommendation": {
-                                "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
-                                "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
-                            }
-                        },
-                        "ProductFields": {"Product Name": "ElectricEye"},
-                        "Resources": [
-                            {
-                                "Type": "AwsEc2Eip",
-                                "Id": eipAllocationArn,
-                                "Partition": awsPartition,
-                                "Region": awsRegion,
-                                "Details": {"Other": {"AllocationId": allocationId}},
-                            }
+            else:
+                finding = {
+                    "SchemaVersion": "2018-10-08",
+                    "Id": eipAllocationArn + "/elasticip-shield-adv-protection-check",
+                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                    "GeneratorId": eipAllocationArn,
+                    "AwsAccountId": awsAccountId,
+                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                    "FirstObservedAt": iso8601Time,
+                    "CreatedAt": iso8601Time,
+                    "UpdatedAt": iso8601Time,
+                    "Severity": {"Label": "MEDIUM"},
+                    "Confidence": 99,
+                    "Title": "[ShieldAdvanced.4] Elastic IPs should be protected by Shield Advanced",
+                    "Description": "Elastic IP allocation "
+                    + allocationId
+                    + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
+                    "Remediation": {
+                        "Recommendation": {
+                            "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
+                            "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
+                        }
+                    },
+                    "ProductFields": {"Product Name": "ElectricEye"},
+                    "Resources": [
+                        {
+                            "Type": "AwsEc2Eip",
+                            "Id": eipAllocationArn,
+                            "Partition": awsPartition,
+                            "Region": awsRegion,
+                            "Details": {"Other": {"AllocationId": allocationId}},
+                        }
+                    ],
+                    "Compliance": {
+                        "Status": "FAILED",
+                        "RelatedRequirements": [
+                            "NIST CSF ID.BE-5",
+                            "NIST CSF PR.PT-5",
+                            "NIST SP 800-53 CP-2",
+                            "NIST SP 800-53 CP-11",
+                            "NIST SP 800-53 SA-13",
+                            "NIST SP 800-53 SA14",
+                            "AICPA TSC CC3.1",
+                            "AICPA TSC A1.2",
+                            "ISO 27001:2013 A.11.1.4",
+                            "ISO 27001:2013 A.17.1.1",
+                            "ISO 27001:2013 A.17.1.2",
+                            "ISO 27001:2013 A.17.2.1",
                         ],
-                        "Compliance": {
-                            "Status": "FAILED",
-                            "RelatedRequirements": [
-                                "NIST CSF ID.BE-5",
-                                "NIST CSF PR.PT-5",
-                                "NIST SP 800-53 CP-2",
-                                "NIST SP 800-53 CP-11",
-                                "NIST SP 800-53 SA-13",
-                                "NIST SP 800-53 SA14",
-                                "AICPA TSC CC3.1",
-                                "AICPA TSC A1.2",
-                                "ISO 27001:2013 A.11.1.4",
-                                "ISO 27001:2013 A.17.1.1",
-                                "ISO 27001:2013 A.17.1.2",
-                                "ISO 27001:2013 A.17.2.1",
-                            ],
-                        },
-                        "Workflow": {"Status": "NEW"},
-                        "RecordState": "ACTIVE",
-                    }
-                    yield finding
-                else:
-                    print(e)
+                    },
+                    "Workflow": {"Status": "NEW"},
+                    "RecordState": "ACTIVE",
+                }
+                yield finding
 
 
 @registry.register_check("shield")
@@ -602,9 +585,8 @@ def shield_advanced_cloudfront_protection_check(
             iso8601Time = (
                 datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
             )
-            try:
-                # this is a passing check
-                response = shield.describe_protection(ResourceArn=distroArn)
+            # this is a passing check
+            if distroArn in protections(cache):
                 finding = {
                     "SchemaVersion": "2018-10-08",
                     "Id": distroArn + "/cloudfront-shield-adv-protection-check",
@@ -660,68 +642,62 @@ def shield_advanced_cloudfront_protection_check(
                     "RecordState": "ARCHIVED",
                 }
                 yield finding
-            except Exception as e:
-                if (
-                    str(e)
-                    == "An error occurred (ResourceNotFoundException) when calling the DescribeProtection operation: The referenced protection does not exist."
-                ):
-                    finding = {
-                        "SchemaVersion": "2018-10-08",
-                        "Id": distroArn + "/cloudfront-shield-adv-protection-check",
-                        "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                        "GeneratorId": distroArn,
-                        "AwsAccountId": awsAccountId,
-                        "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                        "FirstObservedAt": iso8601Time,
-                        "CreatedAt": iso8601Time,
-                        "UpdatedAt": iso8601Time,
-                        "Severity": {"Label": "MEDIUM"},
-                        "Confidence": 99,
-                        "Title": "[ShieldAdvanced.5] CloudFront distributions should be protected by Shield Advanced",
-                        "Description": "CloudFront distribution "
-                        + distroId
-                        + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
-                        "Remediation": {
-                            "Recommendation": {
-                                "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
-                                "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
-                            }
-                        },
-                        "ProductFields": {"Product Name": "ElectricEye"},
-                        "Resources": [
-                            {
-                                "Type": "AwsCloudFrontDistribution",
-                                "Id": distroArn,
-                                "Partition": awsPartition,
-                                "Region": awsRegion,
-                                "Details": {
-                                    "AwsCloudFrontDistribution": {"DomainName": distroDomainName}
-                                },
-                            }
+            else:
+                finding = {
+                    "SchemaVersion": "2018-10-08",
+                    "Id": distroArn + "/cloudfront-shield-adv-protection-check",
+                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                    "GeneratorId": distroArn,
+                    "AwsAccountId": awsAccountId,
+                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                    "FirstObservedAt": iso8601Time,
+                    "CreatedAt": iso8601Time,
+                    "UpdatedAt": iso8601Time,
+                    "Severity": {"Label": "MEDIUM"},
+                    "Confidence": 99,
+                    "Title": "[ShieldAdvanced.5] CloudFront distributions should be protected by Shield Advanced",
+                    "Description": "CloudFront distribution "
+                    + distroId
+                    + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
+                    "Remediation": {
+                        "Recommendation": {
+                            "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
+                            "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
+                        }
+                    },
+                    "ProductFields": {"Product Name": "ElectricEye"},
+                    "Resources": [
+                        {
+                            "Type": "AwsCloudFrontDistribution",
+                            "Id": distroArn,
+                            "Partition": awsPartition,
+                            "Region": awsRegion,
+                            "Details": {
+                                "AwsCloudFrontDistribution": {"DomainName": distroDomainName}
+                            },
+                        }
+                    ],
+                    "Compliance": {
+                        "Status": "FAILED",
+                        "RelatedRequirements": [
+                            "NIST CSF ID.BE-5",
+                            "NIST CSF PR.PT-5",
+                            "NIST SP 800-53 CP-2",
+                            "NIST SP 800-53 CP-11",
+                            "NIST SP 800-53 SA-13",
+                            "NIST SP 800-53 SA14",
+                            "AICPA TSC CC3.1",
+                            "AICPA TSC A1.2",
+                            "ISO 27001:2013 A.11.1.4",
+                            "ISO 27001:2013 A.17.1.1",
+                            "ISO 27001:2013 A.17.1.2",
+                            "ISO 27001:2013 A.17.2.1",
                         ],
-                        "Compliance": {
-                            "Status": "FAILED",
-                            "RelatedRequirements": [
-                                "NIST CSF ID.BE-5",
-                                "NIST CSF PR.PT-5",
-                                "NIST SP 800-53 CP-2",
-                                "NIST SP 800-53 CP-11",
-                                "NIST SP 800-53 SA-13",
-                                "NIST SP 800-53 SA14",
-                                "AICPA TSC CC3.1",
-                                "AICPA TSC A1.2",
-                                "ISO 27001:2013 A.11.1.4",
-                                "ISO 27001:2013 A.17.1.1",
-                                "ISO 27001:2013 A.17.1.2",
-                                "ISO 27001:2013 A.17.2.1",
-                            ],
-                        },
-                        "Workflow": {"Status": "NEW"},
-                        "RecordState": "ACTIVE",
-                    }
-                    yield finding
-                else:
-                    print(e)
+                    },
+                    "Workflow": {"Status": "NEW"},
+                    "RecordState": "ACTIVE",
+                }
+                yield finding
 
 
 @registry.register_check("shield")
@@ -13,13 +13,13 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
 from check_register import CheckRegister
+from client_factory import lazy_client
 
 registry = CheckRegister()
 # create boto3 clients
-ec2 = boto3.client("ec2")
+ec2 = lazy_client("ec2")
 # loop through vpcs
 def describe_vpcs(cache):
     response = cache.get("describe_vpcs")
@@ -13,13 +13,13 @@
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
 
-import boto3
 import datetime
-from check_register import CheckRegister
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
 
 registry = CheckRegister()
 # import boto3 clients
-workspaces = boto3.client("workspaces")
+workspaces = lazy_client("workspaces")
 # loop through workspaces
 def describe_workspaces(cache):
     response = cache.get("describe_workspaces", [])
@@ -147,7 +147,7 @@ def workspaces_user_volume_encryption_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("workspaces")
@@ -267,7 +267,7 @@ def workspaces_root_volume_encryption_check(
                 }
                 yield finding
         except Exception as e:
-            print(e)
+            report_error(e)
 
 
 @registry.register_check("workspaces")
@@ -1,28 +1,31 @@
-import boto3
 import os
-import requests
 import socket
 import json
 import datetime
-from check_register import CheckRegister
+from functools import lru_cache
+from check_register import CheckRegister, report_error
+from client_factory import lazy_client
+from inventory import Inventory
+from shodan_client import ShodanClient
 
 registry = CheckRegister()
+inventory = Inventory()
 # import boto3 clients
-ssm = boto3.client("ssm")
-ec2 = boto3.client("ec2")
-elbv2 = boto3.client("elbv2")
-rds = boto3.client("rds")
-elasticsearch = boto3.client("es")
-elb = boto3.client("elb")
-dms = boto3.client("dms")
-amzmq = boto3.client("mq")
+ssm = lazy_client("ssm")
+elasticsearch = lazy_client("es")
+dms = lazy_client("dms")
+amzmq = lazy_client("mq")
 
-apiKeyParam = os.environ["SHODAN_API_KEY_PARAM"]
+# looks up each IP once per run, and not at all while its cached result is fresh
+shodan = ShodanClient()
 
-# Shodan information for Requests
-shodanUrl = "https://api.shodan.io/shodan/host/"
-response = ssm.get_parameter(Name=apiKeyParam, WithDecryption=True)
-shodanApiKey = str(response["Parameter"]["Value"])
+
+@lru_cache(maxsize=None)
+def get_shodan_api_key():
+    # read on first use rather than at import so listing checks makes no API calls
+    apiKeyParam = os.environ["SHODAN_API_KEY_PARAM"]
+    response = ssm.get_parameter(Name=apiKeyParam, WithDecryption=True)
+    return str(response["Parameter"]["Value"])
 
 
 @registry.register_check("shodan")
@@ -30,7 +33,17 @@ def public_ec2_shodan_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     try:
-        response = ec2.describe_instances(DryRun=False, MaxResults=500)
+        response = inventory.get("ec2", "describe_instances")
+        # look the public IPs up concurrently, the loop below then reads them from memory
+        shodan.prefetch(
+            [
+                inst["PublicIpAddress"]
+                for res in response["Reservations"]
+                for inst in res["Instances"]
+                if "PublicIpAddress" in inst
+            ],
+            get_shodan_api_key(),
+        )
         for res in response["Reservations"]:
             for inst in res["Instances"]:
                 ec2Type = str(inst["InstanceType"])
@@ -45,9 +58,8 @@ def public_ec2_shodan_check(
                 )
                 try:
                     ec2PublicIp = str(inst["PublicIpAddress"])
-                    # use requests Library to check the Shodan index for your host
-                    r = requests.get(url=shodanUrl + ec2PublicIp + "?key=" + shodanApiKey)
-                    data = r.json()
+                    # check the Shodan index for your host
+                    data = shodan.host(ec2PublicIp, get_shodan_api_key())
                     shodanOutput = str(data)
                     if shodanOutput == "{'error': 'No information available for that IP.'}":
                         # this is a passing check
@@ -182,9 +194,9 @@ def public_ec2_shodan_check(
                         print(ec2Id + " does not have a Public IPv4 Address, skipping")
                         pass
                     else:
-                        print(e)
+                        report_error(e)
     except Exception as e:
-        print(e)
+        report_error(e)
 
 
 @registry.register_check("shodan")
@@ -192,7 +204,7 @@ def public_alb_shodan_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     try:
-        response = elbv2.describe_load_balancers()
+        response = inventory.get("elbv2", "describe_load_balancers")
         for lbs in response["LoadBalancers"]:
             elbv2Scheme = str(lbs["Scheme"])
             elbv2Type = str(lbs["Type"])
@@ -206,9 +218,8 @@ def public_alb_shodan_check(
             if elbv2Scheme == "internet-facing" and elbv2Type == "application":
                 # use Socket to do a DNS lookup and retrieve the IP address
                 elbv2Ip = socket.gethostbyname(elbv2Dns)
-                # use requests Library to check the Shodan index for your host
-                r = requests.get(url=shodanUrl + elbv2Ip + "?key=" + shodanApiKey)
-                data = r.json()
+                # check the Shodan index for your host
+                data = shodan.host(elbv2Ip, get_shodan_api_key())
                 shodanOutput = str(data)
                 if shodanOutput == "{'error': 'No information available for that IP.'}":
                     # this is a passing check
@@ -339,7 +350,7 @@ def public_alb_shodan_check(
             else:
                 print(elbv2Name + " is not an ALB or is not internet-facing, skipping")
     except Exception as e:
-        print(e)
+        report_error(e)
 
 
 @registry.register_check("shodan")
@@ -347,7 +358,7 @@ def public_rds_shodan_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     try:
-        response = rds.describe_db_instances()
+        response = inventory.get("rds", "describe_db_instances")
         for rdsdb in response["DBInstances"]:
             rdsInstanceId = str(rdsdb["DBInstanceIdentifier"])
             rdsInstanceArn = str(rdsdb["DBInstanceArn"])
@@ -363,9 +374,8 @@ def public_rds_shodan_check(
             if publicCheck == "True":
                 # use Socket to do a DNS lookup and retrieve the IP address
                 rdsIp = socket.gethostbyname(rdsDns)
-                # use requests Library to check the Shodan index for your host
-                r = requests.get(url=shodanUrl + rdsIp + "?key=" + shodanApiKey)
-                data = r.json()
+                # check the Shodan index for your host
+                data = shodan.host(rdsIp, get_shodan_api_key())
                 shodanOutput = str(data)
                 if shodanOutput == "{'error': 'No information available for that IP.'}":
                     # this is a passing check
@@ -500,7 +510,7 @@ def public_rds_shodan_check(
             else:
                 print(rdsInstanceId + " is not Publicly Accessible, skipping")
     except Exception as e:
-        print(e)
+        report_error(e)
 
 
 @registry.register_check("shodan")
@@ -529,9 +539,8 @@ def public_es_domain_shodan_check(
                     if str(e) == "'VPCOptions'":
                         # use Socket to do a DNS lookup and retrieve the IP address
                         esDomainIp = socket.gethostbyname(esDomainEndpoint)
-                        # use requests Library to check the Shodan index for your host
-                        r = requests.get(url=shodanUrl + esDomainIp + "?key=" + shodanApiKey)
-                        data = r.json()
+                        # check the Shodan index for your host
+                        data = shodan.host(esDomainIp, get_shodan_api_key())
                         shodanOutput = str(data)
                         if shodanOutput == "{'error': 'No information available for that IP.'}":
                             # this is a passing check
@@ -668,11 +677,11 @@ def public_es_domain_shodan_check(
                             }
                             yield finding
                     else:
-                        print(e)
+                        report_error(e)
             except Exception as e:
-                print(e)
+                report_error(e)
     except Exception as e:
-        print(e)
+        report_error(e)
 
 
 @registry.register_check("shodan")
@@ -680,7 +689,7 @@ def public_clb_shodan_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     try:
-        response = elb.describe_load_balancers()
+        response = inventory.get("elb", "describe_load_balancers")
         for clbs in response["LoadBalancerDescriptions"]:
             clbName = str(clbs["LoadBalancerName"])
             clbArn = f"arn:{awsPartition}:elasticloadbalancing:{awsRegion}:{awsAccountId}:loadbalancer/{clbName}"
@@ -692,9 +701,8 @@ def public_clb_shodan_check(
             if clbScheme == "internet-facing":
                 # use Socket to do a DNS lookup and retrieve the IP address
                 clbIp = socket.gethostbyname(clbDnsName)
-                # use requests Library to check the Shodan index for your host
-                r = requests.get(url=shodanUrl + clbIp + "?key=" + shodanApiKey)
-                data = r.json()
+                # check the Shodan index for your host
+                data = shodan.host(clbIp, get_shodan_api_key())
                 shodanOutput = str(data)
                 if shodanOutput == "{'error': 'No information available for that IP.'}":
                     # this is a passing check
@@ -819,7 +827,7 @@ def public_clb_shodan_check(
             else:
                 pass
     except Exception as e:
-        print(e)
+        report_error(e)
 
 
 @registry.register_check("shodan")
@@ -837,9 +845,8 @@ def public_dms_replication_instance_shodan_check(
             )
             if publicAccessCheck == "True":
                 dmsPublicIp = str(repinstances["ReplicationInstancePublicIpAddress"])
-                # use requests Library to check the Shodan index for your host
-                r = requests.get(url=shodanUrl + dmsPublicIp + "?key=" + shodanApiKey)
-                data = r.json()
+                # check the Shodan index for your host
+                data = shodan.host(dmsPublicIp, get_shodan_api_key())
                 shodanOutput = str(data)
                 if shodanOutput == "{'error': 'No information available for that IP.'}":
                     # this is a passing check
@@ -962,7 +969,7 @@ def public_dms_replication_instance_shodan_check(
             else:
                 pass
     except Exception as e:
-        print(e)
+        report_error(e)
 
 
 @registry.register_check("shodan")
@@ -970,7 +977,7 @@ def public_amazon_mq_broker_shodan_check(
     cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str
 ) -> dict:
     try:
-        response = amzmq.list_brokers(MaxResults=100)
+        response = inventory.get("mq", "list_brokers")
         myBrokers = response["BrokerSummaries"]
         for brokers in myBrokers:
             brokerName = str(brokers["BrokerName"])
@@ -983,8 +990,7 @@ def public_amazon_mq_broker_shodan_check(
                     mqInstances = response["BrokerInstances"]
                     for instance in mqInstances:
                         mqBrokerIpv4 = str(instance["IpAddress"])
-                        r = requests.get(url=shodanUrl + mqBrokerIpv4 + "?key=" + shodanApiKey)
-                        data = r.json()
+                        data = shodan.host(mqBrokerIpv4, get_shodan_api_key())
                         shodanOutput = str(data)
                         iso8601time = (
                             datetime.datetime.utcnow()
@@ -1111,6 +1117,6 @@ def public_amazon_mq_broker_shodan_check(
                 else:
                     pass
             except Exception as e:
-                print(e)
+                report_error(e)
     except Exception as e:
-        print(e)
+        report_error(e)
@@ -0,0 +1,178 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+import ast
+import json
+import os
+import sys
+
+MANIFEST_FILE_NAME = "check_manifest.json"
+
+
+def build_manifest(search_path):
+    """Return the checks of every auditor module in search_path without importing them
+
+    Each check is found from its @registry.register_check("service") decorator, so
+    building the manifest runs no auditor code and makes no API calls. The shared
+    inventory operations a check reads, directly or through helpers of its module, are
+    recorded so resources can be re-audited by only the checks that look at them.
+    """
+    manifest = []
+    for module_name in list_modules(search_path):
+        with open(os.path.join(search_path, f"{module_name}.py")) as source:
+            tree = ast.parse(source.read())
+        functions = {node.name: node for node in tree.body if isinstance(node, ast.FunctionDef)}
+        for node in functions.values():
+            service_name = get_registered_service(node)
+            if service_name is None:
+                continue
+            manifest.append(
+                {
+                    "check": node.name,
+                    "module": module_name,
+                    "service": service_name,
+                    "description": ast.get_docstring(node, clean=False) or "",
+                    "inventory": get_inventory_operations(node, functions),
+                }
+            )
+    return manifest
+
+
+def get_registered_service(node):
+    """Return the service a function is registered for, or None if it is not a check"""
+    for decorator in node.decorator_list:
+        if (
+            isinstance(decorator, ast.Call)
+            and isinstance(decorator.func, ast.Attribute)
+            and decorator.func.attr == "register_check"
+            and decorator.args
+            and isinstance(decorator.args[0], ast.Constant)
+        ):
+            return decorator.args[0].value
+    return None
+
+
+def get_inventory_operations(node, functions, seen=None):
+    """Return the [service, operation] inventory calls made by a function or its helpers"""
+    seen = seen if seen is not None else {node.name}
+    operations = []
+    for call in ast.walk(node):
+        if not isinstance(call, ast.Call):
+            continue
+        if (
+            isinstance(call.func, ast.Attribute)
+            and isinstance(call.func.value, ast.Name)
+            and call.func.value.id == "inventory"
+            and call.func.attr in ["get", "paginate"]
+            and len(call.args) >= 2
+            and all(isinstance(arg, ast.Constant) for arg in call.args[:2])
+        ):
+            found = [[call.args[0].value, call.args[1].value]]
+        elif (
+            isinstance(call.func, ast.Name)
+            and call.func.id in functions
+            and call.func.id not in seen
+        ):
+            seen.add(call.func.id)
+            found = get_inventory_operations(functions[call.func.id], functions, seen)
+        else:
+            continue
+        operations.extend(operation for operation in found if operation not in operations)
+    return operations
+
+
+def list_modules(search_path):
+    return sorted(
+        file_name[:-3]
+        for file_name in os.listdir(search_path)
+        if file_name.endswith(".py") and not file_name.startswith("_")
+    )
+
+
+def load_manifest(search_path):
+    """Return the manifest of search_path
+
+    The generated manifest file is used when it is present and no auditor module was
+    added, removed or changed after it was written, otherwise the manifest is rebuilt.
+    """
+    manifest_file = os.path.join(search_path, MANIFEST_FILE_NAME)
+    try:
+        written_at = os.path.getmtime(manifest_file)
+        with open(manifest_file) as manifest:
+            checks = json.load(manifest)
+    except (IOError, ValueError):
+        return build_manifest(search_path)
+    modules = list_modules(search_path)
+    if set(modules) != {check["module"] for check in checks} or any(
+        os.path.getmtime(os.path.join(search_path, f"{module_name}.py")) > written_at
+        for module_name in modules
+    ):
+        return build_manifest(search_path)
+    return checks
+
+
+def write_manifest(search_path):
+    manifest = build_manifest(search_path)
+    with open(os.path.join(search_path, MANIFEST_FILE_NAME), "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+        manifest_file.write("\n")
+    return manifest
+
+
+def select_checks(manifest, operations):
+    """Return the checks that read any of the (service, operation) inventory operations"""
+    operations = [list(operation) for operation in operations]
+    return [
+        check
+        for check in manifest
+        if any(operation in operations for operation in check.get("inventory", []))
+    ]
+
+
+def select_modules(manifest, plugin_name=None, check_name=None, service_name=None):
+    """Return the auditor modules holding the checks selected by name, check or service"""
+    modules = []
+    for check in manifest:
+        if plugin_name and check["module"] != plugin_name:
+            continue
+        if check_name and check["check"] != check_name:
+            continue
+        if service_name and check["service"] != service_name:
+            continue
+        if check["module"] not in modules:
+            modules.append(check["module"])
+    return modules
+
+
+def print_checks_md(manifest):
+    table = []
+    table.append(
+        "| Auditor File Name                      | AWS Service                   | Auditor Scan Description                                                               |"
+    )
+    table.append(
+        "|----------------------------------------|-------------------------------|----------------------------------------------------------------------------------------|"
+    )
+
+    for check in manifest:
+        description = check["description"].replace("\n", "")
+        table.append(f"|{check['module']}.py |{check['service']} |{description}")
+    print("\n".join(table))
+
+
+if __name__ == "__main__":
+    # regenerate the manifest after adding or changing checks:
+    # python3 check_manifest.py [search_path]
+    search_path = sys.argv[1] if len(sys.argv) > 1 else "./auditors/aws"
+    print(f"Wrote {len(write_manifest(search_path))} checks to {search_path}")
@@ -1,4 +1,6 @@
 from functools import wraps
+import queue
+import threading
 
 
 class CheckRegister(object):
@@ -27,9 +29,96 @@ class CheckRegister(object):
         return decorator_register
 
 
+# the CheckRun of the check executing on each thread
+_check_runs = threading.local()
+
+
+class CheckRun(object):
+    """Counts the errors a running check recovered from, see report_error
+
+    A check that skipped a resource after an error did not produce its findings, which
+    must not be mistaken for the resource being gone. A run is bound to the thread that
+    enters it, which is the thread the check's generator runs on.
+    """
+
+    def __init__(self):
+        self.errors = 0
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = getattr(_check_runs, "current", None)
+        _check_runs.current = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _check_runs.current = self._previous
+        return False
+
+
+def report_error(error):
+    """Print an error a check recovered from, marking the check running on this thread incomplete"""
+    print(error)
+    run = getattr(_check_runs, "current", None)
+    if run is not None:
+        run.errors += 1
+
+
 def accumulate_paged_results(page_iterator, key):
     results = {key: []}
     for page in page_iterator:
         page_vals = page[key]
         results[key].extend(iter(page_vals))
     return results
+
+
+def iterate_paged_results(page_iterator, key, prefetch=0):
+    """Yield the items under key one page at a time
+
+    Unlike accumulate_paged_results only the pages in flight are held in memory. With
+    prefetch set, up to that many following pages are fetched on a background thread
+    while the items of the current page are being processed.
+    """
+    if prefetch:
+        page_iterator = prefetch_pages(page_iterator, depth=prefetch)
+    for page in page_iterator:
+        yield from page.get(key, [])
+
+
+def prefetch_pages(page_iterator, depth=1):
+    """Yield pages of page_iterator while fetching up to depth pages ahead of the caller"""
+    pages = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch():
+        try:
+            for page in page_iterator:
+                if not put(page):
+                    return
+        except Exception as e:
+            put(e)
+            return
+        put(done)
+
+    fetcher = threading.Thread(target=fetch, daemon=True)
+    fetcher.start()
+    try:
+        while True:
+            page = pages.get()
+            if page is done:
+                return
+            if isinstance(page, Exception):
+                raise page
+            yield page
+    finally:
+        # stop the fetcher if the caller gives up before the last page
+        stop.set()
@@ -0,0 +1,146 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+import threading
+
+import boto3
+from botocore.config import Config
+
+from rate_limiter import RateLimiter
+
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+# calls are paced per API by the RateLimiter, so botocore's own per client rate limiting
+# of the "adaptive" mode is not needed on top of it
+DEFAULT_RETRY_MODE = "standard"
+DEFAULT_MAX_ATTEMPTS = 10
+
+
+def default_session():
+    """Return the boto3 default session, setting it up on first use"""
+    if boto3.DEFAULT_SESSION is None:
+        boto3.setup_default_session()
+    return boto3.DEFAULT_SESSION
+
+
+class ClientFactory(object):
+    """Builds boto3 clients on first use and shares them between all auditors
+
+    One client is kept per (service, region, credentials), so every auditor that talks
+    to the same service reuses the same client and its HTTP connection pool.
+    """
+
+    _clients = {}
+    _lock = threading.Lock()
+    # bumped whenever the clients built so far are dropped
+    generation = 0
+    rate_limit = True
+    config = Config(
+        max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+        retries={"mode": DEFAULT_RETRY_MODE, "max_attempts": DEFAULT_MAX_ATTEMPTS},
+    )
+
+    @classmethod
+    def configure(
+        cls,
+        max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+        retry_mode=DEFAULT_RETRY_MODE,
+        max_attempts=DEFAULT_MAX_ATTEMPTS,
+        rate_limit=True,
+    ):
+        """Set the connection pool, retry and rate limit settings of clients built from now on"""
+        with cls._lock:
+            cls.rate_limit = rate_limit
+            cls.config = Config(
+                max_pool_connections=max_pool_connections,
+                tcp_keepalive=tcp_keepalive,
+                retries={"mode": retry_mode, "max_attempts": max_attempts},
+            )
+            cls._clients.clear()
+            cls.generation += 1
+
+    @classmethod
+    def client_key(cls, service_name, region_name=None, session=None):
+        """Return the (service, region, credentials) a client is shared for
+
+        Defaults to the region and credentials of the boto3 default session.
+        """
+        if session is None:
+            session = default_session()
+        if region_name is None:
+            region_name = session.region_name
+        return (service_name, region_name, session.get_credentials())
+
+    @classmethod
+    def get_client(cls, service_name, region_name=None, session=None):
+        """Return the shared client for service_name
+
+        Defaults to the region and credentials of the boto3 default session.
+        """
+        if session is None:
+            session = default_session()
+        key = cls.client_key(service_name, region_name=region_name, session=session)
+        region_name = key[1]
+        client = cls._clients.get(key)
+        if client is None:
+            # creating clients from a shared session is not thread safe
+            with cls._lock:
+                client = cls._clients.get(key)
+                if client is None:
+                    client = session.client(
+                        service_name, region_name=region_name, config=cls.config
+                    )
+                    if cls.rate_limit:
+                        RateLimiter().register(client, region_name, key[2])
+                    cls._clients[key] = client
+        return client
+
+
+class LazyClient(object):
+    """Stands in for a boto3 client that is only built when it is first used
+
+    The shared client is looked up once and kept for as long as the boto3 default
+    session and the ClientFactory configuration stay the same.
+    """
+
+    def __init__(self, service_name, region_name=None):
+        self._service_name = service_name
+        self._region_name = region_name
+        self._resolved = None
+
+    def _client(self):
+        session = default_session()
+        resolved = self._resolved
+        if (
+            resolved is None
+            or resolved[0] is not session
+            or resolved[1] != ClientFactory.generation
+        ):
+            client = ClientFactory.get_client(
+                self._service_name, region_name=self._region_name, session=session
+            )
+            resolved = self._resolved = (session, ClientFactory.generation, client)
+        return resolved[2]
+
+    def __getattr__(self, name):
+        return getattr(self._client(), name)
+
+    def __repr__(self):
+        return f"LazyClient({self._service_name!r})"
+
+
+def lazy_client(service_name, region_name=None):
+    return LazyClient(service_name, region_name=region_name)
@@ -21,23 +21,158 @@ import boto3
 import click
 
 from insights import create_sechub_insights
-from eeauditor import EEAuditor
+from accounts import get_organization_accounts
+from client_factory import (
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_MAX_POOL_CONNECTIONS,
+    DEFAULT_RETRY_MODE,
+    ClientFactory,
+)
+from check_manifest import load_manifest, print_checks_md
+from eeauditor import (
+    DEFAULT_SEARCH_PATH,
+    EEAuditor,
+    get_all_regions,
+    get_partition,
+    get_path,
+    run_accounts,
+    run_regions,
+)
+from processor.finding_store import DEFAULT_HEARTBEAT, DEFAULT_STATE_PATH, FindingStore
 from processor.main import get_providers, process_findings
+from processor.outputs.sechub import archive_findings
+from region_index import DEFAULT_CACHE_TTL, REGION_SOURCES
 
 
 def print_checks():
-    app = EEAuditor(name="AWS Auditor")
-    app.load_plugins()
-    app.print_checks_md()
+    # read from the check manifest, no auditor is imported and no API is called
+    print_checks_md(load_manifest(get_path(DEFAULT_SEARCH_PATH)))
+
+
+def parse_regions(regions):
+    """Turn the --regions option into a list of region names"""
+    if not regions:
+        return []
+    if regions.strip().lower() == "all":
+        home_region = boto3.session.Session().region_name or "us-east-1"
+        return get_all_regions(partition=get_partition(home_region))
+    return [region.strip() for region in regions.split(",") if region.strip()]
 
 
-def run_auditor(auditor_name=None, check_name=None, delay=0, outputs=None, output_file=""):
+def parse_accounts(accounts, organization=False):
+    """Turn the --accounts and --organization options into a list of account ids"""
+    if organization:
+        return get_organization_accounts()
+    if not accounts:
+        return []
+    return [account.strip() for account in accounts.split(",") if account.strip()]
+
+
+def run_auditor(
+    auditor_name=None,
+    check_name=None,
+    delay=0,
+    outputs=None,
+    output_file="",
+    workers=1,
+    regions=None,
+    profile_name=None,
+    accounts=None,
+    role_name=None,
+    external_id=None,
+    max_account_workers=None,
+    account_timeout=0,
+    region_source="botocore",
+    region_cache_ttl=DEFAULT_CACHE_TTL,
+    client_config=None,
+    service_name=None,
+    resources=None,
+    only_changed=False,
+    finding_state_path=DEFAULT_STATE_PATH,
+    heartbeat=DEFAULT_HEARTBEAT,
+    archive_vanished=False,
+):
     if not outputs:
         outputs = ["sechub"]
-    app = EEAuditor(name="AWS Auditor")
-    app.load_plugins(plugin_name=auditor_name)
-    findings = list(app.run_checks(requested_check_name=check_name, delay=delay))
-    result = process_findings(findings=findings, outputs=outputs, output_file=output_file)
+    if client_config:
+        ClientFactory.configure(**client_config)
+    # only a full run of a check tells which of its findings are gone
+    track_checks = archive_vanished and not resources and "sechub" in outputs
+    if archive_vanished and not track_checks:
+        print("Vanished findings are only archived from SecurityHub and not when using --resources")
+    if resources:
+        app = EEAuditor(
+            name="AWS Auditor", region_source=region_source, region_cache_ttl=region_cache_ttl
+        )
+        findings = app.audit_resources(resources)
+    elif accounts:
+        if not regions:
+            regions = [boto3.session.Session().region_name]
+        findings = run_accounts(
+            accounts=accounts,
+            role_name=role_name,
+            regions=regions,
+            name="AWS Auditor",
+            plugin_name=auditor_name,
+            profile_name=profile_name,
+            external_id=external_id,
+            max_workers=max_account_workers,
+            timeout=account_timeout,
+            region_source=region_source,
+            region_cache_ttl=region_cache_ttl,
+            client_config=client_config,
+            requested_check_name=check_name,
+            requested_service_name=service_name,
+            delay=delay,
+            workers=workers,
+            track_checks=track_checks,
+        )
+    elif regions:
+        findings = run_regions(
+            regions=regions,
+            name="AWS Auditor",
+            plugin_name=auditor_name,
+            profile_name=profile_name,
+            region_source=region_source,
+            region_cache_ttl=region_cache_ttl,
+            client_config=client_config,
+            requested_check_name=check_name,
+            requested_service_name=service_name,
+            delay=delay,
+            workers=workers,
+            track_checks=track_checks,
+        )
+    else:
+        app = EEAuditor(
+            name="AWS Auditor", region_source=region_source, region_cache_ttl=region_cache_ttl
+        )
+        app.load_plugins(plugin_name=auditor_name, check_name=check_name, service_name=service_name)
+        findings = app.run_checks(
+            requested_check_name=check_name,
+            requested_service_name=service_name,
+            delay=delay,
+            workers=workers,
+            track_checks=track_checks,
+        )
+    output_kwargs = {}
+    if only_changed or track_checks:
+        # findings sent to SecurityHub are only recorded once it imported them
+        finding_store = FindingStore(
+            path=finding_state_path,
+            heartbeat=heartbeat,
+            only_changed=only_changed,
+            acknowledged="sechub" in outputs,
+        )
+        output_kwargs["on_imported"] = finding_store.acknowledge
+        if track_checks:
+            findings = finding_store.track(findings)
+        else:
+            findings = finding_store.changed(findings)
+    # findings reach the outputs while the checks are still running
+    process_findings(findings=findings, outputs=outputs, output_file=output_file, **output_kwargs)
+    if track_checks:
+        # a finding is only forgotten once its archive was imported, else the next run retries
+        archive_findings(finding_store.vanished(), on_archived=finding_store.forget)
     print(f"Done.")
 
 
@@ -47,7 +182,109 @@ def run_auditor(auditor_name=None, check_name=None, delay=0, outputs=None, outpu
     "-a", "--auditor-name", default="", help="Auditor to test defaulting to all auditors"
 )
 @click.option("-c", "--check-name", default="", help="Check to test defaulting to all checks")
-@click.option("-d", "--delay", default=0, help="Delay between auditors defaulting to 0")
+@click.option("-s", "--service-name", default="", help="Service to test defaulting to all services")
+@click.option(
+    "--resources",
+    default="",
+    help="Comma separated ARNs, or EC2 ids, of resources to re-audit with only the checks that apply to them",
+)
+@click.option(
+    "-d",
+    "--delay",
+    default=0,
+    help="Delay between auditors defaulting to 0, API calls are already rate limited per service quota",
+)
+@click.option(
+    "-w",
+    "--workers",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of services to audit concurrently",
+)
+@click.option(
+    "-r",
+    "--regions",
+    default="",
+    help="Comma separated list of regions to audit in parallel, or 'all'. Defaults to the current region",
+)
+@click.option(
+    "--accounts",
+    default="",
+    help="Comma separated list of account ids to audit by assuming --role-name into each",
+)
+@click.option(
+    "--organization",
+    is_flag=True,
+    help="Audit every active account of the AWS Organization by assuming --role-name into each",
+)
+@click.option(
+    "--role-name",
+    default="OrganizationAccountAccessRole",
+    show_default=True,
+    help="Name of the role to assume into each audited account",
+)
+@click.option("--external-id", default="", help="External id to use when assuming --role-name")
+@click.option(
+    "--max-account-workers",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of accounts and regions to audit in parallel worker processes",
+)
+@click.option(
+    "--account-timeout",
+    default=0,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Seconds after which auditing an account in a region is abandoned, 0 for no limit",
+)
+@click.option(
+    "--region-source",
+    default="botocore",
+    show_default=True,
+    type=click.Choice(REGION_SOURCES),
+    help="Where service region availability is read from. botocore needs no API calls",
+)
+@click.option(
+    "--region-cache-ttl",
+    default=DEFAULT_CACHE_TTL,
+    show_default=True,
+    help="Seconds the ssm region source answer is cached on disk for",
+)
+@click.option(
+    "--max-pool-connections",
+    default=DEFAULT_MAX_POOL_CONNECTIONS,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Size of the HTTP connection pool of each shared boto3 client",
+)
+@click.option(
+    "--tcp-keepalive/--no-tcp-keepalive",
+    default=True,
+    show_default=True,
+    help="Use TCP keep-alive on boto3 client connections",
+)
+@click.option(
+    "--retry-mode",
+    default=DEFAULT_RETRY_MODE,
+    show_default=True,
+    type=click.Choice(["legacy", "standard", "adaptive"]),
+    help="botocore retry mode of the shared boto3 clients",
+)
+@click.option(
+    "--max-attempts",
+    default=DEFAULT_MAX_ATTEMPTS,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum attempts, including retries, of a boto3 API call",
+)
+@click.option(
+    "--rate-limit/--no-rate-limit",
+    default=True,
+    show_default=True,
+    help="Pace API calls to the quotas of each service, region and account, backing off when throttled",
+)
 @click.option(
     "-o",
     "--outputs",
@@ -57,6 +294,29 @@ def run_auditor(auditor_name=None, check_name=None, delay=0, outputs=None, outpu
     help="Outputs for findings",
 )
 @click.option("--output-file", default="output", show_default=True, help="File to output findings")
+@click.option(
+    "--only-changed",
+    is_flag=True,
+    help="Only send findings that are new, changed or due for a heartbeat since the last run",
+)
+@click.option(
+    "--finding-state-path",
+    default=DEFAULT_STATE_PATH,
+    show_default=True,
+    help="File where --only-changed and --archive-vanished keep the findings of previous runs",
+)
+@click.option(
+    "--heartbeat",
+    default=DEFAULT_HEARTBEAT,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Seconds after which --only-changed sends an unchanged finding again",
+)
+@click.option(
+    "--archive-vanished",
+    is_flag=True,
+    help="Archive the SecurityHub findings of resources a check no longer finds since the last run",
+)
 @click.option("--list-options", is_flag=True, help="List output options")
 @click.option("--list-checks", is_flag=True, help="List all checks")
 @click.option(
@@ -68,9 +328,30 @@ def main(
     profile_name,
     auditor_name,
     check_name,
+    service_name,
+    resources,
     delay,
+    workers,
+    regions,
+    accounts,
+    organization,
+    role_name,
+    external_id,
+    max_account_workers,
+    account_timeout,
+    region_source,
+    region_cache_ttl,
+    max_pool_connections,
+    tcp_keepalive,
+    retry_mode,
+    max_attempts,
+    rate_limit,
     outputs,
     output_file,
+    only_changed,
+    finding_state_path,
+    heartbeat,
+    archive_vanished,
     list_options,
     list_checks,
     create_insights,
@@ -93,9 +374,32 @@ def main(
     run_auditor(
         auditor_name=auditor_name,
         check_name=check_name,
+        service_name=service_name,
+        resources=[resource.strip() for resource in resources.split(",") if resource.strip()],
         delay=delay,
+        workers=workers,
+        regions=parse_regions(regions),
+        profile_name=profile_name,
+        accounts=parse_accounts(accounts, organization=organization),
+        role_name=role_name,
+        external_id=external_id,
+        max_account_workers=max_account_workers,
+        account_timeout=account_timeout,
+        region_source=region_source,
+        region_cache_ttl=region_cache_ttl,
+        client_config={
+            "max_pool_connections": max_pool_connections,
+            "tcp_keepalive": tcp_keepalive,
+            "retry_mode": retry_mode,
+            "max_attempts": max_attempts,
+            "rate_limit": rate_limit,
+        },
         outputs=outputs,
         output_file=output_file,
+        only_changed=only_changed,
+        finding_state_path=finding_state_path,
+        heartbeat=heartbeat,
+        archive_vanished=archive_vanished,
     )
 
 
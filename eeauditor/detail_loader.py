@@ -0,0 +1,72 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+DEFAULT_WORKERS = 10
+
+
+class DetailLoader(object):
+    """Memoized per resource details, such as a describe call per cluster
+
+    The first time any resource is asked for, the details of every resource of the
+    list are fetched concurrently, so the checks of a service that each loop over the
+    same resources share one call per resource. A resource missing from the list is
+    fetched on its own when asked for. A failed fetch is kept and raised again to every
+    check asking for that resource, as if the check had made the call itself.
+    """
+
+    def __init__(self, fetch, resource_ids, workers=DEFAULT_WORKERS):
+        self.fetch = fetch
+        self.resource_ids = list(dict.fromkeys(resource_ids))
+        self.workers = workers
+        self._details = None
+        self._lock = threading.Lock()
+
+    def get(self, resource_id):
+        """Return the detail of a resource, raising the error its fetch failed with"""
+        with self._lock:
+            if self._details is None:
+                self._details = self._prefetch()
+            if resource_id not in self._details:
+                self._details[resource_id] = self._load(resource_id)
+            detail = self._details[resource_id]
+        if isinstance(detail, Exception):
+            raise detail
+        return detail
+
+    def _prefetch(self):
+        if not self.resource_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return dict(zip(self.resource_ids, executor.map(self._load, self.resource_ids)))
+
+    def _load(self, resource_id):
+        try:
+            return self.fetch(resource_id)
+        except Exception as e:
+            return e
+
+
+def detail_loader(cache, name, fetch, resource_ids, workers=DEFAULT_WORKERS):
+    """Return the DetailLoader kept in the auditor cache under name, creating it on first use
+
+    resource_ids is only read when the loader is created, it can be a generator so the
+    resource list is not walked again by every check.
+    """
+    if name not in cache:
+        cache[name] = DetailLoader(fetch, resource_ids, workers=workers)
+    return cache[name]
@@ -12,20 +12,44 @@
 
 # You should have received a copy of the GNU General Public License along with ElectricEye.
 # If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
-import inspect
 import json
+import multiprocessing
+from multiprocessing.connection import wait
 import os
-from time import sleep
+import queue
+import threading
+from time import monotonic, sleep
 
 import boto3
 
-from check_register import CheckRegister, accumulate_paged_results
+from accounts import assume_role_session, get_role_arn
+from check_manifest import load_manifest, print_checks_md, select_checks, select_modules
+from check_register import CheckRegister, CheckRun
+from client_factory import ClientFactory
+from inventory import Inventory
 from pluginbase import PluginBase
+from region_index import DEFAULT_CACHE_TTL, RegionIndex
+from resources import get_resource_filters
+from shodan_client import ShodanClient
 
 here = os.path.abspath(os.path.dirname(__file__))
 get_path = partial(os.path.join, here)
-ssm = boto3.client("ssm")
+
+DEFAULT_SEARCH_PATH = "./auditors/aws"
+
+# what a run yields per finding when checks are tracked. Once a check ran to completion,
+# without reporting an error for any resource, a CheckEvent with no finding is yielded, so
+# findings a check no longer produces can be told apart from findings it skipped
+CheckEvent = namedtuple("CheckEvent", ["account_id", "region", "check_name", "finding"])
+
+# Services whose APIs (or findings) are account-wide rather than regional. When several
+# regions are audited in one invocation these are only audited once.
+GLOBAL_SERVICES = {"cloudfront", "globalaccelerator", "iam", "s3", "shield"}
+# Region global services are pinned to for each partition, when it is requested
+GLOBAL_SERVICE_REGIONS = {"aws": "us-east-1", "aws-us-gov": "us-gov-west-1"}
 
 
 class EEAuditor(object):
@@ -34,96 +58,429 @@ class EEAuditor(object):
         This class manages loading auditor plugins and running checks
     """
 
-    def __init__(self, name, search_path=None):
+    def __init__(
+        self,
+        name,
+        search_path=None,
+        region=None,
+        account_id=None,
+        region_source="botocore",
+        region_cache_ttl=DEFAULT_CACHE_TTL,
+    ):
         if not search_path:
-            search_path = "./auditors/aws"
+            search_path = DEFAULT_SEARCH_PATH
         self.name = name
         self.plugin_base = PluginBase(package="electriceye")
         # each check must be decorated with the @registry.register_check("cache_name")
         # to be discovered during plugin loading.
         self.registry = CheckRegister()
+        # list and describe responses shared by every auditor during this run
+        Inventory.clear()
+        # Shodan hosts of an earlier run are read again from the on-disk cache, which expires them
+        ShodanClient.clear()
         # vendor specific credentials dictionary
-        sts = boto3.client("sts")
-        self.awsAccountId = sts.get_caller_identity()["Account"]
-        self.awsRegion = os.environ.get("AWS_REGION", sts.meta.region_name)
-        self.awsPartition = "aws"
-        if self.awsRegion in ["us-gov-east-1", "us-gov-west-1"]:
-            self.awsPartition = "aws-us-gov"
+        sts = ClientFactory.get_client("sts")
+        self.awsAccountId = account_id or sts.get_caller_identity()["Account"]
+        self.awsRegion = region or os.environ.get("AWS_REGION", sts.meta.region_name)
+        self.awsPartition = get_partition(self.awsRegion)
+        # resolved once per run and shared by every service
+        self.region_index = RegionIndex(
+            partition=self.awsPartition, source=region_source, cache_ttl=region_cache_ttl
+        )
         # If there is a desire to add support for multiple clouds, this would be
         # a great place to implement it.
         self.source = self.plugin_base.make_plugin_source(
             searchpath=[get_path(search_path)], identifier=self.name
         )
+        # which module holds which check, read without importing any auditor
+        self.manifest = load_manifest(get_path(search_path))
 
-    def load_plugins(self, plugin_name=None):
-        if plugin_name:
+    def load_plugins(self, plugin_name=None, check_name=None, service_name=None):
+        """Import auditor modules, registering their checks
+
+        When a check or service is requested only the modules holding it are imported.
+        """
+        if check_name or service_name:
+            plugin_names = select_modules(
+                self.manifest,
+                plugin_name=plugin_name,
+                check_name=check_name,
+                service_name=service_name,
+            )
+            if not plugin_names:
+                print(f"No check matching {check_name or service_name} found")
+        elif plugin_name:
+            plugin_names = [plugin_name]
+        else:
+            plugin_names = self.source.list_plugins()
+        for plugin_name in plugin_names:
             try:
                 plugin = self.source.load_plugin(plugin_name)
             except Exception as e:
                 print(f"Failed to load plugin {plugin_name} with exception {e}")
-        else:
-            for plugin_name in self.source.list_plugins():
-                try:
-                    plugin = self.source.load_plugin(plugin_name)
-                except Exception as e:
-                    print(f"Failed to load plugin {plugin_name} with exception {e}")
 
-    def get_regions(self, service):
-        paginator = ssm.get_paginator("get_parameters_by_path")
-        response_iterator = paginator.paginate(
-            Path=f"/aws/service/global-infrastructure/services/{service}/regions",
-            PaginationConfig={"MaxItems": 1000, "PageSize": 10},
-        )
-        results = accumulate_paged_results(page_iterator=response_iterator, key="Parameters")
-        values = []
-        for parameter in results["Parameters"]:
-            values.append(parameter["Value"])
-        return values
-
-    def run_checks(self, requested_check_name=None, delay=0):
-        for service_name, check_list in self.registry.checks.items():
-            if self.awsRegion not in self.get_regions(service_name):
-                print(f"AWS region {self.awsRegion} not supported for {service_name}")
-                next
-            # a dictionary to be used by checks that are part of the same service
-            auditor_cache = {}
-            for check_name, check in check_list.items():
-                # if a specific check is requested, only run that one check
-                if (
-                    not requested_check_name
-                    or requested_check_name
-                    and requested_check_name == check_name
-                ):
-                    try:
-                        # print(f"Executing check {self.name}.{check_name}")
+    def run_service_checks(
+        self, service_name, check_list, requested_check_name=None, track_checks=False
+    ):
+        """Run every check registered for a single service
+
+        All checks of a service share one auditor_cache, so they are always executed
+        sequentially and in registration order. With track_checks, CheckEvents are
+        yielded rather than bare findings.
+        """
+        if not self.region_index.is_supported(service_name, self.awsRegion):
+            print(f"AWS region {self.awsRegion} not supported for {service_name}")
+            return
+        # a dictionary to be used by checks that are part of the same service
+        auditor_cache = {}
+        for check_name, check in check_list.items():
+            # if a specific check is requested, only run that one check
+            if (
+                not requested_check_name
+                or requested_check_name
+                and requested_check_name == check_name
+            ):
+                try:
+                    # print(f"Executing check {self.name}.{check_name}")
+                    with CheckRun() as run:
                         for finding in check(
                             cache=auditor_cache,
                             awsAccountId=self.awsAccountId,
                             awsRegion=self.awsRegion,
                             awsPartition=self.awsPartition,
                         ):
-                            yield finding
-                    except Exception as e:
-                        print(f"Failed to execute check {check_name} with exception {e}")
+                            if track_checks:
+                                yield CheckEvent(
+                                    self.awsAccountId, self.awsRegion, check_name, finding
+                                )
+                            else:
+                                yield finding
+                except Exception as e:
+                    print(f"Failed to execute check {check_name} with exception {e}")
+                else:
+                    if not track_checks:
+                        continue
+                    if run.errors:
+                        # the findings of the resources it skipped are not gone
+                        print(f"Check {check_name} skipped resources after {run.errors} errors")
+                    else:
+                        yield CheckEvent(self.awsAccountId, self.awsRegion, check_name, None)
+
+    def run_checks(
+        self,
+        requested_check_name=None,
+        delay=0,
+        workers=1,
+        global_services=True,
+        requested_service_name=None,
+        track_checks=False,
+    ):
+        """Run the registered checks and yield their findings
+
+        With more than one worker, services are audited concurrently on a bounded
+        thread pool and findings are streamed back as soon as they are produced.
+        Services in GLOBAL_SERVICES are skipped when global_services is False.
+        """
+        if workers > 1:
+            yield from self._run_checks_concurrently(
+                requested_check_name=requested_check_name,
+                delay=delay,
+                workers=workers,
+                global_services=global_services,
+                requested_service_name=requested_service_name,
+                track_checks=track_checks,
+            )
+            return
+        for service_name, check_list in self._services(global_services, requested_service_name):
+            yield from self.run_service_checks(
+                service_name=service_name,
+                check_list=check_list,
+                requested_check_name=requested_check_name,
+                track_checks=track_checks,
+            )
             sleep(delay)
 
-    def print_checks_md(self):
-        table = []
-        table.append(
-            "| Auditor File Name                      | AWS Service                   | Auditor Scan Description                                                               |"
+    def _services(self, global_services=True, requested_service_name=None):
+        return [
+            (service_name, check_list)
+            for service_name, check_list in self.registry.checks.items()
+            if (global_services or service_name not in GLOBAL_SERVICES)
+            and (not requested_service_name or service_name == requested_service_name)
+        ]
+
+    def _run_checks_concurrently(
+        self,
+        requested_check_name,
+        delay,
+        workers,
+        global_services,
+        requested_service_name=None,
+        track_checks=False,
+    ):
+        # bounded so a slow consumer applies backpressure to the workers instead of
+        # letting findings pile up in memory
+        findings_queue = queue.Queue(maxsize=workers * 100)
+        stop = threading.Event()
+        done = object()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    findings_queue.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def audit_service(service_name, check_list):
+            if stop.is_set():
+                return
+            try:
+                for finding in self.run_service_checks(
+                    service_name=service_name,
+                    check_list=check_list,
+                    requested_check_name=requested_check_name,
+                    track_checks=track_checks,
+                ):
+                    if not put(finding):
+                        return
+                sleep(delay)
+            except Exception as e:
+                print(f"Failed to audit service {service_name} with exception {e}")
+            finally:
+                put(done)
+
+        services = self._services(global_services, requested_service_name)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="eeauditor")
+        try:
+            for service_name, check_list in services:
+                executor.submit(audit_service, service_name, check_list)
+            remaining = len(services)
+            while remaining:
+                item = findings_queue.get()
+                if item is done:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            # release any worker blocked on a full queue if the caller stops early
+            stop.set()
+            executor.shutdown(wait=True)
+
+    def audit_resources(self, resources):
+        """Re-audit only the resources given by ARN, or by id for EC2 resources
+
+        The inventory operations holding the resources are narrowed down to them, and
+        only the checks reading those operations are loaded and run, so reacting to a
+        change of one resource does not need a sweep of the whole region.
+        """
+        filters = get_resource_filters(
+            resources, region=self.awsRegion, account_id=self.awsAccountId
         )
-        table.append(
-            "|----------------------------------------|-------------------------------|----------------------------------------------------------------------------------------|"
+        if not filters:
+            return
+        checks = select_checks(self.manifest, filters)
+        for plugin_name in select_modules(checks):
+            self.load_plugins(plugin_name=plugin_name)
+        services = {}
+        for check in checks:
+            check_function = self.registry.checks.get(check["service"], {}).get(check["check"])
+            if check_function:
+                services.setdefault(check["service"], {})[check["check"]] = check_function
+        # responses cached by an earlier audit are what the re-audit is replacing
+        Inventory.clear()
+        ShodanClient.clear()
+        Inventory.restrict(filters)
+        try:
+            for service_name, check_list in services.items():
+                yield from self.run_service_checks(service_name=service_name, check_list=check_list)
+        finally:
+            Inventory.clear()
+
+    def print_checks_md(self):
+        print_checks_md(self.manifest)
+
+
+def get_partition(region):
+    if region in ["us-gov-east-1", "us-gov-west-1"]:
+        return "aws-us-gov"
+    return "aws"
+
+
+def get_all_regions(partition="aws"):
+    """Return every region of a partition that ElectricEye can audit"""
+    return boto3.session.Session().get_available_regions("ec2", partition_name=partition)
+
+
+def get_global_region(regions):
+    """Pick the single region global services are audited from"""
+    preferred = GLOBAL_SERVICE_REGIONS.get(get_partition(regions[0]))
+    if preferred in regions:
+        return preferred
+    return regions[0]
+
+
+def _audit_scope(connection, scope, plugin_name, run_kwargs, auditor_kwargs, client_config):
+    """Audit one (account, region) scope and send its findings back through connection
+
+    Runs in a fresh worker process. Auditor clients are built from the boto3 default
+    session, so it is pinned to the scope's account and region before any check runs.
+    """
+    region = scope["region"]
+    try:
+        if client_config:
+            ClientFactory.configure(**client_config)
+        if scope.get("role_arn"):
+            boto3.setup_default_session(
+                botocore_session=assume_role_session(
+                    role_arn=scope["role_arn"],
+                    region_name=region,
+                    profile_name=scope.get("profile_name"),
+                    external_id=scope.get("external_id"),
+                ),
+                region_name=region,
+            )
+        elif scope.get("profile_name"):
+            boto3.setup_default_session(profile_name=scope["profile_name"], region_name=region)
+        else:
+            boto3.setup_default_session(region_name=region)
+        app = EEAuditor(region=region, account_id=scope["account_id"], **auditor_kwargs)
+        app.load_plugins(
+            plugin_name=plugin_name,
+            check_name=run_kwargs.get("requested_check_name"),
+            service_name=run_kwargs.get("requested_service_name"),
         )
+        for finding in app.run_checks(global_services=scope["global_services"], **run_kwargs):
+            connection.send(finding)
+    except Exception as e:
+        print(f"Failed to audit account {scope['account_id']} in {region} with exception {e}")
+    finally:
+        connection.send(None)
+        connection.close()
 
-        for service_name, check_list in self.registry.checks.items():
-            for check_name, check in check_list.items():
-                doc = check.__doc__
-                if doc:
-                    description = (check.__doc__).replace("\n", "")
-                else:
-                    description = ""
-                table.append(
-                    f"|{inspect.getfile(check).rpartition('/')[2]} |{service_name} |{description}"
+
+def run_scopes(
+    scopes,
+    name,
+    search_path=None,
+    plugin_name=None,
+    max_workers=None,
+    timeout=0,
+    region_source="botocore",
+    region_cache_ttl=DEFAULT_CACHE_TTL,
+    client_config=None,
+    **run_kwargs,
+):
+    """Audit (account, region) scopes in parallel worker processes
+
+    Findings are yielded as soon as any worker produces them. At most max_workers
+    processes run at once, and a scope that is still running after timeout seconds is
+    terminated so one slow or broken account cannot stall the rest of the sweep.
+    """
+    # a fresh interpreter per scope isolates its clients and lets a stuck scope be killed
+    context = multiprocessing.get_context("spawn")
+    max_workers = max_workers or len(scopes)
+    pending = list(scopes)
+    running = {}
+    auditor_kwargs = {
+        "name": name,
+        "search_path": search_path,
+        "region_source": region_source,
+        "region_cache_ttl": region_cache_ttl,
+    }
+    if region_source == "ssm":
+        # fill the on-disk cache once here instead of racing for it in every worker
+        RegionIndex(
+            partition=get_partition(scopes[0]["region"]),
+            source=region_source,
+            cache_ttl=region_cache_ttl,
+        ).load(sorted({scope["region"] for scope in scopes}))
+    try:
+        while pending or running:
+            while pending and len(running) < max_workers:
+                scope = pending.pop(0)
+                reader, writer = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=_audit_scope,
+                    args=(writer, scope, plugin_name, run_kwargs, auditor_kwargs, client_config),
+                    daemon=True,
                 )
-        print("\n".join(table))
+                process.start()
+                writer.close()
+                deadline = monotonic() + timeout if timeout else None
+                running[reader] = (process, scope, deadline)
+            for reader in wait(list(running), timeout=1):
+                try:
+                    finding = reader.recv()
+                except EOFError:
+                    # the worker died without reporting back
+                    finding = None
+                if finding is None:
+                    process, scope, deadline = running.pop(reader)
+                    reader.close()
+                    process.join()
+                else:
+                    yield finding
+            now = monotonic()
+            for reader, (process, scope, deadline) in list(running.items()):
+                if deadline and now > deadline:
+                    print(
+                        f"Timed out auditing account {scope['account_id']} in {scope['region']} after {timeout} seconds"
+                    )
+                    del running[reader]
+                    process.terminate()
+                    process.join()
+                    reader.close()
+    finally:
+        for reader, (process, scope, deadline) in running.items():
+            process.terminate()
+            process.join()
+            reader.close()
+
+
+def run_regions(regions, name, profile_name=None, account_id=None, **kwargs):
+    """Audit several regions of one account in parallel
+
+    Services in GLOBAL_SERVICES are only audited in one region.
+    """
+    if not account_id:
+        account_id = ClientFactory.get_client("sts").get_caller_identity()["Account"]
+    global_region = get_global_region(regions)
+    scopes = [
+        {
+            "account_id": account_id,
+            "region": region,
+            "global_services": region == global_region,
+            "profile_name": profile_name,
+        }
+        for region in regions
+    ]
+    yield from run_scopes(scopes=scopes, name=name, **kwargs)
+
+
+def run_accounts(accounts, role_name, regions, name, profile_name=None, external_id=None, **kwargs):
+    """Audit several accounts, and regions within them, in parallel
+
+    A role named role_name is assumed into every account other than the caller's own.
+    Services in GLOBAL_SERVICES are only audited in one region per account.
+    """
+    caller_account_id = ClientFactory.get_client("sts").get_caller_identity()["Account"]
+    partition = get_partition(regions[0])
+    global_region = get_global_region(regions)
+    scopes = []
+    for account_id in accounts:
+        role_arn = None
+        if account_id != caller_account_id:
+            role_arn = get_role_arn(account_id, role_name, partition=partition)
+        for region in regions:
+            scopes.append(
+                {
+                    "account_id": account_id,
+                    "region": region,
+                    "global_services": region == global_region,
+                    "profile_name": profile_name,
+                    "role_arn": role_arn,
+                    "external_id": external_id,
+                }
+            )
+    yield from run_scopes(scopes=scopes, name=name, **kwargs)
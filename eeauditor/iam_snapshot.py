@@ -0,0 +1,166 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+import codecs
+import csv
+import datetime
+import io
+import time
+
+from client_factory import ClientFactory
+from detail_loader import DEFAULT_WORKERS, DetailLoader
+from inventory import Inventory
+
+# credential report values meaning there is nothing to report
+EMPTY_VALUES = {"N/A", "not_supported", "no_information"}
+# each user can hold two access keys, reported in numbered columns
+ACCESS_KEY_SLOTS = [1, 2]
+ROTATION_TOLERANCE = datetime.timedelta(seconds=1)
+REPORT_ATTEMPTS = 10
+REPORT_POLL_SECONDS = 2
+
+
+class IamSnapshot(object):
+    """Every IAM user of an account, read in bulk
+
+    Users come with their inline and attached policies, groups and permissions boundary
+    from GetAccountAuthorizationDetails, and with their MFA and access key usage from the
+    credential report. Access keys are listed for every user at once the first time any
+    are asked for, so no check makes a call per user.
+
+    IAM serves a credential report up to four hours old, a user missing from it or created
+    after it was generated is looked up directly rather than reported as having no MFA.
+    """
+
+    def __init__(
+        self,
+        user_details,
+        credential_report,
+        generated_time=None,
+        client=None,
+        workers=DEFAULT_WORKERS,
+    ):
+        self.users = list(user_details)
+        self.credentials = {row["user"]: row for row in credential_report}
+        self.generated_time = generated_time
+        self.client = client
+        self._created = {user["UserName"]: user.get("CreateDate") for user in self.users}
+        self._access_keys = DetailLoader(
+            self._list_access_keys, list(self._created), workers=workers
+        )
+
+    def user_credentials(self, user_name):
+        return self.credentials.get(user_name, {})
+
+    def reported(self, user_name):
+        """Return True when the credential report is current for a user"""
+        if user_name not in self.credentials:
+            return False
+        created = self._created.get(user_name)
+        return self.generated_time is None or created is None or created <= self.generated_time
+
+    def access_keys(self, user_name):
+        """Return the access keys of a user, with the key id, status and rotation date
+
+        The rotation date and last use come from the credential report slot holding the
+        key, a key created after the report was generated is dated by its creation.
+        """
+        credentials = self.user_credentials(user_name) if self.reported(user_name) else {}
+        keys = []
+        for metadata in self._access_keys.get(user_name):
+            slot = report_slot(credentials, metadata["CreateDate"])
+            keys.append(
+                {
+                    "AccessKeyId": metadata["AccessKeyId"],
+                    "Status": metadata["Status"],
+                    "Slot": slot,
+                    "LastRotated": credentials.get(
+                        f"access_key_{slot}_last_rotated", metadata["CreateDate"]
+                    ),
+                    "LastUsed": credentials.get(f"access_key_{slot}_last_used_date"),
+                }
+            )
+        return keys
+
+    def mfa_active(self, user_name):
+        if self.reported(user_name):
+            return self.user_credentials(user_name).get("mfa_active") is True
+        return bool(self.client.list_mfa_devices(UserName=user_name)["MFADevices"])
+
+    def _list_access_keys(self, user_name):
+        paginator = self.client.get_paginator("list_access_keys")
+        return paginator.paginate(UserName=user_name).build_full_result()["AccessKeyMetadata"]
+
+
+def report_slot(credentials, create_date):
+    """Return the credential report slot of a key by its creation date, None if not reported"""
+    for slot in ACCESS_KEY_SLOTS:
+        last_rotated = credentials.get(f"access_key_{slot}_last_rotated")
+        # the report only keeps the date to the second
+        if last_rotated is not None and abs(last_rotated - create_date) < ROTATION_TOLERANCE:
+            return slot
+    return None
+
+
+def parse_credential_report(content):
+    """Yield the rows of a credential report CSV one at a time
+
+    true and false become booleans, dates become datetimes and values standing for
+    nothing, such as N/A, become None.
+    """
+    for row in csv.DictReader(codecs.iterdecode(io.BytesIO(content), "utf-8")):
+        yield {column: parse_report_value(value) for column, value in row.items()}
+
+
+def parse_report_value(value):
+    if value in EMPTY_VALUES:
+        return None
+    if value in ["true", "false"]:
+        return value == "true"
+    if len(value) >= 19 and value[4:5] == "-" and value[10:11] == "T":
+        try:
+            return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    return value
+
+
+def get_credential_report(client, attempts=REPORT_ATTEMPTS, poll_seconds=REPORT_POLL_SECONDS):
+    """Return the credential report response, asking IAM to generate it first
+
+    IAM reuses a report generated in the last four hours, otherwise generating one can
+    take a few seconds.
+    """
+    for _ in range(attempts):
+        if client.generate_credential_report()["State"] == "COMPLETE":
+            return client.get_credential_report()
+        time.sleep(poll_seconds)
+    raise TimeoutError(f"The credential report was not ready after {attempts} attempts")
+
+
+def build_iam_snapshot(workers=DEFAULT_WORKERS):
+    """Build the snapshot from the shared inventory and the credential report"""
+    user_details = Inventory().get("iam", "get_account_authorization_details", Filter=["User"])[
+        "UserDetailList"
+    ]
+    client = ClientFactory.get_client("iam")
+    report = get_credential_report(client)
+    return IamSnapshot(
+        user_details,
+        parse_credential_report(report["Content"]),
+        generated_time=report.get("GeneratedTime"),
+        client=client,
+        workers=workers,
+    )
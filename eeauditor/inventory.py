@@ -0,0 +1,102 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+from concurrent.futures import Future
+import json
+import threading
+
+from check_register import iterate_paged_results
+from client_factory import ClientFactory
+
+
+class Inventory(object):
+    """Run wide store of list and describe responses shared by every auditor
+
+    Unlike the per-service cache dict handed to checks, the inventory is shared by all
+    auditors, so an inventory such as ec2 describe_instances is fetched from AWS once per
+    run no matter how many auditors need it. Responses are keyed by (service, operation,
+    parameters, region, account), the account being identified by the credentials of the
+    shared client. Concurrent requests for the same key wait on a single in-flight call.
+
+    An operation can be restricted to a few resources, every request for it made without
+    parameters then only returns those resources.
+    """
+
+    _responses = {}
+    _filters = {}
+    _lock = threading.Lock()
+
+    def get(self, service_name, operation, region_name=None, **params):
+        """Return the response of operation, following every page when it paginates"""
+        if not params:
+            params = self._filters.get((service_name, operation), {})
+        service, region, credentials = ClientFactory.client_key(
+            service_name, region_name=region_name
+        )
+        key = (
+            service,
+            operation,
+            json.dumps(params, sort_keys=True, default=str),
+            region,
+            credentials,
+        )
+        with self._lock:
+            future = self._responses.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._responses[key] = future
+        if not owner:
+            return future.result()
+        try:
+            client = ClientFactory.get_client(service_name, region_name=region_name)
+            if client.can_paginate(operation):
+                paginator = client.get_paginator(operation)
+                response = paginator.paginate(**params).build_full_result()
+            else:
+                response = getattr(client, operation)(**params)
+        except Exception as e:
+            # let the next requester try again rather than caching the failure
+            with self._lock:
+                del self._responses[key]
+            future.set_exception(e)
+            raise
+        future.set_result(response)
+        return response
+
+    def paginate(self, service_name, operation, key, region_name=None, prefetch=2, **params):
+        """Yield the items under key of a paginated operation, one page at a time
+
+        Meant for inventories too large to hold in memory, such as snapshots. The items
+        are streamed rather than stored, so checks can start on the first page while up
+        to prefetch more pages are fetched in the background.
+        """
+        client = ClientFactory.get_client(service_name, region_name=region_name)
+        paginator = client.get_paginator(operation)
+        yield from iterate_paged_results(
+            page_iterator=paginator.paginate(**params), key=key, prefetch=prefetch
+        )
+
+    @classmethod
+    def restrict(cls, filters):
+        """Narrow operations down, filters maps (service, operation) to its parameters"""
+        with cls._lock:
+            cls._filters = dict(filters)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._responses.clear()
+            cls._filters = {}
@@ -0,0 +1,87 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+from client_factory import ClientFactory
+
+# the most queries a single GetMetricData request accepts
+MAX_QUERIES_PER_CALL = 500
+
+
+class MetricData(object):
+    """Collects CloudWatch metric queries and fetches them in as few calls as possible
+
+    Checks add a query per resource and get back its Id, then fetch the results of all
+    of them at once. Queries are sent MAX_QUERIES_PER_CALL at a time and every page of
+    each request is followed, so a few thousand resources take a handful of calls.
+    All queries of a MetricData share its time range.
+    """
+
+    def __init__(self, start_time, end_time, region_name=None):
+        self.start_time = start_time
+        self.end_time = end_time
+        self.region_name = region_name
+        self.queries = []
+
+    def add(self, namespace, metric_name, dimensions, period, stat, unit=None):
+        """Queue a query for a metric statistic and return the Id its result is keyed by"""
+        query_id = f"m{len(self.queries) + 1}"
+        metric_stat = {
+            "Metric": {
+                "Namespace": namespace,
+                "MetricName": metric_name,
+                "Dimensions": dimensions,
+            },
+            "Period": period,
+            "Stat": stat,
+        }
+        if unit:
+            metric_stat["Unit"] = unit
+        self.queries.append({"Id": query_id, "MetricStat": metric_stat})
+        return query_id
+
+    def fetch(self):
+        """Return the result of every query keyed by its Id
+
+        Datapoints of a query split over several pages are merged into one result.
+        """
+        client = ClientFactory.get_client("cloudwatch", region_name=self.region_name)
+        paginator = client.get_paginator("get_metric_data")
+        results = {}
+        for index in range(0, len(self.queries), MAX_QUERIES_PER_CALL):
+            pages = paginator.paginate(
+                MetricDataQueries=self.queries[index : index + MAX_QUERIES_PER_CALL],
+                StartTime=self.start_time,
+                EndTime=self.end_time,
+            )
+            for page in pages:
+                for result in page["MetricDataResults"]:
+                    merged = results.setdefault(
+                        result["Id"],
+                        {
+                            "Id": result["Id"],
+                            "Label": result.get("Label"),
+                            "Timestamps": [],
+                            "Values": [],
+                        },
+                    )
+                    merged["Timestamps"].extend(result.get("Timestamps", []))
+                    merged["Values"].extend(result.get("Values", []))
+                    merged["StatusCode"] = result.get("StatusCode")
+        for query in self.queries:
+            # a query CloudWatch returned nothing for has no datapoints
+            results.setdefault(
+                query["Id"], {"Id": query["Id"], "Timestamps": [], "Values": [], "StatusCode": None}
+            )
+        return results
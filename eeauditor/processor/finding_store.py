@@ -0,0 +1,253 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_STATE_PATH = os.path.join(os.path.expanduser("~"), ".electriceye", "findings.db")
+# seconds after which an unchanged finding is sent again, keeping it fresh in Security Hub
+DEFAULT_HEARTBEAT = 24 * 60 * 60
+# findings recorded between two commits
+COMMIT_EVERY = 1000
+# fields stamped with the time of the run, they do not make a finding change
+VOLATILE_FIELDS = ["CreatedAt", "FirstObservedAt", "LastObservedAt", "UpdatedAt"]
+# fields kept to archive a finding once its resource is gone, enough to import it again
+ARCHIVE_FIELDS = [
+    "SchemaVersion",
+    "Id",
+    "ProductArn",
+    "GeneratorId",
+    "AwsAccountId",
+    "Types",
+    "FirstObservedAt",
+    "CreatedAt",
+    "Severity",
+    "Title",
+    "Description",
+    "ProductFields",
+    "Resources",
+]
+# columns added to the store after its first release, created on stores missing them
+ADDED_COLUMNS = ["account_id", "region", "check_name", "archive", "pending_hash"]
+
+
+def content_hash(finding):
+    """Return a digest of what a finding says, leaving out when it was produced"""
+    content = {key: value for key, value in finding.items() if key not in VOLATILE_FIELDS}
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class FindingStore(object):
+    """Findings sent to the outputs, kept in SQLite between runs
+
+    Each finding Id is stored with a hash of its content, when it was first observed
+    and when it was last sent. Filtering a run through the store only lets through the
+    findings that are new, whose content changed, or that were last sent more than
+    heartbeat seconds ago, unless only_changed is False. Findings keep the
+    FirstObservedAt and CreatedAt of their first observation rather than the time of
+    the run.
+
+    With acknowledged set, a finding handed to the outputs is only recorded as sent once
+    acknowledge is called for it, for instance when Security Hub imported it. Until then
+    it is pending and the next run sends it again, so a failed import is not mistaken for
+    an unchanged finding.
+
+    A tracked run also records the (account, region, check) scope of each finding and
+    which checks ran to completion. The findings of those scopes that the run did not
+    produce again are then vanished, their resources are gone.
+    """
+
+    def __init__(
+        self,
+        path=DEFAULT_STATE_PATH,
+        heartbeat=DEFAULT_HEARTBEAT,
+        only_changed=True,
+        acknowledged=False,
+    ):
+        self.path = path
+        self.heartbeat = heartbeat
+        self.only_changed = only_changed
+        self.acknowledged = acknowledged
+        self.sent = 0
+        self.unchanged = 0
+        self.completed = set()
+        self._run_complete = False
+        self._started = None
+        self._db = None
+        # acknowledgements come from the threads of the outputs
+        self._lock = threading.Lock()
+        try:
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS findings (id TEXT PRIMARY KEY, "
+                    "hash TEXT NOT NULL, first_observed_at TEXT, created_at TEXT, "
+                    "sent_at REAL NOT NULL, seen_at REAL NOT NULL)"
+                )
+                columns = {row[1] for row in self._db.execute("PRAGMA table_info(findings)")}
+                for column in ADDED_COLUMNS:
+                    if column not in columns:
+                        self._db.execute(f"ALTER TABLE findings ADD COLUMN {column} TEXT")
+                self._db.execute(
+                    "CREATE INDEX IF NOT EXISTS findings_scope "
+                    "ON findings (account_id, region, check_name)"
+                )
+        except (OSError, sqlite3.Error) as e:
+            # without the store every finding is sent, as it was before
+            print(f"Failed to open the finding store {path} with exception {e}")
+            self._db = None
+
+    def changed(self, findings):
+        """Yield the findings that are new, changed or due for a heartbeat refresh"""
+        yield from self.track((None, None, None, finding) for finding in findings)
+
+    def track(self, events):
+        """Yield the findings of a tracked run that are to be sent
+
+        events are (account_id, region, check_name, finding) tuples such as the
+        CheckEvents of a run, a finding of None marking a check that ran to completion.
+        """
+        if self._db is None:
+            for account_id, region, check_name, finding in events:
+                if finding is not None:
+                    yield finding
+            return
+        now = time.time()
+        self._started = now
+        pending = 0
+        try:
+            for account_id, region, check_name, finding in events:
+                if finding is None:
+                    self.completed.add((account_id, region, check_name))
+                    continue
+                with self._lock:
+                    send = self._record(finding, now, (account_id, region, check_name))
+                    pending += 1
+                    if pending >= COMMIT_EVERY:
+                        self._db.commit()
+                        pending = 0
+                if send:
+                    self.sent += 1
+                    yield finding
+                elif not self.only_changed:
+                    yield finding
+                else:
+                    self.unchanged += 1
+        finally:
+            with self._lock:
+                self._db.commit()
+            if self.only_changed:
+                print(
+                    f"Sending {self.sent} new or changed findings, {self.unchanged} are unchanged"
+                )
+        self._run_complete = True
+
+    def acknowledge(self, findings):
+        """Record findings as sent, once an output confirmed it delivered them"""
+        if self._db is None or not self.acknowledged:
+            return
+        now = time.time()
+        with self._lock, self._db:
+            self._db.executemany(
+                "UPDATE findings SET hash = pending_hash, sent_at = ?, pending_hash = NULL "
+                "WHERE id = ? AND pending_hash IS NOT NULL",
+                [(now, finding["Id"]) for finding in findings],
+            )
+
+    def vanished(self):
+        """Yield the findings of completed checks that the last run did not produce
+
+        Findings are yielded with the fields kept to archive them, and stay in the store
+        until forget is called for them once archived, so a failed archive is retried by
+        the next run. Nothing is vanished after a run that stopped before its end, or for
+        checks that failed.
+        """
+        if self._db is None or not self._run_complete:
+            return
+        for account_id, region, check_name in sorted(self.completed):
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT archive FROM findings WHERE account_id = ? AND region = ? "
+                    "AND check_name = ? AND seen_at < ? AND archive IS NOT NULL",
+                    (account_id, region, check_name, self._started),
+                ).fetchall()
+            for (archive,) in rows:
+                yield json.loads(archive)
+
+    def forget(self, findings):
+        """Remove findings from the store, once their archive has been imported"""
+        if self._db is None:
+            return
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM findings WHERE id = ?", [(finding["Id"],) for finding in findings]
+            )
+
+    def _record(self, finding, now, scope):
+        """Record a finding of this run, returning whether it is to be sent
+
+        Unless findings are acknowledged, a finding to be sent is recorded as sent right
+        away. Otherwise its hash waits in pending_hash, the hash and time it was last
+        sent being kept until acknowledge is called for it. A finding filtered without a
+        scope, through changed, keeps the scope a tracked run recorded for it.
+        """
+        digest = content_hash(finding)
+        sent_hash, sent_at = "", 0
+        row = self._db.execute(
+            "SELECT hash, first_observed_at, created_at, sent_at, account_id, region, "
+            "check_name FROM findings WHERE id = ?",
+            (finding["Id"],),
+        ).fetchone()
+        if row:
+            sent_hash, first_observed_at, created_at, sent_at = row[:4]
+            scope = tuple(
+                given if given is not None else stored for given, stored in zip(scope, row[4:])
+            )
+            if first_observed_at and "FirstObservedAt" in finding:
+                finding["FirstObservedAt"] = first_observed_at
+            if created_at and "CreatedAt" in finding:
+                finding["CreatedAt"] = created_at
+            if sent_hash == digest and now - sent_at < self.heartbeat:
+                self._db.execute(
+                    "UPDATE findings SET seen_at = ?, account_id = ?, region = ?, "
+                    "check_name = ? WHERE id = ?",
+                    (now,) + scope + (finding["Id"],),
+                )
+                return False
+        archive = {key: finding[key] for key in ARCHIVE_FIELDS if key in finding}
+        self._db.execute(
+            "INSERT OR REPLACE INTO findings (id, hash, first_observed_at, created_at, "
+            "sent_at, seen_at, account_id, region, check_name, archive, pending_hash) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                finding["Id"],
+                sent_hash if self.acknowledged else digest,
+                finding.get("FirstObservedAt"),
+                finding.get("CreatedAt"),
+                sent_at if self.acknowledged else now,
+                now,
+            )
+            + scope
+            + (json.dumps(archive, default=str), digest if self.acknowledged else None),
+        )
+        return True
@@ -1,14 +1,82 @@
+import queue
+import threading
+
 from processor.outputs.output_base import ElectricEyeOutput
 
+# findings waiting in each output before the checks are paused for it to catch up
+DEFAULT_QUEUE_SIZE = 1000
 
-def process_findings(findings: list, outputs: list, **kwargs):
-    """Process all findings from json file and send to outputs sepecified"""
-    for output in outputs:
+
+class OutputStream(object):
+    """Feeds findings to an output provider writing them on its own thread
+
+    The provider's write_findings is handed an iterator over the findings as they are
+    produced. At most queue_size findings wait for a provider, when its queue is full
+    the producer blocks, so a slow output slows the checks down rather than letting
+    findings pile up in memory. A provider that fails or returns early stops receiving
+    findings without holding up the other outputs.
+    """
+
+    _done = object()
+
+    def __init__(self, provider, queue_size=DEFAULT_QUEUE_SIZE, **kwargs):
+        self.provider = provider
+        self.kwargs = kwargs
+        self._findings = queue.Queue(maxsize=queue_size)
+        self._finished = threading.Event()
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._writer.start()
+
+    def put(self, finding):
+        while not self._finished.is_set():
+            try:
+                self._findings.put(finding, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def close(self):
+        """Tell the provider there are no more findings and wait for it to finish"""
+        self.put(self._done)
+        self._writer.join()
+
+    def __iter__(self):
+        while True:
+            finding = self._findings.get()
+            if finding is self._done:
+                return
+            yield finding
+
+    def _write(self):
         try:
+            self.provider.write_findings(findings=iter(self), **self.kwargs)
+        except Exception as e:
+            print(f"Error writing output: {e}")
+        finally:
+            self._finished.set()
 
-            ElectricEyeOutput.get_provider(output)().write_findings(findings=findings, **kwargs)
+
+def process_findings(findings, outputs: list, queue_size=DEFAULT_QUEUE_SIZE, **kwargs):
+    """Send findings to the outputs specified as they are produced
+
+    findings can be any iterable, such as the generator of a running audit, it is only
+    read once and no more than queue_size findings per output are held in memory.
+    """
+    streams = []
+    for output in outputs:
+        try:
+            provider = ElectricEyeOutput.get_provider(output)()
         except Exception as e:
             print(f"Error writing output: {e}")
+            continue
+        streams.append(OutputStream(provider, queue_size=queue_size, **kwargs))
+    try:
+        for finding in findings:
+            for stream in streams:
+                stream.put(finding)
+    finally:
+        for stream in streams:
+            stream.close()
 
 
 def get_providers():
@@ -24,7 +24,7 @@ from processor.outputs.output_base import ElectricEyeOutput
 class CsvProvider(object):
     __provider__ = "csv"
 
-    def write_findings(self, findings: list, output_file: str, **kwargs):
+    def write_findings(self, findings, output_file: str, **kwargs):
         csv_columns = [
             {"name": "Id", "path": "Id"},
             {"name": "Title", "path": "Title"},
@@ -41,14 +41,17 @@ class CsvProvider(object):
         csv_file = output_file + ".csv"
         try:
             with open(csv_file, "w") as csvfile:
-                print(f"Writing {len(findings)} findings to {csv_file}")
+                print(f"Writing findings to {csv_file}")
                 writer = csv.writer(csvfile, dialect="excel")
                 writer.writerow(item["name"] for item in csv_columns)
+                count = 0
                 for finding in findings:
                     row_data = []
                     for column_dict in csv_columns:
                         row_data.append(self.deep_get(finding, column_dict["path"]))
                     writer.writerow(row_data)
+                    count += 1
+                print(f"Wrote {count} findings to {csv_file}")
             csvfile.close()
         except IOError as e:
             print(f"Error writing to file {output_file} with exception {e}")
@@ -22,12 +22,15 @@ class DopsProvider(object):
         self.client_id = str(client_id_response["Parameter"]["Value"])
         self.api_key = str(api_key_response["Parameter"]["Value"])
 
-    def write_findings(self, findings: list, **kwargs):
-        print(f"Writing {len(findings)} results to DisruptOps")
+    def write_findings(self, findings, **kwargs):
+        print("Writing results to DisruptOps")
         if self.client_id and self.api_key and self.url:
+            count = 0
             for finding in findings:
                 response = requests.post(
                     self.url, data=json.dumps(finding), auth=(self.client_id, self.api_key)
                 )
+                count += 1
+            print(f"Wrote {count} results to DisruptOps")
         else:
             raise ValueError("Missing credentials for client_id or api_key")
@@ -8,14 +8,15 @@ from processor.outputs.output_base import ElectricEyeOutput
 class JsonProvider(object):
     __provider__ = "json"
 
-    def write_findings(self, findings: list, output_file: str, **kwargs):
+    def write_findings(self, findings, output_file: str, **kwargs):
         first = True
         jsonfile = output_file + ".json"
         json_out_location = ""
         with open(jsonfile, "w") as json_out:
-            print(f"Writing {len(findings)} findings to {jsonfile}")
+            print(f"Writing findings to {jsonfile}")
             print('{"Findings":[', file=json_out)
             json_out_location = os.path.abspath(json_out.name)
+            count = 0
             for finding in findings:
                 # print a comma separation between findings except before first finding
                 if first:
@@ -23,6 +24,8 @@ class JsonProvider(object):
                 else:
                     print(",", file=json_out)
                 json.dump(finding, json_out, indent=2)
+                count += 1
             print("]}", file=json_out)
+            print(f"Wrote {count} findings to {jsonfile}")
         json_out.close()
         return True
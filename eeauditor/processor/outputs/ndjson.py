@@ -0,0 +1,135 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+import gzip
+import json
+import os
+
+from processor.outputs.output_base import ElectricEyeOutput
+
+# optional, findings are serialized with the json module and zstd is unavailable without them
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def serialize(finding):
+    """Return a finding as one line of JSON, encoded"""
+    if orjson is not None:
+        return orjson.dumps(finding, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(finding, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+class NdjsonWriter(object):
+    """Writes findings one per line, starting a new file when one grows too large
+
+    With max_bytes or max_findings set, files are numbered output-00001.ndjson,
+    output-00002.ndjson and so on, a file being closed once it holds max_findings
+    findings or max_bytes bytes before compression. Otherwise a single output.ndjson is
+    written. Every file is compressed with gzip or zstd when asked, each being complete
+    on its own so they can be read in parallel.
+    """
+
+    def __init__(self, output_file, compression="none", max_bytes=0, max_findings=0):
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError(f"Unsupported NDJSON compression {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package, pip install zstandard")
+        self.output_file = output_file
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.max_findings = max_findings
+        self.files = []
+        self.count = 0
+        self._file = None
+        self._raw = None
+        self._file_bytes = 0
+        self._file_findings = 0
+
+    def write(self, finding):
+        line = serialize(finding)
+        if self._file is not None and self._is_full(len(line)):
+            self.close()
+        if self._file is None:
+            self._open()
+        self._file.write(line)
+        self._file_bytes += len(line)
+        self._file_findings += 1
+        self.count += 1
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        if self._raw is not None and not self._raw.closed:
+            self._raw.close()
+        self._file = None
+        self._raw = None
+
+    def _is_full(self, size):
+        return (self.max_findings and self._file_findings >= self.max_findings) or (
+            self.max_bytes and self._file_bytes + size > self.max_bytes
+        )
+
+    def _open(self):
+        if self.max_bytes or self.max_findings:
+            path = f"{self.output_file}-{len(self.files) + 1:05d}.ndjson"
+        else:
+            path = f"{self.output_file}.ndjson"
+        path += COMPRESSION_EXTENSIONS[self.compression]
+        if self.compression == "gzip":
+            self._file = gzip.open(path, "wb")
+        elif self.compression == "zstd":
+            self._raw = open(path, "wb")
+            self._file = zstandard.ZstdCompressor().stream_writer(self._raw)
+        else:
+            self._file = open(path, "wb")
+        self._file_bytes = 0
+        self._file_findings = 0
+        self.files.append(os.path.abspath(path))
+
+
+@ElectricEyeOutput
+class NdjsonProvider(object):
+    """Newline delimited JSON, one finding per line
+
+    Compression and file rotation are read from the NDJSON_COMPRESSION (none, gzip or
+    zstd), NDJSON_MAX_BYTES and NDJSON_MAX_FINDINGS environment variables.
+    """
+
+    __provider__ = "ndjson"
+
+    def write_findings(self, findings, output_file: str, **kwargs):
+        writer = NdjsonWriter(
+            output_file,
+            compression=os.environ.get("NDJSON_COMPRESSION", "none"),
+            max_bytes=int(os.environ.get("NDJSON_MAX_BYTES", 0)),
+            max_findings=int(os.environ.get("NDJSON_MAX_FINDINGS", 0)),
+        )
+        print(f"Writing findings to {output_file} as NDJSON")
+        try:
+            for finding in findings:
+                writer.write(finding)
+        finally:
+            writer.close()
+        print(f"Wrote {writer.count} findings to {len(writer.files)} files")
+        return True
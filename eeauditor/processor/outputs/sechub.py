@@ -1,17 +1,227 @@
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import datetime
 import itertools
+import json
+import random
+import threading
+import time
 
-import boto3
+from botocore.exceptions import ClientError
+
+from client_factory import ClientFactory
 from processor.outputs.output_base import ElectricEyeOutput
+from rate_limiter import THROTTLING_ERROR_CODES
+
+# BatchImportFindings takes at most 100 findings of up to 240 KB each in a request of up
+# to 6 MB, batches are kept under 5 MB to leave room for the rest of the request
+MAX_BATCH_FINDINGS = 100
+MAX_BATCH_BYTES = 5 * 1024 * 1024
+MAX_FINDING_BYTES = 240 * 1024
+# requests in flight, the shared client paces them to the BatchImportFindings rate limit
+DEFAULT_WORKERS = 10
+# attempts at importing a finding, and the backoff in seconds between them
+MAX_ATTEMPTS = 5
+BASE_DELAY = 0.5
+MAX_DELAY = 20
+# errors of a finding that another attempt cannot fix
+PERMANENT_ERROR_CODES = {"AccessDeniedException", "InvalidAccessException", "InvalidInput"}
+# BatchUpdateFindings takes at most 100 finding identifiers
+MAX_UPDATE_FINDINGS = 100
+ARCHIVE_NOTE = (
+    "The resource related to this finding was not found by the latest ElectricEye run of "
+    "its check and the finding has been archived. Please investigate further to ensure "
+    "the deletion was not due to malicious activity or an improperly configured change."
+)
+
+
+def pack_batches(findings):
+    """Yield lists of findings that each fit in one BatchImportFindings request
+
+    A finding too large to ever be imported is yielded alone as (finding, None) so it
+    can be reported rather than sent.
+    """
+    batch = []
+    batch_bytes = 0
+    for finding in findings:
+        size = len(json.dumps(finding, default=str).encode("utf-8"))
+        if size > MAX_FINDING_BYTES:
+            yield [(finding, None)]
+            continue
+        if len(batch) == MAX_BATCH_FINDINGS or batch_bytes + size > MAX_BATCH_BYTES:
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append((finding, size))
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+class FindingImporter(object):
+    """Imports findings into Security Hub in concurrent, size aware batches
+
+    Findings are read from any iterable and packed into batches by count and size,
+    up to workers batches being sent at once. Findings Security Hub reports in
+    FailedFindings, and batches that are throttled even after the client's own retries,
+    are sent again after a jittered exponential backoff, up to max_attempts times.
+    Every finding is counted as imported or failed, failures by error code. When given,
+    on_imported is called with the findings of each request Security Hub accepted, from
+    the thread that sent them.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        workers=DEFAULT_WORKERS,
+        max_attempts=MAX_ATTEMPTS,
+        base_delay=BASE_DELAY,
+        on_imported=None,
+    ):
+        self.client = client or ClientFactory.get_client("securityhub")
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.on_imported = on_imported
+        self.imported = 0
+        self.failures = Counter()
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def failed(self):
+        return sum(self.failures.values())
+
+    def import_findings(self, findings):
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            running = set()
+            for batch in pack_batches(findings):
+                if len(running) >= self.workers * 2:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                running.add(executor.submit(self._send, batch))
+            wait(running)
+        elapsed = time.monotonic() - started
+        return {
+            "Imported": self.imported,
+            "Failed": self.failed,
+            "Failures": dict(self.failures),
+            "Requests": self.requests,
+            "Seconds": elapsed,
+            "FindingsPerSecond": self.imported / elapsed if elapsed else 0,
+        }
+
+    def _send(self, batch):
+        too_large = [finding for finding, size in batch if size is None]
+        if too_large:
+            self._fail(too_large, "FindingTooLarge")
+            return
+        findings = [finding for finding, size in batch]
+        for attempt in range(1, self.max_attempts + 1):
+            if attempt > 1:
+                time.sleep(self.backoff(attempt))
+            try:
+                with self._lock:
+                    self.requests += 1
+                response = self.client.batch_import_findings(Findings=findings)
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code", "Unknown")
+                if code in THROTTLING_ERROR_CODES and attempt < self.max_attempts:
+                    continue
+                self._fail(findings, code)
+                print(f"Failed to import {len(findings)} findings with exception {e}")
+                return
+            except Exception as e:
+                self._fail(findings, type(e).__name__)
+                print(f"Failed to import {len(findings)} findings with exception {e}")
+                return
+            errors = {
+                failed["Id"]: failed.get("ErrorCode", "Unknown")
+                for failed in response.get("FailedFindings", [])
+            }
+            with self._lock:
+                self.imported += len(findings) - len(errors)
+            if self.on_imported is not None:
+                imported = [finding for finding in findings if finding["Id"] not in errors]
+                if imported:
+                    self.on_imported(imported)
+            retry = []
+            for finding in findings:
+                code = errors.get(finding["Id"])
+                if code is None:
+                    continue
+                if code in PERMANENT_ERROR_CODES or attempt == self.max_attempts:
+                    self._fail([finding], code)
+                else:
+                    retry.append(finding)
+            if not retry:
+                return
+            findings = retry
+
+    def backoff(self, attempt):
+        """Seconds to wait before an attempt, full jitter over an exponential ceiling"""
+        return random.uniform(0, min(MAX_DELAY, self.base_delay * 2 ** (attempt - 1)))
+
+    def _fail(self, findings, code):
+        with self._lock:
+            self.failures[code] += len(findings)
+
+
+def archive_findings(findings, client=None, workers=DEFAULT_WORKERS, on_archived=None):
+    """Archive findings whose resources are gone, findings being read from any iterable
+
+    Only the provider of a finding can change its RecordState, which it does by importing
+    it again, so findings are imported as ARCHIVED. Their workflow is then resolved and
+    a note explains why, through BatchUpdateFindings 100 findings at a time. When given,
+    on_archived is called with the findings whose archive was imported.
+    """
+    client = client or ClientFactory.get_client("securityhub")
+    updatedAt = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
+    identifiers = []
+
+    def imported(findings):
+        # only findings whose archive was imported are resolved
+        identifiers.extend(
+            {"Id": finding["Id"], "ProductArn": finding["ProductArn"]} for finding in findings
+        )
+        if on_archived:
+            on_archived(findings)
+
+    result = FindingImporter(client, workers=workers, on_imported=imported).import_findings(
+        dict(finding, UpdatedAt=updatedAt, RecordState="ARCHIVED") for finding in findings
+    )
+    unprocessed = 0
+    remaining = iter(identifiers)
+    for batch in iter(lambda: list(itertools.islice(remaining, MAX_UPDATE_FINDINGS)), []):
+        try:
+            response = client.batch_update_findings(
+                FindingIdentifiers=batch,
+                Workflow={"Status": "RESOLVED"},
+                Note={"Text": ARCHIVE_NOTE, "UpdatedBy": "ElectricEye"},
+            )
+            unprocessed += len(response.get("UnprocessedFindings", []))
+        except Exception as e:
+            unprocessed += len(batch)
+            print(f"Failed to resolve {len(batch)} archived findings with exception {e}")
+    print(
+        f"Archived {result['Imported']} findings of vanished resources in SecurityHub, "
+        f"{result['Failed']} failed to archive and {unprocessed} failed to resolve"
+    )
+    return result
 
 
 @ElectricEyeOutput
 class SecHubProvider(object):
     __provider__ = "sechub"
 
-    def write_findings(self, findings: list, **kwargs):
-        print(f"Writing {len(findings)} results to SecurityHub")
-        if findings:
-            sechub_client = boto3.client("securityhub")
-            for i in range(0, len(findings), 100):
-                sechub_client.batch_import_findings(Findings=findings[i : i + 100])
-        return
+    def write_findings(self, findings, on_imported=None, **kwargs):
+        print("Writing results to SecurityHub")
+        result = FindingImporter(on_imported=on_imported).import_findings(findings)
+        print(
+            f"Imported {result['Imported']} results to SecurityHub in {result['Requests']} "
+            f"requests over {result['Seconds']:.1f} seconds "
+            f"({result['FindingsPerSecond']:.0f} per second)"
+        )
+        if result["Failed"]:
+            print(f"Failed to import {result['Failed']} results: {result['Failures']}")
+        return result
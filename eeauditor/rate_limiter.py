@@ -0,0 +1,163 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+import threading
+import time
+
+# (requests per second, burst) of a bucket. Keys are (endpoint prefix, None) for the quota
+# the operations of a service share, APIs served by one endpoint such as elb and elbv2,
+# or rds, docdb and neptune, sharing it too. (endpoint prefix, operation) keys give an
+# operation a quota of its own in place of its service's. These are the published or
+# commonly observed default quotas, the limiter backs off from there.
+API_QUOTAS = {
+    (None, None): (25, 50),
+    ("backup", None): (10, 20),
+    ("cloudtrail", None): (10, 20),
+    ("api.ecr", None): (20, 40),
+    ("ec2", None): (20, 100),
+    ("elasticloadbalancing", None): (10, 40),
+    ("iam", None): (15, 30),
+    ("iam", "GetAccountAuthorizationDetails"): (2, 5),
+    ("monitoring", "GetMetricData"): (50, 50),
+    ("organizations", None): (10, 20),
+    ("rds", None): (10, 40),
+    ("route53", None): (5, 5),
+    ("s3", None): (100, 200),
+    ("securityhub", None): (10, 30),
+    ("securityhub", "BatchImportFindings"): (10, 30),
+    ("securityhub", "BatchUpdateFindings"): (10, 30),
+    ("securityhub", "GetFindings"): (3, 6),
+    ("shield", None): (10, 20),
+    ("ssm", None): (10, 20),
+    ("ssm", "GetParameter"): (40, 40),
+    ("sts", None): (50, 100),
+}
+
+THROTTLING_ERROR_CODES = {
+    "BandwidthLimitExceeded",
+    "EC2ThrottledException",
+    "LimitExceededException",
+    "PriorRequestNotComplete",
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "TransactionInProgressException",
+}
+
+# a throttled bucket halves its rate, a successful call claws back a tenth of the
+# starting rate, never going past the quota it started from
+MIN_RATE = 0.5
+BACKOFF_FACTOR = 0.5
+RECOVERY_FACTOR = 0.1
+
+
+class TokenBucket(object):
+    """Token bucket whose refill rate backs off on throttling and recovers on success"""
+
+    def __init__(self, rate, burst):
+        self.initial_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, sleeping until one is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttled(self):
+        with self._lock:
+            self.rate = max(MIN_RATE, self.rate * BACKOFF_FACTOR)
+            # drop any saved up burst so the next calls are spread out
+            self.tokens = min(self.tokens, 0)
+
+    def succeeded(self):
+        with self._lock:
+            self.rate = min(self.initial_rate, self.rate + self.initial_rate * RECOVERY_FACTOR)
+
+
+class RateLimiter(object):
+    """Token buckets shared by every client of a run
+
+    Buckets are kept per region and account, the account being identified by the
+    credentials the client was built with. An operation with a quota of its own in
+    API_QUOTAS has a bucket of its own, every other operation of a service takes its
+    tokens from the one bucket of the service.
+    """
+
+    _buckets = {}
+    _lock = threading.Lock()
+
+    def get_bucket(self, service_name, operation_name, region_name, credentials):
+        if (service_name, operation_name) not in API_QUOTAS:
+            operation_name = None
+        key = (service_name, operation_name, region_name, credentials)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = TokenBucket(*get_quota(service_name, operation_name))
+                    self._buckets[key] = bucket
+        return bucket
+
+    def register(self, client, region_name, credentials):
+        """Rate limit every request client sends"""
+        service_name = client.meta.service_model.endpoint_prefix
+
+        def before_send(event_name, **kwargs):
+            operation_name = event_name.rsplit(".", 1)[-1]
+            self.get_bucket(service_name, operation_name, region_name, credentials).acquire()
+
+        def needs_retry(event_name, response=None, **kwargs):
+            if response is None:
+                return
+            operation_name = event_name.rsplit(".", 1)[-1]
+            bucket = self.get_bucket(service_name, operation_name, region_name, credentials)
+            http_response, parsed = response
+            if parsed.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES:
+                bucket.throttled()
+            elif http_response.status_code < 400:
+                bucket.succeeded()
+
+        # handlers registered on the event prefix see the events of every operation
+        client.meta.events.register("before-send", before_send)
+        client.meta.events.register("needs-retry", needs_retry)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._buckets.clear()
+
+
+def get_quota(service_name, operation_name):
+    for key in [(service_name, operation_name), (service_name, None), (None, None)]:
+        if key in API_QUOTAS:
+            return API_QUOTAS[key]
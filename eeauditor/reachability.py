@@ -0,0 +1,267 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+from bisect import bisect_left
+import ipaddress
+
+from inventory import Inventory
+from security_group_rules import OPEN_CIDRS, PROTOCOL_NAMES
+
+# from most to least exposed, the first gate that stops internet traffic names the level
+INTERNET_REACHABLE = "INTERNET_REACHABLE"
+BLOCKED_BY_NACL = "BLOCKED_BY_NACL"
+NO_INTERNET_ROUTE = "NO_INTERNET_ROUTE"
+NO_PUBLIC_ADDRESS = "NO_PUBLIC_ADDRESS"
+UNATTACHED = "UNATTACHED"
+NOT_OPEN = "NOT_OPEN"
+EXPOSURE_LEVELS = [
+    INTERNET_REACHABLE,
+    BLOCKED_BY_NACL,
+    NO_INTERNET_ROUTE,
+    NO_PUBLIC_ADDRESS,
+    UNATTACHED,
+    NOT_OPEN,
+]
+# address ranges internet traffic never comes from
+NON_PUBLIC_NETWORKS = [
+    ipaddress.ip_network(cidr)
+    for cidr in [
+        "10.0.0.0/8",
+        "172.16.0.0/12",
+        "192.168.0.0/16",
+        "100.64.0.0/10",
+        "127.0.0.0/8",
+        "169.254.0.0/16",
+        "fc00::/7",
+        "fe80::/10",
+        "::1/128",
+    ]
+]
+
+
+class NetworkReachability(object):
+    """Graph of which network interfaces the internet can actually reach
+
+    Built once per region from bulk describe calls, and split per VPC into its route
+    tables, internet gateways and network ACLs. Interfaces are indexed by id, security
+    group and instance, and their addresses are kept sorted so the interface behind an
+    IP is found with a binary search. Traffic from the internet reaches an interface
+    when it has a public address, its subnet routes to an attached internet gateway,
+    the subnet's network ACL lets the traffic in and one of its security groups is open.
+    Return traffic through the network ACL egress rules is not evaluated.
+    """
+
+    def __init__(
+        self,
+        network_interfaces,
+        route_tables,
+        internet_gateways,
+        network_acls,
+        rule_index=None,
+    ):
+        self.rule_index = rule_index
+        self.interfaces = {eni["NetworkInterfaceId"]: eni for eni in network_interfaces}
+        self.interfaces_by_group = {}
+        self.interfaces_by_instance = {}
+        addresses = []
+        for eni_id, eni in self.interfaces.items():
+            for group in eni.get("Groups", []):
+                self.interfaces_by_group.setdefault(group["GroupId"], []).append(eni_id)
+            instance_id = eni.get("Attachment", {}).get("InstanceId")
+            if instance_id:
+                self.interfaces_by_instance.setdefault(instance_id, []).append(eni_id)
+            for address in get_addresses(eni):
+                addresses.append((ipaddress.ip_address(address), eni_id))
+        # IPv4 and IPv6 addresses do not compare, each family is kept in its own list
+        self._addresses = {}
+        for version in [4, 6]:
+            self._addresses[version] = sorted(
+                (int(address), eni_id)
+                for address, eni_id in addresses
+                if address.version == version
+            )
+        self.internet_gateways = {}
+        for igw in internet_gateways:
+            for attachment in igw.get("Attachments", []):
+                if attachment.get("State") in ["available", "attached"]:
+                    self.internet_gateways.setdefault(attachment["VpcId"], set()).add(
+                        igw["InternetGatewayId"]
+                    )
+        self.route_tables = {}
+        self.main_route_tables = {}
+        for route_table in route_tables:
+            for association in route_table.get("Associations", []):
+                if association.get("Main"):
+                    self.main_route_tables[route_table["VpcId"]] = route_table
+                elif association.get("SubnetId"):
+                    self.route_tables[association["SubnetId"]] = route_table
+        self.network_acls = {}
+        for network_acl in network_acls:
+            ingress = sorted(
+                (entry for entry in network_acl.get("Entries", []) if not entry["Egress"]),
+                key=lambda entry: entry["RuleNumber"],
+            )
+            for association in network_acl.get("Associations", []):
+                self.network_acls[association["SubnetId"]] = ingress
+        self._routable = {}
+
+    def find_interface(self, address):
+        """Return the id of the interface holding a private or public IP address"""
+        address = ipaddress.ip_address(address)
+        addresses = self._addresses[address.version]
+        index = bisect_left(addresses, (int(address), ""))
+        if index < len(addresses) and addresses[index][0] == int(address):
+            return addresses[index][1]
+        return None
+
+    def interface_exposure(self, eni_id, from_port, to_port, protocol="tcp", group_id=None):
+        """Return how far internet traffic to the ports gets towards an interface
+
+        When group_id is given, that group is taken to be the one allowing the traffic,
+        otherwise the interface's security groups are looked up in the rule index.
+        """
+        eni = self.interfaces[eni_id]
+        if group_id is None and not self.has_open_group(eni, from_port, to_port, protocol):
+            return NOT_OPEN
+        subnet_id = eni.get("SubnetId")
+        public_ipv4 = bool(eni.get("Association", {}).get("PublicIp"))
+        public_ipv6 = bool(eni.get("Ipv6Addresses"))
+        if not public_ipv4 and not public_ipv6:
+            return NO_PUBLIC_ADDRESS
+        routes = self.internet_routes(subnet_id, eni.get("VpcId"))
+        if not (public_ipv4 and "0.0.0.0/0" in routes) and not (public_ipv6 and "::/0" in routes):
+            return NO_INTERNET_ROUTE
+        if not self.network_acl_allows(subnet_id, from_port, to_port, protocol):
+            return BLOCKED_BY_NACL
+        return INTERNET_REACHABLE
+
+    def group_exposure(self, group_id, from_port, to_port, protocol="tcp"):
+        """Return the most exposed level among the interfaces a security group is attached to"""
+        eni_ids = self.interfaces_by_group.get(group_id, [])
+        if not eni_ids:
+            return UNATTACHED
+        return most_exposed(
+            self.interface_exposure(eni_id, from_port, to_port, protocol, group_id=group_id)
+            for eni_id in eni_ids
+        )
+
+    def instance_exposure(self, instance_id, from_port, to_port, protocol="tcp"):
+        eni_ids = self.interfaces_by_instance.get(instance_id, [])
+        if not eni_ids:
+            return UNATTACHED
+        return most_exposed(
+            self.interface_exposure(eni_id, from_port, to_port, protocol) for eni_id in eni_ids
+        )
+
+    def has_open_group(self, eni, from_port, to_port, protocol):
+        if self.rule_index is None:
+            return False
+        open_groups = {
+            exposure["GroupId"]
+            for exposure in self.rule_index.exposures(from_port, to_port, protocol)
+            if exposure["Open"]
+        }
+        return any(group["GroupId"] in open_groups for group in eni.get("Groups", []))
+
+    def internet_routes(self, subnet_id, vpc_id):
+        """Return the default routes, 0.0.0.0/0 and ::/0, a subnet sends to an internet gateway"""
+        if subnet_id not in self._routable:
+            route_table = self.route_tables.get(subnet_id) or self.main_route_tables.get(vpc_id)
+            gateways = self.internet_gateways.get(vpc_id, set())
+            routes = set()
+            for route in (route_table or {}).get("Routes", []):
+                if route.get("State") == "active" and route.get("GatewayId") in gateways:
+                    destination = route.get("DestinationCidrBlock") or route.get(
+                        "DestinationIpv6CidrBlock"
+                    )
+                    if destination in OPEN_CIDRS:
+                        routes.add(destination)
+            self._routable[subnet_id] = routes
+        return self._routable[subnet_id]
+
+    def network_acl_allows(self, subnet_id, from_port, to_port, protocol):
+        """Return whether the subnet's network ACL lets some internet traffic to the ports in
+
+        Entries are evaluated in rule number order. An allow entry matching the ports lets
+        traffic in when its range holds public addresses, entries for private ranges only
+        are skipped. A deny entry only stops the search once it covers the whole internet.
+        """
+        entries = self.network_acls.get(subnet_id)
+        if entries is None:
+            # the default network ACL of a VPC allows all traffic
+            return True
+        for entry in entries:
+            entry_protocol = PROTOCOL_NAMES.get(str(entry["Protocol"]), str(entry["Protocol"]))
+            if protocol != "-1" and entry_protocol not in ["-1", protocol]:
+                continue
+            port_range = entry.get("PortRange")
+            if port_range and entry_protocol in ["tcp", "udp"]:
+                if port_range["From"] > to_port or port_range["To"] < from_port:
+                    continue
+            cidr = entry.get("CidrBlock") or entry.get("Ipv6CidrBlock")
+            if entry["RuleAction"] == "allow":
+                if is_public_range(cidr):
+                    return True
+                continue
+            if cidr in OPEN_CIDRS:
+                return False
+        return False
+
+
+def is_public_range(cidr):
+    """Return whether a CIDR holds any address internet traffic can come from"""
+    try:
+        network = ipaddress.ip_network(cidr, strict=False)
+    except (TypeError, ValueError):
+        # a range that cannot be read is assumed to be open
+        return True
+    return not any(
+        network.version == private.version and network.subnet_of(private)
+        for private in NON_PUBLIC_NETWORKS
+    )
+
+
+def get_addresses(eni):
+    addresses = [address["PrivateIpAddress"] for address in eni.get("PrivateIpAddresses", [])]
+    if not addresses and eni.get("PrivateIpAddress"):
+        addresses.append(eni["PrivateIpAddress"])
+    if eni.get("Association", {}).get("PublicIp"):
+        addresses.append(eni["Association"]["PublicIp"])
+    addresses.extend(address["Ipv6Address"] for address in eni.get("Ipv6Addresses", []))
+    return addresses
+
+
+def most_exposed(levels):
+    return min(levels, key=EXPOSURE_LEVELS.index, default=UNATTACHED)
+
+
+def build_network_reachability(rule_index=None, region_name=None):
+    """Build the reachability graph from the shared inventory"""
+    inventory = Inventory()
+    return NetworkReachability(
+        network_interfaces=inventory.get(
+            "ec2", "describe_network_interfaces", region_name=region_name
+        )["NetworkInterfaces"],
+        route_tables=inventory.get("ec2", "describe_route_tables", region_name=region_name)[
+            "RouteTables"
+        ],
+        internet_gateways=inventory.get(
+            "ec2", "describe_internet_gateways", region_name=region_name
+        )["InternetGateways"],
+        network_acls=inventory.get("ec2", "describe_network_acls", region_name=region_name)[
+            "NetworkAcls"
+        ],
+        rule_index=rule_index,
+    )
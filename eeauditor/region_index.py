@@ -0,0 +1,152 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+import json
+import os
+import threading
+import time
+
+import boto3
+from botocore.exceptions import UnknownServiceError
+
+from check_register import accumulate_paged_results
+
+REGION_SOURCES = ["botocore", "ssm"]
+DEFAULT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".electriceye", "region-index.json")
+DEFAULT_CACHE_TTL = 86400
+
+
+class RegionIndex(object):
+    """Answers which services are available in which regions
+
+    The default "botocore" source reads the endpoint data bundled with botocore and
+    needs no API calls at all. A service botocore only lists in other partitions is not
+    available in this one. The "ssm" source reads the SSM global infrastructure
+    public parameters once per region and keeps the answer in an on-disk cache for
+    cache_ttl seconds. Services neither source knows about, such as Shodan, are
+    treated as available everywhere.
+    """
+
+    def __init__(
+        self,
+        partition="aws",
+        source="botocore",
+        cache_file=DEFAULT_CACHE_FILE,
+        cache_ttl=DEFAULT_CACHE_TTL,
+    ):
+        if source not in REGION_SOURCES:
+            raise ValueError(f"Unknown region source {source}, expected one of {REGION_SOURCES}")
+        self.partition = partition
+        self.source = source
+        self.cache_file = cache_file
+        self.cache_ttl = cache_ttl
+        self._supported = {}
+        self._ssm_data = None
+        self._session = None
+        self._lock = threading.Lock()
+
+    def is_supported(self, service, region):
+        key = (service, region)
+        with self._lock:
+            if key not in self._supported:
+                if self.source == "ssm":
+                    self._supported[key] = self._ssm_supported(service, region)
+                else:
+                    self._supported[key] = self._botocore_supported(service, region)
+            return self._supported[key]
+
+    def load(self, regions):
+        """Resolve and cache the SSM answer for regions up front"""
+        if self.source == "ssm":
+            with self._lock:
+                for region in regions:
+                    self._ssm_region_services(region)
+
+    def _botocore_supported(self, service, region):
+        if self._session is None:
+            self._session = boto3.session.Session()
+        try:
+            regions = self._session.get_available_regions(
+                service, partition_name=self.partition
+            )
+        except UnknownServiceError:
+            return True
+        if regions:
+            return region in regions
+        # global services, such as IAM, only list a partition endpoint
+        if self._session.get_available_regions(
+            service, partition_name=self.partition, allow_non_regional=True
+        ):
+            return True
+        # a service with endpoints in another partition only is not offered in this one,
+        # nothing can be concluded for services missing from the bundled endpoint data
+        return not any(
+            self._session.get_available_regions(
+                service, partition_name=partition, allow_non_regional=True
+            )
+            for partition in self._session.get_available_partitions()
+            if partition != self.partition
+        )
+
+    def _ssm_supported(self, service, region):
+        if service not in self._ssm_region_services("global"):
+            return True
+        return service in self._ssm_region_services(region)
+
+    def _ssm_region_services(self, region):
+        if self._ssm_data is None:
+            self._ssm_data = self._read_cache()
+        if region not in self._ssm_data["regions"]:
+            if region == "global":
+                path = "/aws/service/global-infrastructure/services"
+            else:
+                path = f"/aws/service/global-infrastructure/regions/{region}/services"
+            self._ssm_data["regions"][region] = get_parameter_values(path)
+            self._write_cache()
+        return set(self._ssm_data["regions"][region])
+
+    def _read_cache(self):
+        empty = {"fetched_at": time.time(), "regions": {}}
+        if not self.cache_file:
+            return empty
+        try:
+            with open(self.cache_file) as cache:
+                data = json.load(cache)
+        except (IOError, ValueError):
+            return empty
+        if time.time() - data.get("fetched_at", 0) > self.cache_ttl:
+            return empty
+        return data
+
+    def _write_cache(self):
+        if not self.cache_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            # write then rename so concurrent workers never read a partial file
+            temp_file = f"{self.cache_file}.{os.getpid()}"
+            with open(temp_file, "w") as cache:
+                json.dump(self._ssm_data, cache)
+            os.replace(temp_file, self.cache_file)
+        except IOError as e:
+            print(f"Error writing region cache {self.cache_file} with exception {e}")
+
+
+def get_parameter_values(path):
+    ssm = boto3.client("ssm")
+    paginator = ssm.get_paginator("get_parameters_by_path")
+    response_iterator = paginator.paginate(Path=path, PaginationConfig={"PageSize": 10})
+    results = accumulate_paged_results(page_iterator=response_iterator, key="Parameters")
+    return [parameter["Value"] for parameter in results["Parameters"]]
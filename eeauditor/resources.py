@@ -0,0 +1,119 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+# How a resource type is narrowed down in the inventory operation its checks read:
+# (ARN service, resource type) -> (inventory service, operation, filter). A filter naming
+# a Filters entry is used where the API has one, so a resource deleted since the event
+# simply yields no findings instead of a not found error.
+RESOURCE_FILTERS = {
+    ("ec2", "instance"): ("ec2", "describe_instances", "Filters:instance-id"),
+    ("ec2", "security-group"): ("ec2", "describe_security_groups", "Filters:group-id"),
+    ("ec2", "volume"): ("ec2", "describe_volumes", "Filters:volume-id"),
+    ("ecr", "repository"): ("ecr", "describe_repositories", "repositoryNames"),
+    ("elasticloadbalancing", "loadbalancer"): (
+        "elb",
+        "describe_load_balancers",
+        "LoadBalancerNames",
+    ),
+    ("elasticloadbalancing", "loadbalancer/app"): (
+        "elbv2",
+        "describe_load_balancers",
+        "LoadBalancerArns",
+    ),
+    ("elasticloadbalancing", "loadbalancer/net"): (
+        "elbv2",
+        "describe_load_balancers",
+        "LoadBalancerArns",
+    ),
+    ("rds", "db"): ("rds", "describe_db_instances", "Filters:db-instance-id"),
+}
+
+# engines of the RDS instances that are audited, the shared rds inventory also holds
+# DocumentDB and Neptune instances
+RDS_ENGINES = [
+    "aurora",
+    "aurora-mysql",
+    "aurora-postgresql",
+    "mariadb",
+    "mysql",
+    "oracle-ee",
+    "postgres",
+    "sqlserver-ee",
+    "sqlserver-se",
+    "sqlserver-ex",
+    "sqlserver-web",
+]
+
+# resource types that can also be given by id instead of ARN
+ID_PREFIXES = {"i-": "instance", "sg-": "security-group", "vol-": "volume"}
+
+
+def parse_resource(resource):
+    """Split an ARN, or a bare EC2 id, into (service, region, account, type, id)
+
+    Region and account are None when resource is a bare id.
+    """
+    if not resource.startswith("arn:"):
+        for prefix, resource_type in ID_PREFIXES.items():
+            if resource.startswith(prefix):
+                return "ec2", None, None, resource_type, resource
+        raise ValueError(f"Unsupported resource {resource}")
+    arn = resource.split(":", 5)
+    if len(arn) != 6:
+        raise ValueError(f"Malformed ARN {resource}")
+    service, region, account, resource_part = arn[2:]
+    if service == "elasticloadbalancing" and resource_part.startswith("loadbalancer/"):
+        if resource_part.startswith(("loadbalancer/app/", "loadbalancer/net/")):
+            # ELBv2 is filtered by the full ARN
+            return service, region, account, resource_part.rsplit("/", 2)[0], resource
+        return service, region, account, "loadbalancer", resource_part.split("/", 1)[1]
+    separator = "/" if "/" in resource_part else ":"
+    resource_type, _, resource_id = resource_part.partition(separator)
+    return service, region, account, resource_type, resource_id
+
+
+def get_resource_filters(resources, region=None, account_id=None):
+    """Return the inventory parameters that narrow each operation down to resources
+
+    The result maps (inventory service, operation) to the keyword arguments to call the
+    operation with. Resources of another region or account, or of a type no filter is
+    known for, are reported and skipped.
+    """
+    values = {}
+    for resource in resources:
+        try:
+            parsed = parse_resource(resource)
+        except ValueError as e:
+            print(e)
+            continue
+        service, resource_region, resource_account, resource_type, resource_id = parsed
+        if (resource_region and region and resource_region != region) or (
+            resource_account and account_id and resource_account != account_id
+        ):
+            print(f"Skipping {resource}, it is not in account {account_id} in {region}")
+            continue
+        if (service, resource_type) not in RESOURCE_FILTERS:
+            print(f"Skipping {resource}, re-auditing {service} {resource_type} is not supported")
+            continue
+        key = RESOURCE_FILTERS[(service, resource_type)]
+        values.setdefault(key, []).append(resource_id)
+    filters = {}
+    for (service_name, operation, name), ids in values.items():
+        if name.startswith("Filters:"):
+            params = {"Filters": [{"Name": name.split(":", 1)[1], "Values": ids}]}
+        else:
+            params = {name: ids}
+        filters[(service_name, operation)] = params
+    return filters
@@ -0,0 +1,125 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import time
+
+from client_factory import ClientFactory
+
+# the per bucket calls the S3 checks read
+BUCKET_OPERATIONS = [
+    "get_bucket_encryption",
+    "get_bucket_lifecycle_configuration",
+    "get_bucket_versioning",
+    "get_bucket_policy",
+    "get_bucket_policy_status",
+    "get_bucket_logging",
+]
+DEFAULT_WORKERS = 20
+# seconds a bucket may take before its running and remaining calls are given up
+DEFAULT_BUCKET_TIMEOUT = 30
+# location constraints that are not region names
+LOCATION_REGIONS = {"EU": "eu-west-1"}
+
+
+class BucketSnapshot(object):
+    """Configuration of every S3 bucket, read concurrently from each bucket's own region
+
+    The region of a bucket is resolved once with GetBucketLocation, then its calls are
+    made through the shared client of that region, so none is redirected from the
+    global endpoint. Buckets are read by a pool of workers. Every call of a bucket is
+    only waited for until the bucket has taken timeout seconds, a call still running
+    then and the calls left fail with a TimeoutError, so one slow bucket cannot hold
+    the whole auditor up.
+
+    The response, or the error, of every call is kept and handed back by get, so the
+    checks handle a missing configuration the same way as when calling S3 themselves.
+    """
+
+    def __init__(
+        self,
+        buckets,
+        operations=BUCKET_OPERATIONS,
+        workers=DEFAULT_WORKERS,
+        timeout=DEFAULT_BUCKET_TIMEOUT,
+    ):
+        self.buckets = list(buckets)
+        self.operations = operations
+        self.timeout = timeout
+        bucket_names = [bucket["Name"] for bucket in self.buckets]
+        # calls are made here so a worker can stop waiting for one that hangs
+        self._calls = ThreadPoolExecutor(max_workers=workers * 2)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                self.configurations = dict(
+                    zip(bucket_names, executor.map(self.fetch_bucket, bucket_names))
+                )
+        finally:
+            # calls given up on finish in the background rather than being waited for
+            self._calls.shutdown(wait=False, cancel_futures=True)
+
+    def get(self, bucket_name, operation):
+        """Return the response of operation for a bucket, raising the error it failed with"""
+        result = self.configurations[bucket_name][operation]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def fetch_bucket(self, bucket_name):
+        deadline = time.monotonic() + self.timeout
+        try:
+            region_name = self._call(
+                deadline,
+                f"get_bucket_location for bucket {bucket_name}",
+                get_bucket_region,
+                ClientFactory.get_client("s3"),
+                bucket_name,
+            )
+            client = ClientFactory.get_client("s3", region_name=region_name)
+        except Exception as e:
+            print(f"Failed to locate bucket {bucket_name} with exception {e}")
+            return {operation: e for operation in self.operations}
+        configuration = {}
+        for operation in self.operations:
+            try:
+                configuration[operation] = self._call(
+                    deadline,
+                    f"{operation} for bucket {bucket_name}",
+                    getattr(client, operation),
+                    Bucket=bucket_name,
+                )
+            except Exception as e:
+                configuration[operation] = e
+        return configuration
+
+    def _call(self, deadline, description, function, *args, **kwargs):
+        """Return function(*args, **kwargs), raising a TimeoutError once past the deadline"""
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            future = self._calls.submit(function, *args, **kwargs)
+            try:
+                return future.result(timeout=remaining)
+            except FutureTimeoutError:
+                future.cancel()
+        raise TimeoutError(f"Gave up on {description} after {self.timeout} seconds")
+
+
+def get_bucket_region(client, bucket_name):
+    location = client.get_bucket_location(Bucket=bucket_name).get("LocationConstraint")
+    if not location:
+        # buckets of the first region of a partition have no location constraint
+        return "us-east-1" if client.meta.partition == "aws" else client.meta.region_name
+    return LOCATION_REGIONS.get(location, location)
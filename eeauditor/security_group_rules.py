@@ -0,0 +1,172 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+from bisect import bisect_right
+
+from inventory import Inventory
+
+OPEN_CIDRS = {"0.0.0.0/0", "::/0"}
+# protocol numbers security groups may report instead of names
+PROTOCOL_NAMES = {"6": "tcp", "17": "udp", "1": "icmp", "58": "icmpv6"}
+MAX_PORT = 65535
+
+
+class SecurityGroupRuleIndex(object):
+    """Index of the inbound rules of security groups by protocol and port range
+
+    Every group is read once. Each (protocol, from port, to port, source) rule is
+    flattened into a list, and the port space of each protocol is split into the
+    segments between rule boundaries, each segment holding the rules covering it.
+    Looking up the rules exposing a port is then a binary search, so any number of
+    port checks can be answered from the same index. Sources are IPv4 and IPv6 ranges,
+    prefix lists and referenced security groups.
+
+    When a NetworkReachability graph is set as reachability, open exposures are also
+    ranked by how far internet traffic actually gets to the group's interfaces.
+    """
+
+    def __init__(self, security_groups):
+        self.groups = {group["GroupId"]: group for group in security_groups}
+        self.rules = []
+        for group in security_groups:
+            for permission in group.get("IpPermissions", []):
+                self.rules.extend(flatten_permission(group["GroupId"], permission))
+        self._segments = {}
+        for protocol in {rule["IpProtocol"] for rule in self.rules}:
+            self._segments[protocol] = build_segments(
+                [rule for rule in self.rules if rule["IpProtocol"] == protocol]
+            )
+        self._prefix_lists = {}
+        self._exposures = {}
+        self.reachability = None
+
+    def matching_rules(self, from_port, to_port, protocol):
+        """Return the rules of protocol overlapping the ports, rules for all traffic included"""
+        protocols = [protocol] if protocol == "-1" else [protocol, "-1"]
+        matches = {}
+        for rule_protocol in protocols:
+            if rule_protocol not in self._segments:
+                continue
+            boundaries, segments = self._segments[rule_protocol]
+            first = bisect_right(boundaries, from_port) - 1
+            last = bisect_right(boundaries, to_port) - 1
+            for segment in segments[first : last + 1]:
+                for rule in segment:
+                    # a rule spanning several segments is only reported once
+                    matches.setdefault(id(rule), rule)
+        return list(matches.values())
+
+    def exposures(self, from_port, to_port, protocol="tcp"):
+        """Return, per group and rule protocol, whether the ports are open to the internet
+
+        Each item holds the GroupId, GroupName, IpProtocol, Open and Reachability of one
+        group. Open is True when any rule covering the ports allows an internet wide
+        source. Reachability is the exposure level of an open group, or UNKNOWN.
+        """
+        key = (from_port, to_port, protocol)
+        if key not in self._exposures:
+            self._exposures[key] = self._find_exposures(from_port, to_port, protocol)
+        return self._exposures[key]
+
+    def _find_exposures(self, from_port, to_port, protocol):
+        results = {}
+        for rule in self.matching_rules(from_port, to_port, protocol):
+            key = (rule["GroupId"], rule["IpProtocol"])
+            if key not in results:
+                results[key] = {
+                    "GroupId": rule["GroupId"],
+                    "GroupName": self.groups[rule["GroupId"]]["GroupName"],
+                    "IpProtocol": rule["IpProtocol"],
+                    "Open": False,
+                    "Reachability": "UNKNOWN",
+                }
+            if not results[key]["Open"] and self.is_open(rule):
+                results[key]["Open"] = True
+        if self.reachability is not None:
+            for result in results.values():
+                if result["Open"]:
+                    result["Reachability"] = self.reachability.group_exposure(
+                        result["GroupId"], from_port, to_port, protocol
+                    )
+        # report groups in the order they were described
+        order = {group_id: index for index, group_id in enumerate(self.groups)}
+        return sorted(results.values(), key=lambda result: order[result["GroupId"]])
+
+    def is_open(self, rule):
+        if rule["SourceType"] == "PrefixList":
+            return bool(OPEN_CIDRS & self.prefix_list_cidrs(rule["Source"]))
+        return rule["Source"] in OPEN_CIDRS
+
+    def prefix_list_cidrs(self, prefix_list_id):
+        if prefix_list_id not in self._prefix_lists:
+            try:
+                response = Inventory().get(
+                    "ec2", "get_managed_prefix_list_entries", PrefixListId=prefix_list_id
+                )
+                cidrs = {entry["Cidr"] for entry in response["Entries"]}
+            except Exception as e:
+                print(f"Failed to read prefix list {prefix_list_id} with exception {e}")
+                cidrs = set()
+            self._prefix_lists[prefix_list_id] = cidrs
+        return self._prefix_lists[prefix_list_id]
+
+
+def flatten_permission(group_id, permission):
+    """Turn one IpPermissions entry into a rule per source"""
+    protocol = str(permission.get("IpProtocol", "-1"))
+    protocol = PROTOCOL_NAMES.get(protocol, protocol)
+    if protocol in ["-1", "tcp", "udp"] and "FromPort" in permission:
+        from_port = permission["FromPort"]
+        to_port = permission.get("ToPort", from_port)
+    else:
+        # all traffic, or protocols without ports such as ICMP
+        from_port, to_port = 0, MAX_PORT
+    if from_port < 0 or to_port < 0:
+        from_port, to_port = 0, MAX_PORT
+    sources = (
+        [("Ipv4", ip_range["CidrIp"]) for ip_range in permission.get("IpRanges", [])]
+        + [("Ipv6", ip_range["CidrIpv6"]) for ip_range in permission.get("Ipv6Ranges", [])]
+        + [("PrefixList", prefix["PrefixListId"]) for prefix in permission.get("PrefixListIds", [])]
+        + [
+            ("SecurityGroup", pair["GroupId"])
+            for pair in permission.get("UserIdGroupPairs", [])
+            if "GroupId" in pair
+        ]
+    )
+    return [
+        {
+            "GroupId": group_id,
+            "IpProtocol": protocol,
+            "FromPort": from_port,
+            "ToPort": to_port,
+            "SourceType": source_type,
+            "Source": source,
+        }
+        for source_type, source in sources
+    ]
+
+
+def build_segments(rules):
+    """Split the port space at rule boundaries, returning (boundaries, rules per segment)"""
+    boundaries = sorted(
+        {0} | {rule["FromPort"] for rule in rules} | {rule["ToPort"] + 1 for rule in rules}
+    )
+    segments = [[] for _ in boundaries]
+    for rule in rules:
+        first = bisect_right(boundaries, rule["FromPort"]) - 1
+        last = bisect_right(boundaries, rule["ToPort"]) - 1
+        for index in range(first, last + 1):
+            segments[index].append(rule)
+    return boundaries, segments
@@ -0,0 +1,194 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_limiter import TokenBucket
+
+SHODAN_HOST_URL = "https://api.shodan.io/shodan/host/"
+# what Shodan answers for an IP it has not indexed, a result worth caching like any other
+NOT_INDEXED_STATUS = 404
+# Shodan allows one request per second on most plans
+SHODAN_RATE = 1
+SHODAN_BURST = 1
+DEFAULT_WORKERS = 4
+# (connect, read) seconds
+REQUEST_TIMEOUT = (5, 30)
+# where results are kept between runs and for how long, in seconds
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".electriceye", "shodan_cache.db")
+DEFAULT_CACHE_TTL = 24 * 60 * 60
+
+
+class ShodanCache(object):
+    """Shodan host results kept in SQLite between runs
+
+    A result older than ttl seconds is treated as missing. A ttl of 0 disables the cache.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = None
+        if ttl <= 0:
+            return
+        try:
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._lock, self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS hosts "
+                    "(ip TEXT PRIMARY KEY, fetched_at REAL NOT NULL, data TEXT NOT NULL)"
+                )
+        except (OSError, sqlite3.Error) as e:
+            # a read only file system only costs the caching, not the lookups
+            print(f"Failed to open the Shodan cache {path} with exception {e}")
+            self._db = None
+
+    def get(self, ip):
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM hosts WHERE ip = ? AND fetched_at > ?",
+                (ip, time.time() - self.ttl),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, ip, data):
+        if self._db is None:
+            return
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO hosts (ip, fetched_at, data) VALUES (?, ?, ?)",
+                (ip, time.time(), json.dumps(data)),
+            )
+
+
+class ShodanClient(object):
+    """Looks up hosts in Shodan once per IP, shared between every Shodan check
+
+    Results come from the on-disk cache while they are fresh, so repeated sweeps only
+    query IPs that are new or expired. An IP found by several checks, for example
+    behind both an instance and a load balancer, is looked up once per run, a lookup
+    already in flight being waited on. Requests go through one pooled session with
+    timeouts and retries, paced by a token bucket to the Shodan API rate limit.
+
+    The cache location and time to live, in seconds, are read from the
+    SHODAN_CACHE_PATH and SHODAN_CACHE_TTL environment variables.
+    """
+
+    _results = {}
+    _lock = threading.Lock()
+    _session = None
+    _cache = None
+    _bucket = TokenBucket(SHODAN_RATE, SHODAN_BURST)
+
+    def host(self, ip, api_key):
+        """Return what Shodan knows about ip, as the host API answers it"""
+        with self._lock:
+            future = self._results.get(ip)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._results[ip] = future
+        if not owner:
+            return future.result()
+        try:
+            data = self.get_cache().get(ip)
+            if data is None:
+                data = self._fetch(ip, api_key)
+        except Exception as e:
+            # let the next lookup of the IP try again rather than keeping the failure
+            with self._lock:
+                del self._results[ip]
+            future.set_exception(e)
+            raise
+        future.set_result(data)
+        return data
+
+    def prefetch(self, ips, api_key, workers=DEFAULT_WORKERS):
+        """Look up several IPs concurrently so the checks then read them from memory"""
+        ips = {ip for ip in ips if ip not in self._results}
+        if not ips:
+            return
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {ip: executor.submit(self.host, ip, api_key) for ip in ips}
+            for ip, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Failed to look up {ip} in Shodan with exception {e}")
+
+    def _fetch(self, ip, api_key):
+        self._bucket.acquire()
+        response = self.get_session().get(
+            SHODAN_HOST_URL + ip, params={"key": api_key}, timeout=REQUEST_TIMEOUT
+        )
+        if response.status_code == 429:
+            self._bucket.throttled()
+        elif self._bucket.rate < self._bucket.initial_rate:
+            self._bucket.succeeded()
+        data = response.json()
+        if response.ok or response.status_code == NOT_INDEXED_STATUS:
+            self.get_cache().put(ip, data)
+        return data
+
+    @classmethod
+    def get_session(cls):
+        if cls._session is None:
+            with cls._lock:
+                if cls._session is None:
+                    retries = Retry(
+                        total=3,
+                        backoff_factor=1,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                        allowed_methods=["GET"],
+                        raise_on_status=False,
+                    )
+                    session = requests.Session()
+                    session.mount(
+                        "https://",
+                        HTTPAdapter(pool_maxsize=DEFAULT_WORKERS, max_retries=retries),
+                    )
+                    cls._session = session
+        return cls._session
+
+    @classmethod
+    def get_cache(cls):
+        if cls._cache is None:
+            with cls._lock:
+                if cls._cache is None:
+                    cls._cache = ShodanCache(
+                        path=os.environ.get("SHODAN_CACHE_PATH", DEFAULT_CACHE_PATH),
+                        ttl=int(os.environ.get("SHODAN_CACHE_TTL", DEFAULT_CACHE_TTL)),
+                    )
+        return cls._cache
+
+    @classmethod
+    def clear(cls):
+        """Forget the results of this run, the on-disk cache is kept"""
+        with cls._lock:
+            cls._results.clear()
+            cls._cache = None
@@ -0,0 +1,179 @@
+# This file is part of ElectricEye.
+
+# ElectricEye is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# ElectricEye is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with ElectricEye.
+# If not, see https://github.com/jonrau1/ElectricEye/blob/master/LICENSE.
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from check_register import report_error
+
+DEFAULT_WORKERS = 10
+# snapshots read ahead of the one being audited per worker, this bounds what is in memory
+READ_AHEAD_PER_WORKER = 4
+# attributes written to the store between two commits
+COMMIT_EVERY = 500
+# where attributes are kept between runs and for how long, in seconds, before being read again
+DEFAULT_STATE_PATH = os.path.join(os.path.expanduser("~"), ".electriceye", "snapshot_attributes.db")
+DEFAULT_RECHECK_SECONDS = 0
+
+
+class SnapshotAttributeStore(object):
+    """Snapshot sharing attributes kept in SQLite between runs
+
+    Attributes read less than recheck_seconds ago are reused instead of being read
+    again, older ones are dropped when the store is opened. A recheck_seconds of 0, the
+    default, disables the store so every snapshot is read on every run.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=DEFAULT_STATE_PATH, recheck_seconds=DEFAULT_RECHECK_SECONDS):
+        self.recheck_seconds = recheck_seconds
+        self._lock = threading.Lock()
+        self._db = None
+        self._uncommitted = 0
+        if recheck_seconds <= 0:
+            return
+        try:
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._lock, self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS attributes (scope TEXT NOT NULL, "
+                    "snapshot_id TEXT NOT NULL, checked_at REAL NOT NULL, data TEXT NOT NULL, "
+                    "PRIMARY KEY (scope, snapshot_id))"
+                )
+                self._db.execute(
+                    "DELETE FROM attributes WHERE checked_at <= ?",
+                    (time.time() - recheck_seconds,),
+                )
+        except (OSError, sqlite3.Error) as e:
+            # a read only file system only costs the reuse, not the audit
+            print(f"Failed to open the snapshot attribute store {path} with exception {e}")
+            self._db = None
+
+    def get(self, scope, snapshot_id):
+        """Return the attributes read for the snapshot within the recheck interval, or None"""
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM attributes WHERE scope = ? AND snapshot_id = ? "
+                "AND checked_at > ?",
+                (scope, snapshot_id, time.time() - self.recheck_seconds),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, scope, snapshot_id, attributes):
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO attributes (scope, snapshot_id, checked_at, data) "
+                "VALUES (?, ?, ?, ?)",
+                (scope, snapshot_id, time.time(), json.dumps(attributes, default=str)),
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= COMMIT_EVERY:
+                self._db.commit()
+                self._uncommitted = 0
+
+    def commit(self):
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.commit()
+            self._uncommitted = 0
+
+    @classmethod
+    def shared(cls):
+        """Return the store of this run
+
+        Its location and recheck interval, in seconds, are read from the
+        SNAPSHOT_STATE_PATH and SNAPSHOT_RECHECK_SECONDS environment variables.
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls(
+                        path=os.environ.get("SNAPSHOT_STATE_PATH", DEFAULT_STATE_PATH),
+                        recheck_seconds=int(
+                            os.environ.get("SNAPSHOT_RECHECK_SECONDS", DEFAULT_RECHECK_SECONDS)
+                        ),
+                    )
+        return cls._shared
+
+    @classmethod
+    def clear(cls):
+        with cls._shared_lock:
+            cls._shared = None
+
+
+def stream_snapshot_attributes(
+    snapshots, snapshot_id, fetch, scope, workers=DEFAULT_WORKERS, store=None
+):
+    """Yield (snapshot, attributes) for every snapshot of a stream, in stream order
+
+    fetch reads the attributes of a snapshot id and must return JSON serializable data.
+    Up to workers attribute reads run concurrently, and snapshots are only pulled from
+    the stream READ_AHEAD_PER_WORKER per worker ahead of the caller, so a paginated
+    stream of any length is audited in constant memory with findings coming out as soon
+    as the first reads finish. Attributes still fresh in the store are reused rather than
+    read, scope keeps apart the snapshots of different accounts, regions and services.
+    A snapshot whose attributes cannot be read, for instance because it was deleted
+    since it was listed, is reported as an error of the running check and left out.
+    """
+    if store is None:
+        store = SnapshotAttributeStore.shared()
+
+    def lookup(snapshot):
+        resource_id = snapshot_id(snapshot)
+        attributes = store.get(scope, resource_id)
+        if attributes is None:
+            attributes = fetch(resource_id)
+            store.put(scope, resource_id, attributes)
+        return attributes
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for snapshot in snapshots:
+                pending.append((snapshot, executor.submit(lookup, snapshot)))
+                if len(pending) >= workers * READ_AHEAD_PER_WORKER:
+                    yield from _completed(*pending.popleft(), snapshot_id)
+            while pending:
+                yield from _completed(*pending.popleft(), snapshot_id)
+        finally:
+            # the caller stopped early, do not read attributes nobody will look at
+            for snapshot, future in pending:
+                future.cancel()
+            store.commit()
+
+
+def _completed(snapshot, future, snapshot_id):
+    try:
+        attributes = future.result()
+    except Exception as e:
+        report_error(
+            f"Failed to read the attributes of snapshot {snapshot_id(snapshot)} with exception {e}"
+        )
+        return
+    yield snapshot, attributes
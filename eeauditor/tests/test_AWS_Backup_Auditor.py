@@ -0,0 +1,51 @@
+import pytest
+from botocore.stub import Stubber
+
+from . import context
+from client_factory import ClientFactory
+from inventory import Inventory
+from auditors.aws.AWS_Backup_Auditor import volume_backup_check
+
+describe_volumes_response = {
+    "Volumes": [
+        {"VolumeId": "vol-00000000000000001", "State": "in-use"},
+        {"VolumeId": "vol-00000000000000002", "State": "available"},
+        {"VolumeId": "vol-00000000000000003", "State": "deleting"},
+    ]
+}
+
+list_protected_resources_response = {
+    "Results": [
+        {
+            "ResourceArn": "arn:aws:ec2:us-east-1:012345678901:volume/vol-00000000000000001",
+            "ResourceType": "EBS",
+        }
+    ]
+}
+
+
+@pytest.fixture(scope="function")
+def stubbers():
+    Inventory.clear()
+    ec2_stubber = Stubber(ClientFactory.get_client("ec2"))
+    backup_stubber = Stubber(ClientFactory.get_client("backup"))
+    ec2_stubber.activate()
+    backup_stubber.activate()
+    yield ec2_stubber, backup_stubber
+    ec2_stubber.deactivate()
+    backup_stubber.deactivate()
+    Inventory.clear()
+
+
+def test_protection_answered_from_one_listing(stubbers):
+    ec2_stubber, backup_stubber = stubbers
+    ec2_stubber.add_response("describe_volumes", describe_volumes_response)
+    # a single listing answers every volume, a call per volume would fail the stubber
+    backup_stubber.add_response("list_protected_resources", list_protected_resources_response)
+    findings = list(
+        volume_backup_check(
+            cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
+        )
+    )
+    assert [finding["Compliance"]["Status"] for finding in findings] == ["PASSED", "FAILED"]
+    backup_stubber.assert_no_pending_responses()
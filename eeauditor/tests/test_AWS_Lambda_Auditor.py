@@ -6,10 +6,10 @@ import sys
 from botocore.stub import Stubber, ANY
 
 from . import context
+from client_factory import ClientFactory
 from auditors.aws.AWS_Lambda_Auditor import (
     unused_function_check,
     lambda_client,
-    cloudwatch,
 )
 
 print(sys.path)
@@ -65,7 +65,8 @@ def lambda_stubber():
 
 @pytest.fixture(scope="function")
 def cloudwatch_stubber():
-    cloudwatch_stubber = Stubber(cloudwatch)
+    # the metrics are read through the shared client
+    cloudwatch_stubber = Stubber(ClientFactory.get_client("cloudwatch"))
     cloudwatch_stubber.activate()
     yield cloudwatch_stubber
     cloudwatch_stubber.deactivate()
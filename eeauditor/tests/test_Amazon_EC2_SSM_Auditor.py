@@ -0,0 +1,140 @@
+import datetime
+
+import pytest
+from botocore.stub import Stubber
+
+from . import context
+from client_factory import ClientFactory
+from inventory import Inventory
+from auditors.aws.Amazon_EC2_SSM_Auditor import (
+    ec2_instance_ssm_managed_check,
+    ssm_instace_agent_update_check,
+    ssm_instance_patch_state_state,
+)
+
+instance_ids = [f"i-{index:017x}" for index in range(60)]
+
+describe_instances_response = {
+    "Reservations": [
+        {
+            "Instances": [
+                {
+                    "InstanceId": instance_id,
+                    "InstanceType": "t3.micro",
+                    "ImageId": "ami-12345678",
+                    "VpcId": "vpc-12345678",
+                    "SubnetId": "subnet-12345678",
+                    "LaunchTime": datetime.datetime(2020, 1, 1),
+                }
+                for instance_id in instance_ids
+            ]
+        }
+    ]
+}
+
+describe_instance_information_response = {
+    "InstanceInformationList": [
+        {
+            "InstanceId": instance_ids[0],
+            "IsLatestVersion": False,
+            "AssociationStatus": "Success",
+        },
+        {
+            "InstanceId": instance_ids[1],
+            "IsLatestVersion": True,
+            "AssociationStatus": "Success",
+        },
+    ]
+}
+
+
+def patch_state(instance_id, missing_count):
+    return {
+        "InstanceId": instance_id,
+        "PatchGroup": "default",
+        "BaselineId": "pb-12345678901234567",
+        "OperationStartTime": datetime.datetime(2020, 1, 1),
+        "OperationEndTime": datetime.datetime(2020, 1, 1),
+        "Operation": "Scan",
+        "FailedCount": 0,
+        "MissingCount": missing_count,
+    }
+
+
+def run_check(check):
+    return list(
+        check(cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws")
+    )
+
+
+@pytest.fixture(scope="function")
+def stubbers():
+    Inventory.clear()
+    ec2_stubber = Stubber(ClientFactory.get_client("ec2"))
+    ssm_stubber = Stubber(ClientFactory.get_client("ssm"))
+    ec2_stubber.activate()
+    ssm_stubber.activate()
+    ec2_stubber.add_response("describe_instances", describe_instances_response)
+    yield ec2_stubber, ssm_stubber
+    ec2_stubber.deactivate()
+    ssm_stubber.deactivate()
+    Inventory.clear()
+
+
+def test_managed_instances_listed_once(stubbers):
+    ec2_stubber, ssm_stubber = stubbers
+    ssm_stubber.add_response(
+        "describe_instance_information", describe_instance_information_response
+    )
+    findings = run_check(ec2_instance_ssm_managed_check)
+    assert len(findings) == len(instance_ids)
+    assert [finding["Compliance"]["Status"] for finding in findings[:3]] == [
+        "PASSED",
+        "PASSED",
+        "FAILED",
+    ]
+    # the agent check reads the same listing, and only reports managed instances
+    findings = run_check(ssm_instace_agent_update_check)
+    assert [finding["Compliance"]["Status"] for finding in findings] == ["FAILED", "PASSED"]
+    ssm_stubber.assert_no_pending_responses()
+
+
+def test_patch_states_fetched_in_batches(stubbers):
+    ec2_stubber, ssm_stubber = stubbers
+    ssm_stubber.add_response(
+        "describe_instance_patch_states",
+        {"InstancePatchStates": [patch_state(instance_ids[0], 2)]},
+        {"InstanceIds": instance_ids[:50]},
+    )
+    ssm_stubber.add_response(
+        "describe_instance_patch_states",
+        {"InstancePatchStates": [patch_state(instance_ids[50], 0)]},
+        {"InstanceIds": instance_ids[50:]},
+    )
+    findings = run_check(ssm_instance_patch_state_state)
+    statuses = {
+        finding["Resources"][0]["Id"].rsplit("/", 1)[1]: finding["Compliance"]["Status"]
+        for finding in findings
+    }
+    assert statuses[instance_ids[0]] == "FAILED"
+    assert statuses[instance_ids[50]] == "PASSED"
+    assert statuses[instance_ids[1]] == "FAILED"
+    ssm_stubber.assert_no_pending_responses()
+
+
+def test_patch_state_failure_reported_once(stubbers, capsys):
+    ec2_stubber, ssm_stubber = stubbers
+    ssm_stubber.add_client_error(
+        "describe_instance_patch_states", service_error_code="AccessDeniedException"
+    )
+    cache = {}
+    for _ in range(2):
+        findings = list(
+            ssm_instance_patch_state_state(
+                cache=cache, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
+            )
+        )
+        assert findings == []
+    # the failure is kept for the run, the lookup is neither retried nor reported per instance
+    assert capsys.readouterr().out.count("AccessDeniedException") == 2
+    ssm_stubber.assert_no_pending_responses()
@@ -6,10 +6,10 @@ import sys
 from botocore.stub import Stubber, ANY
 
 from . import context
+from client_factory import ClientFactory
 from auditors.aws.Amazon_SQS_Auditor import (
     sqs_old_message_check,
     sqs,
-    cloudwatch,
 )
 
 print(sys.path)
@@ -75,7 +75,8 @@ def sqs_stubber():
 
 @pytest.fixture(scope="function")
 def cloudwatch_stubber():
-    cloudwatch_stubber = Stubber(cloudwatch)
+    # the metrics are read through the shared client
+    cloudwatch_stubber = Stubber(ClientFactory.get_client("cloudwatch"))
     cloudwatch_stubber.activate()
     yield cloudwatch_stubber
     cloudwatch_stubber.deactivate()
@@ -133,3 +134,41 @@ def test_pass(sqs_stubber, cloudwatch_stubber):
             assert False
     sqs_stubber.assert_no_pending_responses()
     cloudwatch_stubber.assert_no_pending_responses()
+
+
+def test_queues_of_every_page_checked(sqs_stubber, cloudwatch_stubber):
+    sqs_stubber.add_response("list_queues", dict(list_queues_response, NextToken="page-2"))
+    sqs_stubber.add_response(
+        "list_queues",
+        {"QueueUrls": ["https://us-east-2.queue.amazonaws.com/805574742241/OtherQueue"]},
+        {"NextToken": "page-2"},
+    )
+    sqs_stubber.add_response("get_queue_attributes", get_queue_attributes_response)
+    sqs_stubber.add_response(
+        "get_queue_attributes",
+        {
+            "Attributes": {
+                "MessageRetentionPeriod": "345600",
+                "QueueArn": "arn:aws:sqs:us-east-2:805574742241:OtherQueue",
+            }
+        },
+    )
+    cloudwatch_stubber.add_response(
+        "get_metric_data",
+        {
+            "MetricDataResults": [
+                dict(get_metric_data_empty_response["MetricDataResults"][0], Id=queryId)
+                for queryId in ["m1", "m2"]
+            ]
+        },
+        get_metric_data_params,
+    )
+    results = sqs_old_message_check(
+        cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
+    )
+    assert [result["Id"].split(":")[-1] for result in results] == [
+        "MyQueue/sqs-old-message-check",
+        "OtherQueue/sqs-old-message-check",
+    ]
+    sqs_stubber.assert_no_pending_responses()
+    cloudwatch_stubber.assert_no_pending_responses()
@@ -0,0 +1,33 @@
+import datetime
+
+import boto3
+from botocore.credentials import AssumeRoleCredentialFetcher
+
+from . import context
+from accounts import assume_role_session
+
+
+def test_assumed_role_session_uses_role_credentials(monkeypatch):
+    # credentials of the environment must not take the place of the role's
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIAENVIRONMENT")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "secret")
+    expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+    monkeypatch.setattr(
+        AssumeRoleCredentialFetcher,
+        "fetch_credentials",
+        lambda self: {
+            "access_key": "ASIAROLE",
+            "secret_key": "secret",
+            "token": "token",
+            "expiry_time": expiry.isoformat(),
+        },
+    )
+    session = boto3.Session(
+        botocore_session=assume_role_session(
+            "arn:aws:iam::012345678901:role/ElectricEye", region_name="eu-west-1"
+        )
+    )
+    credentials = session.get_credentials()
+    assert credentials.method == "assume-role"
+    assert credentials.get_frozen_credentials().access_key == "ASIAROLE"
+    assert session.region_name == "eu-west-1"
@@ -0,0 +1,42 @@
+import json
+import os
+
+from . import context
+from check_manifest import MANIFEST_FILE_NAME, build_manifest, select_checks, select_modules
+
+here = os.path.abspath(os.path.dirname(__file__))
+auditors_path = os.path.join(here, "..", "auditors", "aws")
+
+
+def test_build_manifest_finds_registered_checks():
+    manifest = build_manifest(os.path.join(here, "test_modules"))
+    assert manifest == [
+        {
+            "check": "plugin_func_1",
+            "module": "plugin1",
+            "service": "test",
+            "description": "",
+            "inventory": [],
+        }
+    ]
+
+
+def test_check_manifest_is_up_to_date():
+    # regenerate with: python3 check_manifest.py
+    with open(os.path.join(auditors_path, MANIFEST_FILE_NAME)) as manifest:
+        assert json.load(manifest) == build_manifest(auditors_path)
+
+
+def test_select_modules():
+    manifest = build_manifest(auditors_path)
+    assert select_modules(manifest, check_name="public_ami_check") == ["AMI_Auditor"]
+    assert select_modules(manifest, service_name="shodan") == ["Shodan_Auditor"]
+    assert "AMI_Auditor" in select_modules(manifest, service_name="ec2")
+    assert select_modules(manifest, plugin_name="AMI_Auditor", service_name="iam") == []
+
+
+def test_manifest_records_inventory_reads_through_helpers():
+    manifest = build_manifest(auditors_path)
+    checks = select_checks(manifest, [("ec2", "describe_security_groups")])
+    assert {check["module"] for check in checks} == {"Amazon_EC2_Security_Group_Auditor"}
+    assert "security_group_open_ftp_check" in [check["check"] for check in checks]
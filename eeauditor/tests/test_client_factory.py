@@ -0,0 +1,35 @@
+import boto3
+
+from . import context
+from client_factory import ClientFactory, lazy_client
+
+
+def test_lazy_client_is_built_on_first_use():
+    ClientFactory._clients.clear()
+    client = lazy_client("ec2")
+    assert not ClientFactory._clients
+    assert client.meta.service_model.service_name == "ec2"
+    assert len(ClientFactory._clients) == 1
+
+
+def test_clients_shared_per_service_region_and_credentials():
+    session = boto3.session.Session(
+        aws_access_key_id="AKIA", aws_secret_access_key="secret", region_name="us-east-1"
+    )
+    first = ClientFactory.get_client("ec2", session=session)
+    assert ClientFactory.get_client("ec2", session=session) is first
+    assert ClientFactory.get_client("ec2", region_name="eu-west-1", session=session) is not first
+    assert ClientFactory.get_client("sqs", session=session) is not first
+
+
+def test_lazy_client_resolved_once_per_default_session(monkeypatch):
+    client = lazy_client("ec2")
+    first = client.meta
+    calls = []
+    monkeypatch.setattr(ClientFactory, "client_key", lambda *args, **kwargs: calls.append(args))
+    assert client.meta is first
+    assert not calls
+    monkeypatch.undo()
+    # a new default session gets clients of its own
+    monkeypatch.setattr(boto3, "DEFAULT_SESSION", boto3.session.Session(region_name="eu-west-1"))
+    assert client.meta.region_name == "eu-west-1"
@@ -0,0 +1,45 @@
+import pytest
+
+from . import context
+from detail_loader import DetailLoader, detail_loader
+
+
+class Describer(object):
+    """Describes resources by id, failing for the id "broken" """
+
+    def __init__(self):
+        self.described = []
+
+    def __call__(self, resource_id):
+        self.described.append(resource_id)
+        if resource_id == "broken":
+            raise ValueError(f"cannot describe {resource_id}")
+        return {"Id": resource_id}
+
+
+def test_every_resource_described_once():
+    describe = Describer()
+    cache = {}
+    for check in range(3):
+        loader = detail_loader(cache, "clusters", describe, ["j-1", "j-2", "j-1"])
+        assert loader.get("j-1") == {"Id": "j-1"}
+        assert loader.get("j-2") == {"Id": "j-2"}
+    assert sorted(describe.described) == ["j-1", "j-2"]
+
+
+def test_failed_fetch_raised_to_every_check():
+    describe = Describer()
+    loader = DetailLoader(describe, ["broken", "j-1"])
+    for check in range(2):
+        with pytest.raises(ValueError):
+            loader.get("broken")
+    assert loader.get("j-1") == {"Id": "j-1"}
+    assert describe.described.count("broken") == 1
+
+
+def test_resource_missing_from_list_fetched_alone():
+    describe = Describer()
+    loader = DetailLoader(describe, [])
+    assert loader.get("sc-1") == {"Id": "sc-1"}
+    assert loader.get("sc-1") == {"Id": "sc-1"}
+    assert describe.described == ["sc-1"]
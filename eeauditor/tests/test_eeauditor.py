@@ -1,26 +1,55 @@
 import json
 
+import pytest
+from botocore.stub import Stubber
+
 from . import context
-from eeauditor import EEAuditor
+from check_register import report_error
+from client_factory import ClientFactory
+from eeauditor import EEAuditor, get_global_region
+from shodan_client import ShodanClient
 from .test_modules.plugin1 import plugin_func_1
 
 
-def test_eeauditor_plugin_loader():
-    app = EEAuditor(name="test controller", search_path="./tests/test_modules")
+@pytest.fixture(scope="function")
+def app():
+    # account and region are given so no STS call is made
+    app = EEAuditor(
+        name="test controller",
+        search_path="./tests/test_modules",
+        region="us-east-1",
+        account_id="012345678901",
+    )
+    yield app
+    # the plugin source of the next test reuses the same name
+    app.source.cleanup()
+
+
+def test_eeauditor_forgets_shodan_results_of_earlier_runs():
+    ShodanClient._results["192.0.2.1"] = "stale"
+    app = EEAuditor(
+        name="test controller",
+        search_path="./tests/test_modules",
+        region="us-east-1",
+        account_id="012345678901",
+    )
+    app.source.cleanup()
+    assert "192.0.2.1" not in ShodanClient._results
+
+
+def test_eeauditor_plugin_loader(app):
     app.load_plugins()
     for k, v in app.registry.checks["test"].items():
         assert k == "plugin_func_1"
 
 
-def test_eeauditor_plugin_loader_named():
-    app = EEAuditor(name="test controller", search_path="./tests/test_modules")
+def test_eeauditor_plugin_loader_named(app):
     app.load_plugins(plugin_name="plugin1")
     for k, v in app.registry.checks["test"].items():
         assert k == "plugin_func_1"
 
 
-def test_eeauditor_plugin_run_checks():
-    app = EEAuditor(name="test controller", search_path="./tests/test_modules")
+def test_eeauditor_plugin_run_checks(app):
     # Since other tests are importing auditor modules that register checks in the
     # registry, it is possible checks other than those in the search_path will be
     # loaded and run here.  This statement clears the checks dictionary prior to
@@ -31,8 +60,87 @@ def test_eeauditor_plugin_run_checks():
         assert result == {"SchemaVersion": "2018-10-08", "Id": "test-finding"}
 
 
-def test_eeauditor_plugin_run_one_check():
-    app = EEAuditor(name="test controller", search_path="./tests/test_modules")
+def test_eeauditor_plugin_run_one_check(app):
     app.load_plugins(plugin_name="plugin1")
     for result in app.run_checks(requested_check_name="plugin_func_1"):
         assert result == {"SchemaVersion": "2018-10-08", "Id": "test-finding"}
+
+
+def test_eeauditor_plugin_run_checks_concurrently(app):
+    app.registry.checks.clear()
+    app.load_plugins()
+    results = list(app.run_checks(workers=4))
+    assert results == [{"SchemaVersion": "2018-10-08", "Id": "test-finding"}]
+
+
+def test_get_global_region():
+    assert get_global_region(["eu-west-1", "us-east-1"]) == "us-east-1"
+    assert get_global_region(["eu-west-1", "eu-central-1"]) == "eu-west-1"
+    assert get_global_region(["us-gov-east-1", "us-gov-west-1"]) == "us-gov-west-1"
+
+
+def test_eeauditor_plugin_loader_by_check(app):
+    app.registry.checks.clear()
+    app.load_plugins(check_name="plugin_func_1")
+    assert list(app.registry.checks["test"]) == ["plugin_func_1"]
+
+
+def test_eeauditor_plugin_run_checks_tracked(app):
+    app.registry.checks.clear()
+    app.load_plugins()
+    results = list(app.run_checks(track_checks=True))
+    assert results == [
+        (
+            "012345678901",
+            "us-east-1",
+            "plugin_func_1",
+            {"SchemaVersion": "2018-10-08", "Id": "test-finding"},
+        ),
+        ("012345678901", "us-east-1", "plugin_func_1", None),
+    ]
+
+
+def test_eeauditor_check_with_errors_not_completed(app):
+    app.registry.checks.clear()
+
+    def check_with_error(cache, awsAccountId, awsRegion, awsPartition):
+        report_error("Failed to describe resource-2")
+        yield {"SchemaVersion": "2018-10-08", "Id": "resource-1"}
+
+    app.registry.checks["test"] = {"check_with_error": check_with_error}
+    results = list(app.run_checks(track_checks=True))
+    # no completion event, the finding of resource-2 is not gone
+    assert [event.finding for event in results] == [
+        {"SchemaVersion": "2018-10-08", "Id": "resource-1"}
+    ]
+
+
+def test_eeauditor_audit_resource_twice_reads_fresh_responses():
+    app = EEAuditor(name="resource auditor", region="us-east-1", account_id="012345678901")
+    stubber = Stubber(ClientFactory.get_client("ec2"))
+    for state in ["attached", "detached"]:
+        stubber.add_response(
+            "describe_volumes",
+            {
+                "Volumes": [
+                    {
+                        "VolumeId": "vol-1",
+                        "Encrypted": True,
+                        "Attachments": [{"State": state, "DeleteOnTermination": True}],
+                    }
+                ]
+            },
+            {"Filters": [{"Name": "volume-id", "Values": ["vol-1"]}]},
+        )
+    with stubber:
+        statuses = [
+            {
+                finding["Compliance"]["Status"]
+                for finding in app.audit_resources(["vol-1"])
+                if finding["Id"].endswith("/ebs-volume-attachment-check")
+            }
+            for _ in range(2)
+        ]
+        stubber.assert_no_pending_responses()
+    app.source.cleanup()
+    assert statuses == [{"PASSED"}, {"FAILED"}]
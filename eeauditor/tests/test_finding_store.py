@@ -0,0 +1,102 @@
+import pytest
+
+from . import context
+from processor.finding_store import FindingStore
+
+
+def finding(status, observed_at):
+    return {
+        "Id": "arn:aws:ec2:us-east-1::snapshot/snap-0/ebs-snapshot-public-share-check",
+        "FirstObservedAt": observed_at,
+        "CreatedAt": observed_at,
+        "UpdatedAt": observed_at,
+        "Compliance": {"Status": status},
+    }
+
+
+@pytest.fixture(scope="function")
+def state_path(tmp_path):
+    return str(tmp_path / "findings.db")
+
+
+def run(state_path, findings, heartbeat=3600):
+    return list(FindingStore(path=state_path, heartbeat=heartbeat).changed(findings))
+
+
+def test_unchanged_findings_not_sent_again(state_path):
+    assert len(run(state_path, [finding("PASSED", "2020-01-01")])) == 1
+    assert run(state_path, [finding("PASSED", "2020-01-02")]) == []
+
+
+def test_changed_findings_keep_first_observation(state_path):
+    run(state_path, [finding("PASSED", "2020-01-01")])
+    sent = run(state_path, [finding("FAILED", "2020-01-02")])
+    assert sent[0]["FirstObservedAt"] == "2020-01-01"
+    assert sent[0]["CreatedAt"] == "2020-01-01"
+    assert sent[0]["UpdatedAt"] == "2020-01-02"
+
+
+def test_unchanged_findings_sent_on_heartbeat(state_path):
+    run(state_path, [finding("PASSED", "2020-01-01")])
+    sent = run(state_path, [finding("PASSED", "2020-01-02")], heartbeat=0)
+    assert sent[0]["FirstObservedAt"] == "2020-01-01"
+
+
+def test_unacknowledged_findings_sent_again(state_path):
+    store = FindingStore(path=state_path, acknowledged=True)
+    assert len(list(store.changed([finding("PASSED", "2020-01-01")]))) == 1
+    # the import failed, nothing was acknowledged
+    store = FindingStore(path=state_path, acknowledged=True)
+    sent = list(store.changed([finding("PASSED", "2020-01-02")]))
+    assert sent[0]["FirstObservedAt"] == "2020-01-01"
+    store.acknowledge(sent)
+    store = FindingStore(path=state_path, acknowledged=True)
+    assert list(store.changed([finding("PASSED", "2020-01-03")])) == []
+
+
+def events(check_name, finding_ids, completed=True):
+    for finding_id in finding_ids:
+        yield ("012345678901", "us-east-1", check_name, {"Id": finding_id, "ProductArn": "arn"})
+    if completed:
+        yield ("012345678901", "us-east-1", check_name, None)
+
+
+def tracked_run(state_path, *checks, archived=True):
+    store = FindingStore(path=state_path, only_changed=False)
+    sent = list(store.track(event for check in checks for event in check))
+    vanished = list(store.vanished())
+    if archived:
+        store.forget(vanished)
+    return sent, [finding["Id"] for finding in vanished]
+
+
+def test_findings_of_completed_checks_vanish(state_path):
+    tracked_run(state_path, events("check_a", ["a-1", "a-2"]), events("check_b", ["b-1"]))
+    sent, vanished = tracked_run(state_path, events("check_a", ["a-1"]), events("check_b", []))
+    assert [finding["Id"] for finding in sent] == ["a-1"]
+    assert vanished == ["a-2", "b-1"]
+    # vanished findings are forgotten once archived
+    assert tracked_run(state_path, events("check_a", ["a-1"]))[1] == []
+
+
+def test_vanished_findings_kept_until_archived(state_path):
+    tracked_run(state_path, events("check_a", ["a-1", "a-2"]))
+    assert tracked_run(state_path, events("check_a", ["a-1"]), archived=False)[1] == ["a-2"]
+    assert tracked_run(state_path, events("check_a", ["a-1"]))[1] == ["a-2"]
+    assert tracked_run(state_path, events("check_a", ["a-1"]))[1] == []
+
+
+def test_findings_of_failed_checks_kept(state_path):
+    tracked_run(state_path, events("check_a", ["a-1", "a-2"]))
+    assert tracked_run(state_path, events("check_a", ["a-1"], completed=False))[1] == []
+
+
+def test_findings_filtered_without_scope_keep_it(state_path):
+    tracked_run(state_path, events("check_a", ["a-1", "a-2"]))
+    # a-1 changed and a-2 is unchanged, neither comes with a scope
+    store = FindingStore(path=state_path)
+    sent = list(
+        store.changed([{"Id": "a-1", "ProductArn": "other"}, {"Id": "a-2", "ProductArn": "arn"}])
+    )
+    assert [finding["Id"] for finding in sent] == ["a-1"]
+    assert sorted(tracked_run(state_path, events("check_a", []))[1]) == ["a-1", "a-2"]
@@ -0,0 +1,237 @@
+import datetime
+
+import pytest
+from botocore.stub import Stubber
+
+from . import context
+from client_factory import ClientFactory
+from iam_snapshot import (
+    IamSnapshot,
+    build_iam_snapshot,
+    get_credential_report,
+    parse_credential_report,
+)
+from inventory import Inventory
+from auditors.aws.AWS_IAM_Auditor import (
+    iam_access_key_age_check,
+    user_direct_attached_policy_check,
+    user_mfa_check,
+)
+
+credential_report = (
+    b"user,arn,user_creation_time,mfa_active,access_key_1_active,access_key_1_last_rotated,"
+    b"access_key_1_last_used_date,access_key_2_active,access_key_2_last_rotated,"
+    b"access_key_2_last_used_date\n"
+    b"<root_account>,arn:aws:iam::012345678901:root,2019-01-01T00:00:00+00:00,true,"
+    b"false,N/A,N/A,false,N/A,N/A\n"
+    b"alice,arn:aws:iam::012345678901:user/alice,2019-01-01T00:00:00+00:00,true,"
+    b"true,2019-01-01T00:00:00+00:00,N/A,false,N/A,N/A\n"
+    b"bob,arn:aws:iam::012345678901:user/bob,2019-01-01T00:00:00+00:00,false,"
+    b"false,2019-01-01T00:00:00+00:00,no_information,true,NOW,N/A\n"
+)
+
+created = datetime.datetime(2019, 1, 1, tzinfo=datetime.timezone.utc)
+
+user_details = [
+    {
+        "UserName": "alice",
+        "UserId": "AIDAALICE0000000001",
+        "Arn": "arn:aws:iam::012345678901:user/alice",
+        "CreateDate": created,
+        "UserPolicyList": [],
+        "AttachedManagedPolicies": [],
+    },
+    {
+        "UserName": "bob",
+        "UserId": "AIDABOB00000000001",
+        "Arn": "arn:aws:iam::012345678901:user/bob",
+        "CreateDate": created,
+        "UserPolicyList": [],
+        "AttachedManagedPolicies": [
+            {"PolicyName": "ReadOnlyAccess", "PolicyArn": "arn:aws:iam::aws:policy/ReadOnlyAccess"}
+        ],
+    },
+]
+
+
+def now():
+    return datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+
+
+def report_content(generated_time):
+    return credential_report.replace(b"NOW", generated_time.isoformat().encode())
+
+
+def access_keys(user_name, *keys):
+    return {
+        "AccessKeyMetadata": [
+            {"UserName": user_name, "AccessKeyId": key_id, "Status": status, "CreateDate": date}
+            for key_id, status, date in keys
+        ]
+    }
+
+
+def run_check(check, cache):
+    return list(
+        check(cache=cache, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws")
+    )
+
+
+@pytest.fixture(scope="function")
+def iam_stubber():
+    Inventory.clear()
+    iam_stubber = Stubber(ClientFactory.get_client("iam"))
+    iam_stubber.activate()
+    yield iam_stubber
+    iam_stubber.deactivate()
+    Inventory.clear()
+
+
+def stub_credential_report(iam_stubber, generated_time):
+    iam_stubber.add_response("generate_credential_report", {"State": "COMPLETE"})
+    iam_stubber.add_response(
+        "get_credential_report",
+        {
+            "Content": report_content(generated_time),
+            "ReportFormat": "text/csv",
+            "GeneratedTime": generated_time,
+        },
+    )
+
+
+def stub_access_keys(iam_stubber, generated_time):
+    iam_stubber.add_response(
+        "list_access_keys",
+        access_keys("alice", ("AKIAALICE0000000001", "Active", created)),
+        {"UserName": "alice"},
+    )
+    iam_stubber.add_response(
+        "list_access_keys",
+        access_keys(
+            "bob",
+            ("AKIABOB00000000001", "Inactive", created),
+            ("AKIABOB00000000002", "Active", generated_time),
+        ),
+        {"UserName": "bob"},
+    )
+
+
+def test_parse_credential_report():
+    rows = list(parse_credential_report(credential_report))
+    assert [row["user"] for row in rows] == ["<root_account>", "alice", "bob"]
+    assert rows[1]["mfa_active"] is True
+    assert rows[1]["access_key_1_last_rotated"] == datetime.datetime(
+        2019, 1, 1, tzinfo=datetime.timezone.utc
+    )
+    assert rows[2]["access_key_1_last_used_date"] is None
+
+
+def test_snapshot_access_keys_and_mfa(iam_stubber):
+    generated_time = now()
+    stub_access_keys(iam_stubber, generated_time)
+    snapshot = IamSnapshot(
+        user_details,
+        parse_credential_report(report_content(generated_time)),
+        generated_time=generated_time,
+        client=ClientFactory.get_client("iam"),
+        workers=1,
+    )
+    assert [(key["AccessKeyId"], key["Slot"]) for key in snapshot.access_keys("alice")] == [
+        ("AKIAALICE0000000001", 1)
+    ]
+    assert [(key["AccessKeyId"], key["Slot"]) for key in snapshot.access_keys("bob")] == [
+        ("AKIABOB00000000001", 1),
+        ("AKIABOB00000000002", 2),
+    ]
+    assert snapshot.mfa_active("alice")
+    assert not snapshot.mfa_active("bob")
+    iam_stubber.assert_no_pending_responses()
+
+
+def test_snapshot_looks_up_users_newer_than_the_report(iam_stubber):
+    generated_time = now() - datetime.timedelta(hours=1)
+    carol = {
+        "UserName": "carol",
+        "UserId": "AIDACAROL0000000001",
+        "Arn": "arn:aws:iam::012345678901:user/carol",
+        "CreateDate": now(),
+    }
+    # bob was deleted and created again since the report, its row is about the old user
+    new_bob = dict(user_details[1], CreateDate=now())
+    key_date = now()
+    iam_stubber.add_response(
+        "list_access_keys",
+        access_keys("bob", ("AKIABOB00000000003", "Active", key_date)),
+        {"UserName": "bob"},
+    )
+    iam_stubber.add_response(
+        "list_access_keys",
+        access_keys("carol", ("AKIACAROL0000000001", "Active", key_date)),
+        {"UserName": "carol"},
+    )
+    iam_stubber.add_response(
+        "list_mfa_devices",
+        {
+            "MFADevices": [
+                {
+                    "UserName": "bob",
+                    "SerialNumber": "arn:aws:iam::012345678901:mfa/bob",
+                    "EnableDate": key_date,
+                }
+            ]
+        },
+        {"UserName": "bob"},
+    )
+    iam_stubber.add_response("list_mfa_devices", {"MFADevices": []}, {"UserName": "carol"})
+    snapshot = IamSnapshot(
+        [new_bob, carol],
+        parse_credential_report(report_content(generated_time)),
+        generated_time=generated_time,
+        client=ClientFactory.get_client("iam"),
+        workers=1,
+    )
+    assert [(key["Slot"], key["LastRotated"]) for key in snapshot.access_keys("bob")] == [
+        (None, key_date)
+    ]
+    assert [key["AccessKeyId"] for key in snapshot.access_keys("carol")] == ["AKIACAROL0000000001"]
+    assert snapshot.mfa_active("bob")
+    assert not snapshot.mfa_active("carol")
+    iam_stubber.assert_no_pending_responses()
+
+
+def test_credential_report_waits_for_generation(iam_stubber):
+    iam_stubber.add_response("generate_credential_report", {"State": "STARTED"})
+    iam_stubber.add_response("generate_credential_report", {"State": "COMPLETE"})
+    iam_stubber.add_response(
+        "get_credential_report", {"Content": credential_report, "ReportFormat": "text/csv"}
+    )
+    report = get_credential_report(ClientFactory.get_client("iam"), poll_seconds=0)
+    assert report["Content"] == credential_report
+    iam_stubber.assert_no_pending_responses()
+
+
+def test_user_checks_make_no_calls_per_user(iam_stubber):
+    generated_time = now()
+    iam_stubber.add_response(
+        "get_account_authorization_details",
+        {"UserDetailList": user_details, "IsTruncated": False},
+        {"Filter": ["User"]},
+    )
+    stub_credential_report(iam_stubber, generated_time)
+    stub_access_keys(iam_stubber, generated_time)
+    # checks sharing a cache share the snapshot, the user details come from the inventory
+    cache = {"iam_snapshot": build_iam_snapshot(workers=1)}
+    findings = run_check(iam_access_key_age_check, cache)
+    # only active keys are evaluated, alice's key is old and bob's second key is new
+    assert [(finding["Id"], finding["Compliance"]["Status"]) for finding in findings] == [
+        ("aliceAKIAALICE0000000001/iam-access-key-age-check", "FAILED"),
+        ("bobAKIABOB00000000002/iam-access-key-age-check", "PASSED"),
+    ]
+    assert findings[0]["Resources"][0]["Details"]["AwsIamAccessKey"]["PrincipalId"] == (
+        "AKIAALICE0000000001"
+    )
+    mfa = run_check(user_mfa_check, cache)
+    attached = run_check(user_direct_attached_policy_check, cache)
+    assert [finding["Compliance"]["Status"] for finding in mfa] == ["PASSED", "FAILED"]
+    assert [finding["Compliance"]["Status"] for finding in attached] == ["PASSED", "FAILED"]
+    iam_stubber.assert_no_pending_responses()
@@ -0,0 +1,99 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+from botocore.stub import Stubber
+
+from . import context
+from check_register import iterate_paged_results
+from client_factory import ClientFactory
+from inventory import Inventory
+
+describe_volumes_response = {
+    "Volumes": [{"VolumeId": "vol-1", "State": "in-use"}],
+}
+
+
+@pytest.fixture(scope="function")
+def ec2_stubber():
+    Inventory.clear()
+    ec2_stubber = Stubber(ClientFactory.get_client("ec2"))
+    ec2_stubber.activate()
+    yield ec2_stubber
+    ec2_stubber.deactivate()
+    Inventory.clear()
+
+
+def test_inventory_fetches_once(ec2_stubber):
+    ec2_stubber.add_response("describe_volumes", describe_volumes_response)
+    inventory = Inventory()
+    first = inventory.get("ec2", "describe_volumes")
+    second = Inventory().get("ec2", "describe_volumes")
+    assert first["Volumes"] == describe_volumes_response["Volumes"]
+    assert second is first
+    ec2_stubber.assert_no_pending_responses()
+
+
+def test_inventory_follows_pages(ec2_stubber):
+    ec2_stubber.add_response(
+        "describe_volumes", {"Volumes": [{"VolumeId": "vol-1"}], "NextToken": "page-2"}
+    )
+    ec2_stubber.add_response(
+        "describe_volumes", {"Volumes": [{"VolumeId": "vol-2"}]}, {"NextToken": "page-2"}
+    )
+    response = Inventory().get("ec2", "describe_volumes")
+    assert [volume["VolumeId"] for volume in response["Volumes"]] == ["vol-1", "vol-2"]
+
+
+def test_inventory_single_flight(ec2_stubber):
+    # only one response is stubbed, a second call to AWS would fail the stubber
+    ec2_stubber.add_response("describe_volumes", describe_volumes_response)
+    barrier = threading.Barrier(8)
+
+    def fetch(_):
+        barrier.wait()
+        return Inventory().get("ec2", "describe_volumes")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(fetch, range(8)))
+    assert all(response is responses[0] for response in responses)
+
+
+def test_inventory_does_not_cache_errors(ec2_stubber):
+    ec2_stubber.add_client_error("describe_volumes", "UnauthorizedOperation")
+    ec2_stubber.add_response("describe_volumes", describe_volumes_response)
+    with pytest.raises(Exception):
+        Inventory().get("ec2", "describe_volumes")
+    assert Inventory().get("ec2", "describe_volumes")["Volumes"]
+
+
+def test_inventory_paginate_streams_pages(ec2_stubber):
+    ec2_stubber.add_response(
+        "describe_snapshots", {"Snapshots": [{"SnapshotId": "snap-1"}], "NextToken": "page-2"}
+    )
+    ec2_stubber.add_response(
+        "describe_snapshots", {"Snapshots": [{"SnapshotId": "snap-2"}]}, {"NextToken": "page-2"}
+    )
+    snapshots = Inventory().paginate("ec2", "describe_snapshots", "Snapshots")
+    assert [snapshot["SnapshotId"] for snapshot in snapshots] == ["snap-1", "snap-2"]
+
+
+def test_iterate_paged_results_prefetch_raises_errors():
+    def pages():
+        yield {"Items": [1, 2]}
+        raise ValueError("page failed")
+
+    results = iterate_paged_results(page_iterator=pages(), key="Items", prefetch=2)
+    assert next(results) == 1
+    assert next(results) == 2
+    with pytest.raises(ValueError):
+        next(results)
+
+
+def test_inventory_restrict(ec2_stubber):
+    volume_filter = {"Filters": [{"Name": "volume-id", "Values": ["vol-1"]}]}
+    ec2_stubber.add_response("describe_volumes", describe_volumes_response, volume_filter)
+    Inventory.restrict({("ec2", "describe_volumes"): volume_filter})
+    response = Inventory().get("ec2", "describe_volumes")
+    assert response["Volumes"] == describe_volumes_response["Volumes"]
+    ec2_stubber.assert_no_pending_responses()
@@ -0,0 +1,69 @@
+import datetime
+
+import pytest
+from botocore.stub import ANY, Stubber
+
+from . import context
+from client_factory import ClientFactory
+from metric_data import MetricData
+
+now = datetime.datetime(2020, 1, 2, tzinfo=datetime.timezone.utc)
+yesterday = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture(scope="function")
+def cloudwatch_stubber():
+    cloudwatch_stubber = Stubber(ClientFactory.get_client("cloudwatch"))
+    cloudwatch_stubber.activate()
+    yield cloudwatch_stubber
+    cloudwatch_stubber.deactivate()
+
+
+def add_functions(metric_data, count):
+    return [
+        metric_data.add(
+            namespace="AWS/Lambda",
+            metric_name="Invocations",
+            dimensions=[{"Name": "FunctionName", "Value": f"function-{index}"}],
+            period=86400,
+            stat="Sum",
+        )
+        for index in range(count)
+    ]
+
+
+def test_queries_packed_into_full_batches(cloudwatch_stubber):
+    metric_data = MetricData(start_time=yesterday, end_time=now)
+    query_ids = add_functions(metric_data, 1001)
+    for batch in [query_ids[:500], query_ids[500:1000], query_ids[1000:]]:
+        cloudwatch_stubber.add_response(
+            "get_metric_data",
+            {"MetricDataResults": [{"Id": batch[0], "Values": [1.0], "Timestamps": [now]}]},
+            {"MetricDataQueries": ANY, "StartTime": yesterday, "EndTime": now},
+        )
+    results = metric_data.fetch()
+    cloudwatch_stubber.assert_no_pending_responses()
+    assert len(results) == 1001
+    assert results["m1"]["Values"] == [1.0]
+    assert results["m501"]["Values"] == [1.0]
+    assert results["m2"]["Values"] == []
+
+
+def test_pages_of_a_query_merged(cloudwatch_stubber):
+    metric_data = MetricData(start_time=yesterday, end_time=now)
+    query_id = add_functions(metric_data, 1)[0]
+    cloudwatch_stubber.add_response(
+        "get_metric_data",
+        {
+            "MetricDataResults": [{"Id": query_id, "Values": [1.0], "StatusCode": "PartialData"}],
+            "NextToken": "page-2",
+        },
+    )
+    cloudwatch_stubber.add_response(
+        "get_metric_data",
+        {"MetricDataResults": [{"Id": query_id, "Values": [2.0], "StatusCode": "Complete"}]},
+        {"MetricDataQueries": ANY, "StartTime": ANY, "EndTime": ANY, "NextToken": "page-2"},
+    )
+    result = metric_data.fetch()[query_id]
+    assert result["Values"] == [1.0, 2.0]
+    assert result["StatusCode"] == "Complete"
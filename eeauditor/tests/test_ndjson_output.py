@@ -0,0 +1,49 @@
+import gzip
+import json
+
+import pytest
+
+from . import context
+from processor.outputs.ndjson import NdjsonProvider, NdjsonWriter
+
+
+def findings(count):
+    return (
+        {"Id": f"finding-{index}", "Compliance": {"Status": "PASSED"}} for index in range(count)
+    )
+
+
+def test_files_rotated_by_count(tmp_path):
+    writer = NdjsonWriter(str(tmp_path / "output"), compression="gzip", max_findings=2)
+    for finding in findings(5):
+        writer.write(finding)
+    writer.close()
+    assert [path.rsplit("/", 1)[1] for path in writer.files] == [
+        "output-00001.ndjson.gz",
+        "output-00002.ndjson.gz",
+        "output-00003.ndjson.gz",
+    ]
+    with gzip.open(writer.files[2], "rt") as last:
+        assert [json.loads(line)["Id"] for line in last] == ["finding-4"]
+
+
+def test_files_rotated_by_size(tmp_path):
+    writer = NdjsonWriter(str(tmp_path / "output"), max_bytes=110)
+    for finding in findings(4):
+        writer.write(finding)
+    writer.close()
+    assert len(writer.files) == 2
+    assert all(len(open(path, "rb").read()) <= 110 for path in writer.files)
+
+
+def test_provider_writes_one_finding_per_line(tmp_path, monkeypatch):
+    monkeypatch.delenv("NDJSON_COMPRESSION", raising=False)
+    NdjsonProvider().write_findings(findings(3), output_file=str(tmp_path / "output"))
+    with open(tmp_path / "output.ndjson") as output:
+        lines = output.read().splitlines()
+    assert [json.loads(line)["Id"] for line in lines] == ["finding-0", "finding-1", "finding-2"]
+
+
+def test_unknown_compression_refused(tmp_path):
+    with pytest.raises(ValueError):
+        NdjsonWriter(str(tmp_path / "output"), compression="bzip2")
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from . import context
+from processor.main import process_findings
+from processor.outputs.output_base import ElectricEyeOutput
+
+written = {}
+first_written = threading.Event()
+
+
+@ElectricEyeOutput
+class RecordingProvider(object):
+    __provider__ = "test-recording"
+
+    def write_findings(self, findings, **kwargs):
+        for finding in findings:
+            written.setdefault(self.__provider__, []).append(finding)
+            if finding["Id"] == "finding-0":
+                first_written.set()
+
+
+@ElectricEyeOutput
+class FailingProvider(object):
+    __provider__ = "test-failing"
+
+    def write_findings(self, findings, **kwargs):
+        next(iter(findings))
+        raise ValueError("output unavailable")
+
+
+@pytest.fixture(scope="function", autouse=True)
+def reset():
+    written.clear()
+    first_written.clear()
+    yield
+
+
+def audit(count):
+    for index in range(count):
+        yield {"Id": f"finding-{index}"}
+        if index == 0:
+            # the audit is still running when the first finding reaches the output
+            assert first_written.wait(timeout=5)
+
+
+def test_findings_written_while_audit_runs():
+    process_findings(findings=audit(3), outputs=["test-recording"])
+    assert [finding["Id"] for finding in written["test-recording"]] == [
+        "finding-0",
+        "finding-1",
+        "finding-2",
+    ]
+
+
+def test_failed_output_does_not_block_others():
+    process_findings(
+        findings=audit(50), outputs=["test-failing", "missing", "test-recording"], queue_size=2
+    )
+    assert len(written["test-recording"]) == 50
@@ -0,0 +1,82 @@
+import boto3
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from . import context
+from rate_limiter import MIN_RATE, RateLimiter, TokenBucket, get_quota
+
+
+class RawResponse(object):
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+
+def test_get_quota_falls_back_to_service_then_default():
+    assert get_quota("iam", "GetAccountAuthorizationDetails") == (2, 5)
+    assert get_quota("iam", "ListUsers") == (15, 30)
+    assert get_quota("kinesis", "ListStreams") == (25, 50)
+
+
+def test_bucket_backs_off_and_recovers():
+    bucket = TokenBucket(10, 10)
+    bucket.throttled()
+    assert bucket.rate == 5
+    assert bucket.tokens == 0
+    for _ in range(100):
+        bucket.succeeded()
+    # never past the quota it started from
+    assert bucket.rate == 10
+    for _ in range(100):
+        bucket.throttled()
+    assert bucket.rate == MIN_RATE
+
+
+def test_operations_share_their_service_quota():
+    RateLimiter.clear()
+    limiter = RateLimiter()
+    describe_load_balancers, describe_listeners = (
+        limiter.get_bucket("elasticloadbalancing", operation_name, "us-east-1", None)
+        for operation_name in ["DescribeLoadBalancers", "DescribeListeners"]
+    )
+    assert describe_load_balancers is describe_listeners
+    assert describe_listeners.initial_rate == 10
+    # an operation with a quota of its own does not take from its service's
+    bucket = limiter.get_bucket("iam", "GetAccountAuthorizationDetails", "us-east-1", None)
+    assert bucket is not limiter.get_bucket("iam", "ListUsers", "us-east-1", None)
+    assert bucket.initial_rate == 2
+
+
+def test_throttled_response_slows_its_bucket():
+    RateLimiter.clear()
+    session = boto3.session.Session(
+        aws_access_key_id="AKIA", aws_secret_access_key="secret", region_name="us-east-1"
+    )
+    client = session.client("iam", config=Config(retries={"max_attempts": 0}))
+    credentials = session.get_credentials()
+    limiter = RateLimiter()
+    limiter.register(client, "us-east-1", credentials)
+    responses = [
+        (
+            200,
+            b"<ListUsersResponse><ListUsersResult><Users/></ListUsersResult></ListUsersResponse>",
+        ),
+        (400, b"<ErrorResponse><Error><Code>Throttling</Code></Error></ErrorResponse>"),
+    ]
+
+    # answers in place of the HTTP layer, after the limiter has taken its token
+    def send(request, **kwargs):
+        status_code, body = responses.pop(0)
+        return AWSResponse(request.url, status_code, {}, RawResponse(body))
+
+    client.meta.events.register("before-send", send)
+    client.list_users()
+    with pytest.raises(ClientError):
+        client.list_users()
+    bucket = limiter.get_bucket("iam", "ListUsers", "us-east-1", credentials)
+    # the successful call left the rate at its quota, the throttle then halved it
+    assert bucket.rate == 15 * 0.5
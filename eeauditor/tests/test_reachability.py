@@ -0,0 +1,133 @@
+from . import context
+from reachability import (
+    BLOCKED_BY_NACL,
+    INTERNET_REACHABLE,
+    NO_INTERNET_ROUTE,
+    NO_PUBLIC_ADDRESS,
+    NOT_OPEN,
+    UNATTACHED,
+    NetworkReachability,
+)
+from security_group_rules import SecurityGroupRuleIndex
+
+security_groups = [
+    {
+        "GroupName": "web",
+        "GroupId": "sg-web",
+        "IpPermissions": [
+            {
+                "IpProtocol": "tcp",
+                "FromPort": 22,
+                "ToPort": 22,
+                "IpRanges": [{"CidrIp": "0.0.0.0/0"}],
+            }
+        ],
+    },
+    {"GroupName": "unused", "GroupId": "sg-unused", "IpPermissions": []},
+]
+
+
+def interface(eni_id, subnet_id, public_ip=None, instance_id=None):
+    eni = {
+        "NetworkInterfaceId": eni_id,
+        "SubnetId": subnet_id,
+        "VpcId": "vpc-1",
+        "PrivateIpAddress": f"10.0.0.{len(eni_id)}",
+        "PrivateIpAddresses": [{"PrivateIpAddress": f"10.0.0.{len(eni_id)}"}],
+        "Groups": [{"GroupId": "sg-web"}],
+    }
+    if public_ip:
+        eni["Association"] = {"PublicIp": public_ip}
+    if instance_id:
+        eni["Attachment"] = {"InstanceId": instance_id}
+    return eni
+
+
+def network_acl(subnet_id, action, cidr="0.0.0.0/0"):
+    return {
+        "Associations": [{"SubnetId": subnet_id}],
+        "Entries": [
+            {
+                "Egress": False,
+                "RuleNumber": 100,
+                "Protocol": "6",
+                "PortRange": {"From": 22, "To": 22},
+                "CidrBlock": cidr,
+                "RuleAction": action,
+            },
+            {
+                "Egress": False,
+                "RuleNumber": 32767,
+                "Protocol": "-1",
+                "CidrBlock": "0.0.0.0/0",
+                "RuleAction": "deny",
+            },
+        ],
+    }
+
+
+def build_graph():
+    rule_index = SecurityGroupRuleIndex(security_groups)
+    graph = NetworkReachability(
+        network_interfaces=[
+            interface("eni-public", "subnet-public", "203.0.113.10", "i-1"),
+            interface("eni-private", "subnet-private"),
+            interface("eni-norte", "subnet-private", "203.0.113.11"),
+            interface("eni-nacl", "subnet-nacl", "203.0.113.12"),
+            interface("eni-internal", "subnet-internal", "203.0.113.13"),
+        ],
+        route_tables=[
+            {
+                "VpcId": "vpc-1",
+                "Associations": [
+                    {"SubnetId": "subnet-public"},
+                    {"SubnetId": "subnet-nacl"},
+                    {"SubnetId": "subnet-internal"},
+                ],
+                "Routes": [
+                    {"DestinationCidrBlock": "0.0.0.0/0", "GatewayId": "igw-1", "State": "active"}
+                ],
+            },
+            {"VpcId": "vpc-1", "Associations": [{"Main": True}], "Routes": []},
+        ],
+        internet_gateways=[
+            {
+                "InternetGatewayId": "igw-1",
+                "Attachments": [{"VpcId": "vpc-1", "State": "available"}],
+            }
+        ],
+        network_acls=[
+            network_acl("subnet-public", "allow"),
+            network_acl("subnet-nacl", "deny"),
+            # only lets in traffic from private addresses
+            network_acl("subnet-internal", "allow", cidr="10.0.0.0/8"),
+        ],
+        rule_index=rule_index,
+    )
+    rule_index.reachability = graph
+    return graph
+
+
+def test_interface_exposure_levels():
+    graph = build_graph()
+    assert graph.interface_exposure("eni-public", 22, 22) == INTERNET_REACHABLE
+    assert graph.interface_exposure("eni-public", 80, 80) == NOT_OPEN
+    assert graph.interface_exposure("eni-private", 22, 22) == NO_PUBLIC_ADDRESS
+    assert graph.interface_exposure("eni-norte", 22, 22) == NO_INTERNET_ROUTE
+    assert graph.interface_exposure("eni-nacl", 22, 22) == BLOCKED_BY_NACL
+    assert graph.interface_exposure("eni-internal", 22, 22) == BLOCKED_BY_NACL
+
+
+def test_group_and_instance_exposure():
+    graph = build_graph()
+    assert graph.group_exposure("sg-web", 22, 22) == INTERNET_REACHABLE
+    assert graph.group_exposure("sg-unused", 22, 22) == UNATTACHED
+    assert graph.instance_exposure("i-1", 22, 22) == INTERNET_REACHABLE
+    assert graph.rule_index.exposures(22, 22)[0]["Reachability"] == INTERNET_REACHABLE
+
+
+def test_find_interface_by_address():
+    graph = build_graph()
+    assert graph.find_interface("203.0.113.12") == "eni-nacl"
+    assert graph.find_interface("10.0.0.11") == "eni-private"
+    assert graph.find_interface("198.51.100.1") is None
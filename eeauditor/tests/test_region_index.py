@@ -0,0 +1,41 @@
+import json
+import time
+
+from . import context
+from region_index import RegionIndex
+
+
+def test_botocore_source_regional_service():
+    index = RegionIndex(source="botocore")
+    assert index.is_supported("ec2", "us-east-1")
+    assert not index.is_supported("managedblockchain", "sa-east-1")
+
+
+def test_botocore_source_unknown_and_global_services():
+    index = RegionIndex(source="botocore")
+    assert index.is_supported("shodan", "us-east-1")
+    assert index.is_supported("iam", "eu-west-1")
+
+
+def test_botocore_source_services_missing_from_partition():
+    index = RegionIndex(partition="aws-us-gov", source="botocore")
+    assert index.is_supported("ec2", "us-gov-west-1")
+    assert index.is_supported("iam", "us-gov-west-1")
+    assert not index.is_supported("appmesh", "us-gov-west-1")
+    assert not index.is_supported("shield", "us-gov-west-1")
+
+
+def test_ssm_source_reads_fresh_cache(tmp_path):
+    cache_file = tmp_path / "region-index.json"
+    cache_file.write_text(
+        json.dumps(
+            {
+                "fetched_at": time.time(),
+                "regions": {"global": ["ec2", "qldb"], "eu-west-1": ["ec2"]},
+            }
+        )
+    )
+    index = RegionIndex(source="ssm", cache_file=str(cache_file))
+    assert index.is_supported("ec2", "eu-west-1")
+    assert not index.is_supported("qldb", "eu-west-1")
+    assert index.is_supported("shodan", "eu-west-1")
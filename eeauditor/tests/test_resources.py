@@ -0,0 +1,44 @@
+from . import context
+from resources import get_resource_filters, parse_resource
+
+
+def test_parse_resource():
+    assert parse_resource("arn:aws:ec2:us-east-1:111111111111:security-group/sg-1") == (
+        "ec2",
+        "us-east-1",
+        "111111111111",
+        "security-group",
+        "sg-1",
+    )
+    assert parse_resource("i-0123") == ("ec2", None, None, "instance", "i-0123")
+    assert parse_resource("arn:aws:rds:us-east-1:111111111111:db:database-1")[3:] == (
+        "db",
+        "database-1",
+    )
+    assert parse_resource(
+        "arn:aws:elasticloadbalancing:us-east-1:111111111111:loadbalancer/classic"
+    )[3:] == ("loadbalancer", "classic")
+    alb = (
+        "arn:aws:elasticloadbalancing:us-east-1:111111111111:loadbalancer/app/web/50dc6c495c0c9188"
+    )
+    assert parse_resource(alb)[3:] == ("loadbalancer/app", alb)
+
+
+def test_get_resource_filters():
+    filters = get_resource_filters(
+        [
+            "sg-1",
+            "arn:aws:ec2:us-east-1:111111111111:security-group/sg-2",
+            # another region, skipped
+            "arn:aws:ec2:eu-west-1:111111111111:security-group/sg-3",
+            # no filter known, skipped
+            "arn:aws:sqs:us-east-1:111111111111:queue",
+        ],
+        region="us-east-1",
+        account_id="111111111111",
+    )
+    assert filters == {
+        ("ec2", "describe_security_groups"): {
+            "Filters": [{"Name": "group-id", "Values": ["sg-1", "sg-2"]}]
+        }
+    }
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from . import context
+from client_factory import ClientFactory
+from s3_snapshot import BucketSnapshot
+
+
+@pytest.fixture(scope="function")
+def s3_stubbers():
+    stubbers = {
+        region_name: Stubber(ClientFactory.get_client("s3", region_name=region_name))
+        for region_name in ["us-east-1", "eu-west-1"]
+    }
+    for stubber in stubbers.values():
+        stubber.activate()
+    yield stubbers
+    for stubber in stubbers.values():
+        stubber.deactivate()
+
+
+def test_buckets_read_from_their_region(s3_stubbers):
+    global_stubber, eu_stubber = s3_stubbers["us-east-1"], s3_stubbers["eu-west-1"]
+    global_stubber.add_response(
+        "get_bucket_location", {"LocationConstraint": "EU"}, {"Bucket": "old-eu-bucket"}
+    )
+    eu_stubber.add_response(
+        "get_bucket_versioning", {"Status": "Enabled"}, {"Bucket": "old-eu-bucket"}
+    )
+    eu_stubber.add_client_error(
+        "get_bucket_logging", "AccessDenied", expected_params={"Bucket": "old-eu-bucket"}
+    )
+    snapshot = BucketSnapshot(
+        [{"Name": "old-eu-bucket"}],
+        operations=["get_bucket_versioning", "get_bucket_logging"],
+        workers=1,
+    )
+    assert snapshot.get("old-eu-bucket", "get_bucket_versioning")["Status"] == "Enabled"
+    # errors are handed to the checks as if they had made the call
+    with pytest.raises(ClientError, match="AccessDenied"):
+        snapshot.get("old-eu-bucket", "get_bucket_logging")
+    global_stubber.assert_no_pending_responses()
+    eu_stubber.assert_no_pending_responses()
+
+
+def test_slow_bucket_gives_up_remaining_calls(s3_stubbers):
+    # with no time allowed, no call is made
+    snapshot = BucketSnapshot(
+        [{"Name": "slow-bucket"}],
+        operations=["get_bucket_versioning"],
+        workers=1,
+        timeout=-1,
+    )
+    with pytest.raises(TimeoutError):
+        snapshot.get("slow-bucket", "get_bucket_versioning")
+
+
+def test_hung_call_bounded_by_bucket_timeout(s3_stubbers, monkeypatch):
+    global_stubber = s3_stubbers["us-east-1"]
+    global_stubber.add_response("get_bucket_location", {}, {"Bucket": "hung-bucket"})
+    monkeypatch.setattr(
+        ClientFactory.get_client("s3", region_name="us-east-1"),
+        "get_bucket_versioning",
+        lambda **kwargs: time.sleep(2),
+    )
+    started = time.monotonic()
+    snapshot = BucketSnapshot(
+        [{"Name": "hung-bucket"}],
+        operations=["get_bucket_versioning", "get_bucket_logging"],
+        workers=1,
+        timeout=0.5,
+    )
+    assert time.monotonic() - started < 1.5
+    for operation in ["get_bucket_versioning", "get_bucket_logging"]:
+        with pytest.raises(TimeoutError):
+            snapshot.get("hung-bucket", operation)
@@ -0,0 +1,143 @@
+import pytest
+from botocore.stub import ANY, Stubber
+
+from . import context
+from client_factory import ClientFactory
+from processor.outputs.sechub import (
+    MAX_BATCH_BYTES,
+    MAX_BATCH_FINDINGS,
+    FindingImporter,
+    archive_findings,
+    pack_batches,
+)
+
+
+@pytest.fixture(scope="function")
+def securityhub_stubber():
+    securityhub_stubber = Stubber(ClientFactory.get_client("securityhub"))
+    securityhub_stubber.activate()
+    yield securityhub_stubber
+    securityhub_stubber.deactivate()
+
+
+def findings(count, description="description"):
+    for index in range(count):
+        yield {
+            "SchemaVersion": "2018-10-08",
+            "Id": f"finding-{index}",
+            "ProductArn": "arn:aws:securityhub:us-east-1:012345678901:product/012345678901/default",
+            "GeneratorId": f"finding-{index}",
+            "AwsAccountId": "012345678901",
+            "CreatedAt": "2020-01-01T00:00:00+00:00",
+            "UpdatedAt": "2020-01-01T00:00:00+00:00",
+            "Title": "title",
+            "Description": description,
+            "Resources": [{"Type": "Other", "Id": f"resource-{index}"}],
+        }
+
+
+def test_batches_packed_by_count_and_size():
+    assert [len(batch) for batch in pack_batches(findings(250))] == [100, 100, 50]
+    # findings of 100 KB, fewer than MAX_BATCH_FINDINGS fit under MAX_BATCH_BYTES
+    large = list(pack_batches(findings(120, description="x" * 100 * 1024)))
+    assert all(sum(size for finding, size in batch) <= MAX_BATCH_BYTES for batch in large)
+    assert len(large[0]) < MAX_BATCH_FINDINGS
+    assert sum(len(batch) for batch in large) == 120
+    too_large = list(pack_batches(findings(1, description="x" * 300 * 1024)))
+    assert too_large == [[(too_large[0][0][0], None)]]
+
+
+def test_failed_findings_retried(securityhub_stubber):
+    batch = list(findings(3))
+    securityhub_stubber.add_response(
+        "batch_import_findings",
+        {
+            "FailedCount": 2,
+            "SuccessCount": 1,
+            "FailedFindings": [
+                {"Id": "finding-1", "ErrorCode": "ThrottlingException", "ErrorMessage": "Slow"},
+                {"Id": "finding-2", "ErrorCode": "InvalidInput", "ErrorMessage": "Bad"},
+            ],
+        },
+        {"Findings": batch},
+    )
+    securityhub_stubber.add_response(
+        "batch_import_findings",
+        {"FailedCount": 0, "SuccessCount": 1, "FailedFindings": []},
+        {"Findings": [batch[1]]},
+    )
+    imported = []
+    importer = FindingImporter(workers=1, base_delay=0, on_imported=imported.extend)
+    result = importer.import_findings(iter(batch))
+    securityhub_stubber.assert_no_pending_responses()
+    assert [finding["Id"] for finding in imported] == ["finding-0", "finding-1"]
+    assert result["Imported"] == 2
+    assert result["Failures"] == {"InvalidInput": 1}
+    assert result["Requests"] == 2
+
+
+def test_throttled_batch_retried(securityhub_stubber):
+    batch = list(findings(2))
+    securityhub_stubber.add_client_error(
+        "batch_import_findings", service_error_code="TooManyRequestsException"
+    )
+    securityhub_stubber.add_response(
+        "batch_import_findings",
+        {"FailedCount": 0, "SuccessCount": 2, "FailedFindings": []},
+        {"Findings": batch},
+    )
+    result = FindingImporter(workers=1, base_delay=0).import_findings(batch)
+    assert result["Imported"] == 2
+    assert result["Failed"] == 0
+
+
+def test_vanished_findings_archived_and_resolved(securityhub_stubber):
+    finding = next(findings(1))
+    securityhub_stubber.add_response(
+        "batch_import_findings",
+        {"FailedCount": 0, "SuccessCount": 1, "FailedFindings": []},
+        {"Findings": [dict(finding, UpdatedAt=ANY, RecordState="ARCHIVED")]},
+    )
+    securityhub_stubber.add_response(
+        "batch_update_findings",
+        {"ProcessedFindings": [], "UnprocessedFindings": []},
+        {
+            "FindingIdentifiers": [{"Id": finding["Id"], "ProductArn": finding["ProductArn"]}],
+            "Workflow": {"Status": "RESOLVED"},
+            "Note": ANY,
+        },
+    )
+    archived = []
+    result = archive_findings([finding], workers=1, on_archived=archived.extend)
+    securityhub_stubber.assert_no_pending_responses()
+    assert result["Imported"] == 1
+    assert [archived_finding["Id"] for archived_finding in archived] == [finding["Id"]]
+
+
+def test_findings_failing_to_archive_not_resolved(securityhub_stubber):
+    batch = list(findings(2))
+    securityhub_stubber.add_response(
+        "batch_import_findings",
+        {
+            "FailedCount": 1,
+            "SuccessCount": 1,
+            "FailedFindings": [
+                {"Id": "finding-1", "ErrorCode": "InvalidInput", "ErrorMessage": "Bad"}
+            ],
+        },
+        {"Findings": [dict(finding, UpdatedAt=ANY, RecordState="ARCHIVED") for finding in batch]},
+    )
+    securityhub_stubber.add_response(
+        "batch_update_findings",
+        {"ProcessedFindings": [], "UnprocessedFindings": []},
+        {
+            "FindingIdentifiers": [{"Id": "finding-0", "ProductArn": batch[0]["ProductArn"]}],
+            "Workflow": {"Status": "RESOLVED"},
+            "Note": ANY,
+        },
+    )
+    archived = []
+    result = archive_findings(batch, workers=1, on_archived=archived.extend)
+    securityhub_stubber.assert_no_pending_responses()
+    assert result["Failed"] == 1
+    assert [archived_finding["Id"] for archived_finding in archived] == ["finding-0"]
@@ -0,0 +1,101 @@
+from . import context
+from security_group_rules import SecurityGroupRuleIndex, flatten_permission
+
+security_groups = [
+    {
+        "GroupName": "web",
+        "GroupId": "sg-1",
+        "IpPermissions": [
+            {
+                "IpProtocol": "tcp",
+                "FromPort": 20,
+                "ToPort": 1000,
+                "IpRanges": [{"CidrIp": "10.0.0.0/8"}],
+                "Ipv6Ranges": [{"CidrIpv6": "::/0"}],
+            },
+            {
+                "IpProtocol": "6",
+                "FromPort": 3389,
+                "ToPort": 3389,
+                "IpRanges": [{"CidrIp": "10.0.0.0/8"}],
+            },
+        ],
+    },
+    {
+        "GroupName": "everything",
+        "GroupId": "sg-2",
+        "IpPermissions": [{"IpProtocol": "-1", "IpRanges": [{"CidrIp": "0.0.0.0/0"}]}],
+    },
+    {
+        "GroupName": "internal",
+        "GroupId": "sg-3",
+        "IpPermissions": [
+            {
+                "IpProtocol": "udp",
+                "FromPort": 11211,
+                "ToPort": 11211,
+                "UserIdGroupPairs": [{"GroupId": "sg-1"}],
+            }
+        ],
+    },
+]
+
+
+def test_flatten_permission():
+    rules = flatten_permission("sg-2", security_groups[1]["IpPermissions"][0])
+    assert rules == [
+        {
+            "GroupId": "sg-2",
+            "IpProtocol": "-1",
+            "FromPort": 0,
+            "ToPort": 65535,
+            "SourceType": "Ipv4",
+            "Source": "0.0.0.0/0",
+        }
+    ]
+
+
+def test_exposures_cover_port_ranges_and_all_traffic():
+    index = SecurityGroupRuleIndex(security_groups)
+    assert [(exposure["GroupId"], exposure["Open"]) for exposure in index.exposures(23, 23)] == [
+        ("sg-1", True),
+        ("sg-2", True),
+    ]
+    # protocol numbers are normalized and a restricted source is reported as not open
+    assert index.exposures(3389, 3389)[0] == {
+        "GroupId": "sg-1",
+        "GroupName": "web",
+        "IpProtocol": "tcp",
+        "Open": False,
+        "Reachability": "UNKNOWN",
+    }
+    assert [exposure["GroupId"] for exposure in index.exposures(5432, 5432)] == ["sg-2"]
+    assert index.exposures(11211, 11211, "udp")[1] == {
+        "GroupId": "sg-3",
+        "GroupName": "internal",
+        "IpProtocol": "udp",
+        "Open": False,
+        "Reachability": "UNKNOWN",
+    }
+    assert [exposure["GroupId"] for exposure in index.exposures(0, 65535, "-1")] == ["sg-2"]
+
+
+def test_prefix_list_open_to_the_internet():
+    index = SecurityGroupRuleIndex(
+        [
+            {
+                "GroupName": "pl",
+                "GroupId": "sg-4",
+                "IpPermissions": [
+                    {
+                        "IpProtocol": "tcp",
+                        "FromPort": 22,
+                        "ToPort": 22,
+                        "PrefixListIds": [{"PrefixListId": "pl-1"}],
+                    }
+                ],
+            }
+        ]
+    )
+    index._prefix_lists["pl-1"] = {"10.0.0.0/8", "::/0"}
+    assert index.exposures(22, 22)[0]["Open"]
@@ -0,0 +1,63 @@
+import pytest
+
+from . import context
+from shodan_client import ShodanCache, ShodanClient
+
+
+class FakeResponse(object):
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class FakeSession(object):
+    """Answers like the Shodan host API, indexing only 1.1.1.1"""
+
+    def __init__(self):
+        self.requested = []
+
+    def get(self, url, params=None, timeout=None):
+        ip = url.rsplit("/", 1)[1]
+        self.requested.append(ip)
+        if ip == "1.1.1.1":
+            return FakeResponse(200, {"ip_str": ip, "ports": [53]})
+        return FakeResponse(404, {"error": "No information available for that IP."})
+
+
+@pytest.fixture(scope="function")
+def session(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHODAN_CACHE_PATH", str(tmp_path / "shodan_cache.db"))
+    ShodanClient.clear()
+    session = FakeSession()
+    monkeypatch.setattr(ShodanClient, "_session", session)
+    yield session
+    ShodanClient.clear()
+
+
+def test_ip_looked_up_once_per_run(session):
+    shodan = ShodanClient()
+    shodan.prefetch(["1.1.1.1", "2.2.2.2", "1.1.1.1"], "key")
+    assert shodan.host("1.1.1.1", "key")["ports"] == [53]
+    assert shodan.host("2.2.2.2", "key") == {"error": "No information available for that IP."}
+    assert sorted(session.requested) == ["1.1.1.1", "2.2.2.2"]
+
+
+def test_results_cached_between_runs(session):
+    ShodanClient().host("2.2.2.2", "key")
+    # a new run starts with no results in memory, the disk cache still answers
+    ShodanClient.clear()
+    assert ShodanClient().host("2.2.2.2", "key")["error"]
+    assert session.requested == ["2.2.2.2"]
+
+
+def test_expired_results_are_looked_up_again(tmp_path):
+    cache = ShodanCache(path=str(tmp_path / "shodan_cache.db"), ttl=60)
+    cache.put("1.1.1.1", {"ports": [53]})
+    assert cache.get("1.1.1.1") == {"ports": [53]}
+    cache.ttl = -1
+    assert cache.get("1.1.1.1") is None
+    assert ShodanCache(path=str(tmp_path / "disabled.db"), ttl=0).get("1.1.1.1") is None
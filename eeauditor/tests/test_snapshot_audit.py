@@ -0,0 +1,69 @@
+from . import context
+from snapshot_audit import (
+    READ_AHEAD_PER_WORKER,
+    SnapshotAttributeStore,
+    stream_snapshot_attributes,
+)
+
+
+class Snapshots(object):
+    """A stream of snapshots counting how many were pulled from it"""
+
+    def __init__(self, count):
+        self.count = count
+        self.pulled = 0
+
+    def __iter__(self):
+        for index in range(self.count):
+            self.pulled += 1
+            yield {"SnapshotId": f"snap-{index}"}
+
+
+def create_volume_permissions(snapshotId):
+    if snapshotId == "snap-3":
+        raise ValueError(f"{snapshotId} does not exist")
+    return {"CreateVolumePermissions": [{"Group": "all"}] if snapshotId == "snap-1" else []}
+
+
+def audit(snapshots, fetch=create_volume_permissions, store=None, workers=2):
+    return stream_snapshot_attributes(
+        snapshots=snapshots,
+        snapshot_id=lambda snapshot: snapshot["SnapshotId"],
+        fetch=fetch,
+        scope="ec2/012345678901/us-east-1",
+        workers=workers,
+        store=store or SnapshotAttributeStore(recheck_seconds=0),
+    )
+
+
+def test_snapshots_audited_in_order_without_the_unreadable():
+    results = list(audit(Snapshots(6)))
+    assert [snapshot["SnapshotId"] for snapshot, attributes in results] == [
+        "snap-0",
+        "snap-1",
+        "snap-2",
+        "snap-4",
+        "snap-5",
+    ]
+    assert results[1][1] == {"CreateVolumePermissions": [{"Group": "all"}]}
+
+
+def test_stream_read_ahead_bounded():
+    snapshots = Snapshots(10000)
+    first = next(iter(audit(snapshots, workers=2)))
+    assert first[0]["SnapshotId"] == "snap-0"
+    assert snapshots.pulled == 2 * READ_AHEAD_PER_WORKER
+
+
+def test_fresh_attributes_reused_between_runs(tmp_path):
+    fetched = []
+
+    def fetch(snapshotId):
+        fetched.append(snapshotId)
+        return {"CreateVolumePermissions": []}
+
+    path = str(tmp_path / "snapshot_attributes.db")
+    list(audit(Snapshots(3), fetch=fetch, store=SnapshotAttributeStore(path, 3600)))
+    results = list(audit(Snapshots(4), fetch=fetch, store=SnapshotAttributeStore(path, 3600)))
+    assert len(results) == 4
+    assert fetched == ["snap-0", "snap-1", "snap-2", "snap-3"]
@@ -274,6 +274,7 @@ resource "aws_iam_role_policy" "Electric_Eye_Task_Role_Policy" {
                 "appstream:DescribeUsers",
                 "kafka:ListClusters",
                 "shield:DescribeProtection",
+                "shield:ListProtections",
                 "ec2:DescribeInstanceAttribute",
                 "ec2:DescribeFlowLogs",
                 "iam:GetAccountPasswordPolicy",
@@ -283,6 +284,9 @@ resource "aws_iam_role_policy" "Electric_Eye_Task_Role_Policy" {
                 "iam:ListUserPolicies",
                 "iam:ListAttachedUserPolicies",
                 "iam:ListServerCertificates",
+                "iam:GenerateCredentialReport",
+                "iam:GetAccountAuthorizationDetails",
+                "iam:GetCredentialReport",
                 "mq:DescribeBroker",
                 "mq:ListBrokers",
                 "macie2:GetMacieSession",
@@ -303,7 +307,9 @@ resource "aws_iam_role_policy" "Electric_Eye_Task_Role_Policy" {
                 "rds:DescribeDBParameterGroups",
                 "s3:ListBucket",
                 "backup:DescribeProtectedResource",
+                "backup:ListProtectedResources",
                 "s3:GetEncryptionConfiguration",
+                "s3:GetBucketLocation",
                 "s3:GetBucketLogging",
                 "s3:GetBucketPolicy",
                 "s3:GetBucketPolicyStatus",
@@ -340,6 +346,12 @@ resource "aws_iam_role_policy" "Electric_Eye_Task_Role_Policy" {
                 "ssm:DescribeInstanceInformation",
                 "ec2:DescribeSecurityGroupReferences",
                 "ec2:DescribeVpcs",
+                "ec2:DescribeInternetGateways",
+                "ec2:DescribeNetworkAcls",
+                "ec2:DescribeNetworkInterfaces",
+                "ec2:DescribeRouteTables",
+                "ec2:DescribeSubnets",
+                "ec2:GetManagedPrefixListEntries",
                 "rds:DescribeDBClusterSnapshots",
                 "redshift:DescribeClusters",
                 "cloudfront:ListDistributions",
@@ -347,6 +359,7 @@ resource "aws_iam_role_policy" "Electric_Eye_Task_Role_Policy" {
                 "sagemaker:ListModels",
                 "ds:DescribeDirectories",
                 "securityhub:BatchImportFindings",
+                "securityhub:BatchUpdateFindings",
                 "rds:DescribeDBClusters",
                 "sagemaker:ListEndpoints",
                 "ecr:GetRepositoryPolicy",